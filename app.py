@@ -3,21 +3,121 @@
 KI-Assistent - Hauptanwendung
 Ein einfacher Chatbot der Wetter- und Nachrichtenfragen beantworten kann.
 """
+import argparse
+import json
+import os
+import signal
 import sys
-from src.weather import WeatherService
-from src.news import NewsService
-from src.nlp import NLPProcessor
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional, TextIO, Tuple
+from src import __version__
+from src.cache import lazy_property
+from src.config import Config
+from src.forecast import ForecastQuery
+from src.response_cache import ResponseCache
+
+
+GOODBYE = "👋 Auf Wiedersehen!"
+
+
+class BatchWriter:
+    """
+    Schreibt Ergebnisse des Batch-Modus thread-sicher.
+    
+    Im Textmodus werden die Antworten in Eingabereihenfolge ausgegeben,
+    im JSONL-Modus sobald sie fertig sind (zuordenbar über "id"). Schlägt
+    das Schreiben fehl (z.B. BrokenPipeError hinter "| head"), wird der
+    Fehler in error festgehalten und alle weiteren Ergebnisse verworfen.
+    """
+    
+    def __init__(self, output: TextIO, jsonl: bool = False):
+        self.output = output
+        self.jsonl = jsonl
+        self.failures = 0
+        self.error = None
+        self._next = 0
+        self._waiting = {}
+        self._lock = threading.Lock()
+    
+    def write(self, index: int, result: dict) -> int:
+        """
+        Übernimmt das Ergebnis der index-ten Anfrage.
+        
+        Args:
+            index: Position der Anfrage in der Eingabe (ab 0)
+            result: Ergebnis mit "id", "message" und "response" oder "error"
+            
+        Returns:
+            Anzahl der dadurch erledigten Ergebnisse (geschrieben oder nach
+            einem Schreibfehler verworfen)
+        """
+        with self._lock:
+            if "error" in result:
+                self.failures += 1
+            if self.error is not None:
+                return 1
+            
+            self._waiting[index] = result
+            written = 0
+            try:
+                if self.jsonl:
+                    self._emit(result)
+                    del self._waiting[index]
+                    return 1
+                
+                while self._next in self._waiting:
+                    self._emit(self._waiting[self._next])
+                    del self._waiting[self._next]
+                    self._next += 1
+                    written += 1
+            except OSError as e:
+                self.error = e
+                written += len(self._waiting)
+                self._waiting.clear()
+            return written
+    
+    def _emit(self, result: dict):
+        """Schreibt ein Ergebnis (Lock muss gehalten werden)."""
+        if self.jsonl:
+            self.output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        elif "error" in result:
+            self.output.write(f"> {result['message'] or ''}\n❌ {result['error']}\n\n")
+        else:
+            self.output.write(f"> {result['message']}\n{result['response']}\n\n")
+        self.output.flush()
 
 
 class KIAssistant:
-    """Hauptklasse für den KI-Assistenten."""
+    """
+    Hauptklasse für den KI-Assistenten.
+    
+    Services und Sprachverarbeitung werden erst beim ersten Zugriff erstellt,
+    sodass Begrüßung, Hilfe und --version ohne HTTP-Stack (requests) starten.
+    """
     
     def __init__(self):
-        self.weather_service = WeatherService()
-        self.news_service = NewsService()
-        self.nlp = NLPProcessor()
+        self.response_cache = ResponseCache()
         self.name = "KI-Assistent"
     
+    @lazy_property
+    def weather_service(self):
+        """Wetter-Service (lädt requests beim ersten Zugriff)."""
+        from src.weather import WeatherService
+        return WeatherService()
+    
+    @lazy_property
+    def news_service(self):
+        """News-Service (lädt requests beim ersten Zugriff)."""
+        from src.news import NewsService
+        return NewsService()
+    
+    @lazy_property
+    def nlp(self):
+        """Sprachverarbeitung."""
+        from src.nlp import NLPProcessor
+        return NLPProcessor()
+    
     def get_greeting(self) -> str:
         """Gibt eine Begrüßung zurück."""
         return f"""
@@ -39,6 +139,13 @@ Tippe 'hilfe' für weitere Informationen oder 'beenden' zum Verlassen.
    • "Wie ist das Wetter?"
    • "Wetter in Berlin"
    • "Temperatur in München"
+   • "Wetter in Zürich, Bern und Basel"
+
+📅 VORHERSAGE:
+   • "Wie wird das Wetter morgen?"
+   • "Regnet es am Wochenende in Bern?"
+   • "Windigster Tag diese Woche"
+   • "Wie warm wird es am Samstag in Zürich?"
 
 📰 NACHRICHTEN:
    • "Was gibt es Neues?"
@@ -64,6 +171,53 @@ Tippe 'hilfe' für weitere Informationen oder 'beenden' zum Verlassen.
         """
         intent, parameter = self.nlp.process(user_input)
         
+        cached = self.response_cache.get(intent, parameter)
+        if cached is not None:
+            return cached.text
+        
+        if intent == "weather":
+            weather_data = self.weather_service.get_weather(parameter)
+            return self._cache_result(intent, parameter, weather_data,
+                                      self.weather_service.format_weather(weather_data))
+        
+        if intent == "forecast":
+            forecast_data = self.weather_service.get_forecast(ForecastQuery.from_parameter(parameter))
+            return self._cache_result(intent, parameter, forecast_data,
+                                      self.weather_service.format_forecast(forecast_data))
+        
+        if intent == "news":
+            count = int(parameter) if parameter else 3
+            news_data = self.news_service.get_top_news(count)
+            return self._cache_result(intent, parameter, news_data,
+                                      self.news_service.format_news(news_data))
+        
+        # Begrüßung, Hilfe, Beenden und Unbekanntes sind deterministisch
+        return self.response_cache.put_static(intent, parameter, self._static_response(intent)).text
+    
+    def answer(self, user_input: str) -> str:
+        """
+        Beantwortet eine einzelne Anfrage außerhalb der interaktiven Schleife.
+        
+        Anders als in run() beendet "beenden" hier nichts, sondern liefert
+        nur die Verabschiedung.
+        
+        Args:
+            user_input: Die Eingabe des Benutzers
+            
+        Returns:
+            Die Antwort des Assistenten
+        """
+        response = self.process_input(user_input)
+        return GOODBYE if response == "EXIT" else response.strip()
+    
+    def _cache_result(self, intent: str, parameter: str, data: dict, text: str) -> str:
+        """Legt die Antwort einer erfolgreichen Abfrage mit echten Daten im Antwort-Cache ab."""
+        if self.response_cache.is_cacheable(data):
+            self.response_cache.put(intent, parameter, text)
+        return text
+    
+    def _static_response(self, intent: str) -> str:
+        """Gibt die Antwort für Absichten ohne Service-Aufruf zurück."""
         if intent == "exit":
             return "EXIT"
         
@@ -73,15 +227,6 @@ Tippe 'hilfe' für weitere Informationen oder 'beenden' zum Verlassen.
         if intent == "help":
             return self.get_help()
         
-        if intent == "weather":
-            weather_data = self.weather_service.get_weather(parameter)
-            return self.weather_service.format_weather(weather_data)
-        
-        if intent == "news":
-            count = int(parameter) if parameter else 3
-            news_data = self.news_service.get_top_news(count)
-            return self.news_service.format_news(news_data)
-        
         # Unbekannte Anfrage
         return """
 🤔 Das habe ich leider nicht verstanden.
@@ -93,6 +238,125 @@ Ich kann dir helfen bei:
 Tippe 'hilfe' für mehr Informationen.
 """
     
+    def run_batch(self, lines: Iterable[str], output: TextIO, jsonl: bool = False,
+                  workers: int = None) -> int:
+        """
+        Verarbeitet Anfragen zeilenweise ohne interaktive Schleife.
+        
+        Bis zu workers Anfragen laufen gleichzeitig und teilen sich Caches
+        und Connection-Pool. Es werden höchstens doppelt so viele Zeilen
+        vorausgelesen, sodass auch große Eingaben oder Pipes gestreamt werden.
+        
+        Args:
+            lines: Eingabezeilen (Text bzw. bei jsonl ein JSON-Text oder ein
+                Objekt mit "message" und optional "id")
+            output: Ausgabestrom
+            jsonl: JSON Lines statt Text lesen und schreiben
+            workers: Anzahl gleichzeitiger Anfragen (Standard: aus Config)
+            
+        Returns:
+            Anzahl der Zeilen, die nicht verarbeitet werden konnten
+            
+        Raises:
+            OSError: Wenn die Ausgabe nicht geschrieben werden kann (z.B.
+                BrokenPipeError); danach werden keine Zeilen mehr gelesen
+        """
+        workers = workers or Config.BATCH_WORKERS
+        writer = BatchWriter(output, jsonl)
+        slots = threading.Semaphore(workers * 2)
+        
+        def done(future, index):
+            # Ohne Freigabe bliebe der Haupt-Thread in slots.acquire() hängen
+            released = 1
+            try:
+                released = writer.write(index, future.result())
+            except Exception as e:
+                writer.error = writer.error or e
+            finally:
+                for _ in range(released):
+                    slots.release()
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ki-batch") as executor:
+            for index, query in enumerate(self._batch_queries(lines, jsonl)):
+                slots.acquire()
+                if writer.error is not None:
+                    break
+                future = executor.submit(self._answer, *query)
+                future.add_done_callback(lambda future, index=index: done(future, index))
+        if writer.error is not None:
+            raise writer.error
+        return writer.failures
+    
+    @staticmethod
+    def _batch_queries(lines: Iterable[str],
+                       jsonl: bool) -> Iterator[Tuple[object, Optional[str], Optional[str]]]:
+        """Liefert (id, Nachricht, Fehler) je nicht-leerer Eingabezeile."""
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line:
+                continue
+            
+            if not jsonl:
+                yield number, line, None
+                continue
+            
+            try:
+                item = json.loads(line)
+            except ValueError:
+                yield number, None, "Ungültiges JSON"
+                continue
+            
+            if isinstance(item, str):
+                yield number, item, None
+            elif isinstance(item, dict) and isinstance(item.get("message"), str):
+                yield item.get("id", number), item["message"], None
+            else:
+                yield number, None, 'Erwartet wird ein Text oder ein Objekt mit "message"'
+    
+    def _answer(self, query_id, message: Optional[str], error: Optional[str]) -> dict:
+        """Beantwortet eine Anfrage des Batch-Modus; Fehler beenden den Batch nicht."""
+        if error is None:
+            try:
+                return {"id": query_id, "message": message, "response": self.answer(message)}
+            except Exception as e:
+                error = str(e) or type(e).__name__
+        return {"id": query_id, "message": message, "error": error}
+    
+    def serve(self, path: str = None):
+        """
+        Beantwortet Anfragen als Daemon über einen Unix-Domain-Socket.
+        
+        Caches und Connection-Pool bleiben zwischen den Anfragen warm; beim
+        Start werden sie aus dem Snapshot wiederhergestellt und im Hintergrund
+        aufgewärmt. Der Daemon läuft bis SIGTERM oder Strg+C, schreibt dann
+        den Snapshot und entfernt den Socket.
+        
+        Args:
+            path: Pfad des Sockets (Standard: DAEMON_SOCKET bzw. benutzerspezifisch)
+        """
+        from src.daemon import AssistantDaemon
+        from src.http_client import close_session
+        from src.warmup import CacheWarmer
+        
+        server = AssistantDaemon(self.answer, path)
+        warmer = CacheWarmer(self.weather_service, self.news_service)
+        warmer.restore()
+        if Config.WARMUP_ENABLED:
+            warmer.start()
+        # shutdown() wartet auf serve_forever() und darf daher nicht im Haupt-Thread laufen
+        signal.signal(signal.SIGTERM,
+                      lambda signum, frame: threading.Thread(target=server.shutdown).start())
+        print(f"🤖 {self.name} lauscht auf {server.path}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            warmer.save()
+            close_session()
+        print(GOODBYE)
+    
     def run(self):
         """Startet die interaktive Chatbot-Schleife."""
         print(self.get_greeting())
@@ -113,17 +377,49 @@ Tippe 'hilfe' für mehr Informationen.
                 print(f"\n🤖 {self.name}: {response}")
                 
             except KeyboardInterrupt:
-                print("\n\n👋 Auf Wiedersehen!")
+                print(f"\n\n{GOODBYE}")
                 break
             except EOFError:
-                print("\n👋 Auf Wiedersehen!")
+                print(f"\n{GOODBYE}")
                 break
 
 
 def main():
     """Haupteintrittspunkt."""
+    parser = argparse.ArgumentParser(description="KI-Assistent")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="DATEI",
+                        help="Anfragen zeilenweise aus DATEI (oder stdin) verarbeiten")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="Im Batch-Modus JSON Lines lesen und schreiben")
+    parser.add_argument("--workers", type=int, default=Config.BATCH_WORKERS,
+                        help="Gleichzeitige Anfragen im Batch-Modus")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Als Daemon Anfragen über einen Unix-Socket beantworten (Client: ki_client.py)")
+    parser.add_argument("--socket", help="Pfad des Daemon-Sockets (Standard: DAEMON_SOCKET)")
+    args = parser.parse_args()
+    
     assistant = KIAssistant()
-    assistant.run()
+    if args.daemon:
+        assistant.serve(args.socket)
+        return
+    
+    if args.batch is None:
+        assistant.run()
+        return
+    
+    try:
+        if args.batch == "-":
+            failures = assistant.run_batch(sys.stdin, sys.stdout, args.jsonl, args.workers)
+        else:
+            with open(args.batch, encoding="utf-8") as f:
+                failures = assistant.run_batch(f, sys.stdout, args.jsonl, args.workers)
+    except BrokenPipeError:
+        # Leser hat die Pipe geschlossen ("| head"): ohne Traceback beenden;
+        # stdout umlenken, damit auch das Flush beim Beenden nicht scheitert
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    sys.exit(1 if failures else 0)
 
 
 if __name__ == "__main__":
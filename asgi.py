@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+KI-Assistent ASGI-Einstiegspunkt
+Stellt das Web-Interface für ASGI-Server (z.B. uvicorn) bereit:
+
+    uvicorn asgi:application --workers 4
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from src.config import Config
+from web_app import app, assistant
+
+
+class _ConcurrentWsgiToAsgiInstance(WsgiToAsgiInstance):
+    """
+    WSGI-Aufruf in einem beliebigen Thread des Pools statt im gemeinsamen
+    Haupt-Thread, damit sich gleichzeitige Anfragen nicht gegenseitig blockieren.
+    Async-Views laufen dabei auf dem Event-Loop des Servers.
+    """
+
+    run_wsgi_app = sync_to_async(
+        WsgiToAsgiInstance.__dict__["run_wsgi_app"].func, thread_sensitive=False
+    )
+
+
+class KIAssistantASGI(WsgiToAsgi):
+    """ASGI-Anwendung mit Lifespan-Unterstützung für Start und Shutdown."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        await _ConcurrentWsgiToAsgiInstance(self.wsgi_application, self.duplicate_header_limit)(
+            scope, receive, send
+        )
+
+    async def _lifespan(self, receive, send):
+        """
+        Startet Thread-Pool, Aufwärmphase und Prefetcher; schreibt beim
+        Shutdown den Cache-Snapshot und gibt Verbindungen frei.
+        """
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                loop = asyncio.get_running_loop()
+                loop.set_default_executor(
+                    ThreadPoolExecutor(max_workers=Config.WEB_THREADS, thread_name_prefix="ki-web")
+                )
+                # HTTP-Clients dieses Loops bleiben zwischen Anfragen offen
+                assistant.server_loop = loop
+                assistant.start_background()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                # Erst hier importieren: httpx wird sonst schon beim Laden des Workers geladen
+                from src.async_services import close_async_client
+                from src.http_client import close_session
+
+                assistant.stop_background()
+                await close_async_client()
+                close_session()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+application = KIAssistantASGI(app)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Importzeiten der Einstiegspunkte des KI-Assistenten.
+Startet pro Modul einen frischen Interpreter mit "python -X importtime",
+fasst die Ausgabe zusammen (Gesamtzeit und teuerste Pakete nach eigener
+Importzeit) und misst die Startzeit von "app.py --version" gegenüber
+einem leeren Interpreter.
+
+    python benchmarks/bench_import.py [--repeat 5] [--top 8] [app web_app]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+# Projektverzeichnis (Arbeitsverzeichnis der gestarteten Interpreter)
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+ENTRY_POINTS = ["app", "web_app", "asgi", "ki_client"]
+
+
+def parse_importtime(output):
+    """
+    Liest die Ausgabe von -X importtime.
+
+    Args:
+        output: stderr des Interpreters
+
+    Returns:
+        Liste aus (eigene µs, kumulierte µs, Modulname, Schachtelungstiefe)
+        in Ausgabereihenfolge (Untermodule vor dem importierenden Modul)
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not own.strip().isdigit():
+            continue  # Kopfzeile
+        stripped = name.strip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((int(own), int(cumulative), stripped, depth))
+    return entries
+
+
+def summarize(entries, module, top):
+    """
+    Fasst den Import von module zusammen.
+
+    Nur Einträge, die module (direkt oder indirekt) importiert, zählen;
+    Module, die der Interpreter vorher geladen hat (z.B. site), nicht.
+
+    Returns:
+        Dictionary mit Gesamtzeit, Anzahl Module und den teuersten Paketen
+    """
+    block = []
+    for entry in entries:
+        block.append(entry)
+        if entry[3] == 0:
+            if entry[2] == module:
+                break
+            block = []
+    else:
+        raise ValueError(f"{module} fehlt in der Ausgabe von -X importtime")
+
+    packages = defaultdict(int)
+    for own, _, name, _ in block:
+        packages[name.split(".")[0]] += own
+    heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "total_ms": round(block[-1][1] / 1000, 2),
+        "modules": len(block),
+        "top": [{"package": name, "ms": round(own / 1000, 2)} for name, own in heaviest],
+    }
+
+
+def measure_import(module, repeat=5, top=8):
+    """
+    Importiert module in frischen Interpretern und behält den schnellsten Lauf.
+
+    Returns:
+        Ergebnis von summarize für den schnellsten Lauf
+    """
+    best = None
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        result = summarize(parse_importtime(process.stderr), module, top)
+        if best is None or result["total_ms"] < best["total_ms"]:
+            best = result
+    return best
+
+
+def measure_command(args, repeat=5):
+    """Schnellste Laufzeit eines Python-Aufrufs in Millisekunden (inkl. Interpreterstart)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, check=True)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return round(best * 1000, 2)
+
+
+def bench_imports(modules=None, repeat=5, top=8):
+    """
+    Misst Importzeiten und CLI-Start (für bench_suite.py).
+
+    Returns:
+        {"imports": {Modul: Zusammenfassung}, "startup": {...}}
+    """
+    return {
+        "imports": {module: measure_import(module, repeat, top) for module in modules or ENTRY_POINTS},
+        "startup": {
+            "interpreter_ms": measure_command(["-c", "pass"], repeat),
+            "cli_version_ms": measure_command(["app.py", "--version"], repeat),
+        },
+    }
+
+
+def main():
+    """Gibt die Importzeiten als Tabelle aus."""
+    parser = argparse.ArgumentParser(description="Importzeiten der Einstiegspunkte")
+    parser.add_argument("modules", nargs="*", help=f"Module (Standard: {' '.join(ENTRY_POINTS)})")
+    parser.add_argument("--repeat", type=int, default=5, help="Läufe pro Messung (schnellster zählt)")
+    parser.add_argument("--top", type=int, default=8, help="Anzahl ausgegebener Pakete pro Modul")
+    args = parser.parse_args()
+
+    results = bench_imports(args.modules, args.repeat, args.top)
+    for module, result in results["imports"].items():
+        print(f"{module:<12} {result['total_ms']:>8.1f} ms  ({result['modules']} Module)")
+        for package in result["top"]:
+            print(f"    {package['package']:<24} {package['ms']:>8.1f} ms")
+    startup = results["startup"]
+    print(f"\npython -c pass          {startup['interpreter_ms']:>8.1f} ms")
+    print(f"python app.py --version {startup['cli_version_ms']:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark für die Absichtserkennung des NLP-Prozessors.
+Vergleicht den kompilierten Single-Pass-Matcher mit der früheren
+Implementierung (fünf Teilstring-Scans und re.search pro Aufruf) sowie
+die Stapelverarbeitung mit process_many.
+
+Maßgeblich ist der Korpus aus überwiegend verschiedenen Nachrichten:
+process_many klassifiziert jede verschiedene Nachricht einzeln und spart
+nur bei Wiederholungen (siehe Zeile "wiederholt"), was bei den wenigen
+Beispielnachrichten einen unrealistisch hohen Faktor ergibt.
+
+    python benchmarks/bench_nlp.py [--number 20000] [--distinct 3000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+# Füge das Projektverzeichnis zum Pfad hinzu
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.nlp import NLPProcessor
+
+
+SAMPLE_MESSAGES = [
+    "Hallo",
+    "Wie ist das Wetter heute?",
+    "Wetter in München",
+    "Temperatur für Hamburg",
+    "Top 5 News",
+    "Was gibt es Neues?",
+    "Zeige mir 3 Nachrichten",
+    "hilfe",
+    "Was kannst du?",
+    "tschüss",
+    "xyz abc 123",
+    "Kannst du mir bitte sagen, ob ich morgen in Zürich einen Regenschirm brauche?",
+]
+
+
+# Bausteine für einen Korpus aus überwiegend verschiedenen Nachrichten
+CORPUS_TEMPLATES = [
+    "Wie ist das Wetter in {city}?",
+    "Wetter in {city} {filler}",
+    "Temperatur für {city} {filler}",
+    "Regnet es {period} in {city}?",
+    "Wie warm wird es {period} in {city} {filler}?",
+    "Zeig mir {count} Nachrichten {filler}",
+    "Top {count} News aus {city}",
+    "Was gibt es Neues in {city} {filler}?",
+    "{greeting}, wie kalt ist es in {city}?",
+    "Kannst du mir {filler} sagen, ob ich {period} in {city} einen Schirm brauche?",
+    "{greeting} {filler}, was kannst du?",
+]
+CORPUS_CITIES = [
+    "Zürich", "Bern", "Basel", "Genf", "Lausanne", "Luzern", "Winterthur", "St. Gallen",
+    "Lugano", "Biel", "Thun", "Chur", "Zug", "Aarau", "Olten", "Wädenswil", "Dübendorf",
+    "Berlin", "Hamburg", "München", "Köln", "Frankfurt", "Stuttgart", "Leipzig", "Dresden",
+    "Wien", "Graz", "Linz", "Salzburg", "Innsbruck",
+]
+CORPUS_FILLERS = ["bitte", "heute", "jetzt", "mal", "denn", "gerade", "eigentlich", "schnell"]
+CORPUS_PERIODS = ["morgen", "übermorgen", "am Wochenende", "diese Woche", "am Freitag"]
+CORPUS_GREETINGS = ["Hallo", "Hi", "Hey", "Moin", "Servus", "Grüezi"]
+
+
+def distinct_messages(count, seed=0):
+    """Erzeugt reproduzierbar bis zu count verschiedene Chat-Nachrichten."""
+    rng = random.Random(seed)
+    messages = {}
+    for _ in range(count * 20):
+        if len(messages) >= count:
+            break
+        message = rng.choice(CORPUS_TEMPLATES).format(
+            city=rng.choice(CORPUS_CITIES), filler=rng.choice(CORPUS_FILLERS),
+            period=rng.choice(CORPUS_PERIODS), greeting=rng.choice(CORPUS_GREETINGS),
+            count=rng.randint(1, 10)
+        )
+        messages[message] = None
+    return list(messages)
+
+
+def legacy_process(text):
+    """Frühere Implementierung von NLPProcessor.process (zum Vergleich)."""
+    text_lower = text.lower().strip()
+    if not text_lower:
+        return ("unknown", None)
+    if any(keyword in text_lower for keyword in NLPProcessor.EXIT_KEYWORDS):
+        return ("exit", None)
+    if any(keyword in text_lower for keyword in NLPProcessor.HELP_KEYWORDS):
+        return ("help", None)
+    if any(keyword in text_lower for keyword in NLPProcessor.GREETING_KEYWORDS):
+        return ("greeting", None)
+    if any(keyword in text_lower for keyword in NLPProcessor.WEATHER_KEYWORDS):
+        for pattern in [r"(?:wetter|temperatur)\s+(?:in|für|bei)\s+(\w+)",
+                        r"(?:in|für|bei)\s+(\w+)\s+(?:wetter|temperatur)"]:
+            match = re.search(pattern, text_lower, re.IGNORECASE)
+            if match:
+                return ("weather", match.group(1).capitalize())
+        return ("weather", None)
+    if any(keyword in text_lower for keyword in NLPProcessor.NEWS_KEYWORDS):
+        for pattern in [r"top\s*(\d+)", r"(\d+)\s*(?:news|nachrichten|meldungen)"]:
+            match = re.search(pattern, text_lower, re.IGNORECASE)
+            if match:
+                return ("news", str(min(max(int(match.group(1)), 1), 10)))
+        return ("news", None)
+    return ("unknown", None)
+
+
+def measure(process, messages, number=1):
+    """Misst Aufrufe pro Sekunde über alle Nachrichten."""
+    def run():
+        for message in messages:
+            process(message)
+
+    seconds = min(timeit.repeat(run, number=number, repeat=3))
+    return number * len(messages) / seconds
+
+
+def measure_many(processor, texts):
+    """Misst den Durchsatz von process_many über texts."""
+    def run():
+        for _ in processor.process_many(texts):
+            pass
+
+    seconds = min(timeit.repeat(run, number=1, repeat=3))
+    return len(texts) / seconds
+
+
+def print_results(title, results):
+    """Gibt Aufrufe pro Sekunde relativ zur früheren Implementierung aus."""
+    print(title)
+    baseline = results["legacy"]
+    for name, ops in results.items():
+        print(f"  {name:<24} {ops:>12,.0f} ops/s  ({ops / baseline:.2f}x)")
+
+
+def main():
+    """Führt den Vergleich aus und gibt Aufrufe pro Sekunde aus."""
+    parser = argparse.ArgumentParser(description="NLP-Benchmark")
+    parser.add_argument("--number", type=int, default=20000,
+                        help="Durchläufe über die Beispielnachrichten")
+    parser.add_argument("--distinct", type=int, default=3000,
+                        help="Größe des Korpus aus verschiedenen Nachrichten")
+    args = parser.parse_args()
+
+    corpus = distinct_messages(args.distinct)
+    print_results(f"Korpus: {len(corpus):,} verschiedene Nachrichten", {
+        "legacy": measure(legacy_process, corpus),
+        "compiled (Teilstring)": measure(NLPProcessor(word_boundary=False).process, corpus),
+        "compiled (Wortgrenzen)": measure(NLPProcessor().process, corpus),
+        "process_many": measure_many(NLPProcessor(), corpus),
+    })
+
+    repeated = SAMPLE_MESSAGES * args.number
+    print_results(f"\nwiederholt: {len(SAMPLE_MESSAGES)} Beispielnachrichten x {args.number:,} "
+                  "(nur das Memo spart)", {
+        "legacy": measure(legacy_process, SAMPLE_MESSAGES, args.number),
+        "process_many": measure_many(NLPProcessor(), repeated),
+    })
+
+
+if __name__ == "__main__":
+    main()
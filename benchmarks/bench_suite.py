@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Reproduzierbare Benchmark-Suite für den KI-Assistenten.
+Misst gegen einen lokalen Stub der Upstream-APIs (siehe upstream_stub.py):
+
+- /api/chat Ende-zu-Ende mit kalten Caches (jede Anfrage geht an den Stub)
+- /api/chat Ende-zu-Ende mit warmen Caches und parallelen Clients
+- NLPProcessor.process in Aufrufen pro Sekunde
+- format_weather und format_news in Mikrosekunden pro Aufruf
+- Importzeiten der Einstiegspunkte und Start von "app.py --version"
+  (siehe bench_import.py)
+
+Die Ergebnisse werden als JSON ausgegeben (inkl. Commit), sodass Läufe
+verschiedener Commits mit --compare verglichen werden können:
+
+    python benchmarks/bench_suite.py --output before.json
+    python benchmarks/bench_suite.py --compare before.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+# Füge das Projektverzeichnis zum Pfad hinzu
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from bench_import import bench_imports
+from bench_nlp import SAMPLE_MESSAGES
+from upstream_stub import UpstreamStub
+
+
+# Gewichtete Mischung typischer Chat-Nachrichten
+CHAT_MIX = [
+    ("Wie ist das Wetter?", 4),
+    ("Wetter in Bern", 3),
+    ("Wetter in Winterthur", 2),
+    ("Temperatur für Hamburg", 2),
+    ("Wetter in Wädenswil", 1),
+    ("Wetter in Dübendorf", 1),
+    ("Wetter in Zürich, Basel und Genf", 1),
+    ("Regnet es morgen in Bern?", 1),
+    ("Windigster Tag diese Woche", 1),
+    ("Top 5 News", 3),
+    ("Was gibt es Neues?", 2),
+    ("Zeige mir 3 Nachrichten", 1),
+    ("Hallo", 2),
+    ("hilfe", 1),
+    ("xyz abc 123", 1),
+]
+
+# Kennzahlen, die --compare gegenüberstellt (Pfad, True wenn höher besser)
+HEADLINE_METRICS = [
+    (("chat_cold", "throughput_rps"), True),
+    (("chat_cold", "latency_ms", "p95"), False),
+    (("chat_warm", "throughput_rps"), True),
+    (("chat_warm", "latency_ms", "p50"), False),
+    (("chat_warm", "latency_ms", "p95"), False),
+    (("chat_warm", "latency_ms", "p99"), False),
+    (("nlp", "ops_per_sec"), True),
+    (("format_weather", "us_per_op"), False),
+    (("format_news", "us_per_op"), False),
+    (("imports", "app", "total_ms"), False),
+    (("imports", "web_app", "total_ms"), False),
+    (("startup", "cli_version_ms"), False),
+]
+
+
+def chat_messages(count, seed=0):
+    """Zieht count Nachrichten reproduzierbar aus CHAT_MIX."""
+    messages, weights = zip(*CHAT_MIX)
+    return random.Random(seed).choices(messages, weights=weights, k=count)
+
+
+def percentile(sorted_values, fraction):
+    """Perzentil einer sortierten Liste (nächster Rang)."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize_latencies(latencies):
+    """Fasst Latenzen in Sekunden als Millisekunden-Statistik zusammen."""
+    values = sorted(latencies)
+    return {
+        "mean": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "p50": round(percentile(values, 0.50) * 1000, 3),
+        "p95": round(percentile(values, 0.95) * 1000, 3),
+        "p99": round(percentile(values, 0.99) * 1000, 3),
+        "max": round(values[-1] * 1000, 3) if values else 0.0,
+    }
+
+
+def clear_caches(assistant):
+    """Leert Antwort-, Geocoding- (inkl. Negativ-), Forecast-, Vorhersage- und News-Cache."""
+    assistant.response_cache.clear()
+    assistant.weather_service.geocoding_cache.clear()
+    assistant.weather_service.geocoding_misses.clear()
+    assistant.weather_service.forecast_cache.clear()
+    assistant.weather_service.series_cache.clear()
+    assistant.news_service.news_cache.clear()
+
+
+def run_chat(app, messages, concurrency, stub, before_each=None):
+    """
+    Schickt messages an /api/chat und misst Durchsatz und Latenz.
+
+    Args:
+        app: Flask-Anwendung
+        messages: Chat-Nachrichten
+        concurrency: Anzahl paralleler Clients
+        stub: UpstreamStub (für die Zahl der Upstream-Aufrufe)
+        before_each: Optionale Funktion, die vor jeder Anfrage aufgerufen wird
+
+    Returns:
+        Dictionary mit Anzahl, Fehlern, Durchsatz, Latenzen und Upstream-Aufrufen
+    """
+    local = threading.local()
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def send(message):
+        nonlocal errors
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        if before_each is not None:
+            before_each()
+
+        start = time.perf_counter()
+        response = client.post("/api/chat", json={"message": message})
+        duration = time.perf_counter() - start
+        with lock:
+            latencies.append(duration)
+            if response.status_code != 200:
+                errors += 1
+
+    stub.reset()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, messages))
+    seconds = time.perf_counter() - start
+
+    return {
+        "requests": len(messages),
+        "concurrency": concurrency,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "throughput_rps": round(len(messages) / seconds, 1),
+        "latency_ms": summarize_latencies(latencies),
+        "upstream_calls": dict(stub.requests),
+    }
+
+
+def bench_nlp(number):
+    """Misst NLPProcessor.process in Aufrufen pro Sekunde."""
+    from src.nlp import NLPProcessor
+
+    processor = NLPProcessor()
+
+    def run():
+        for message in SAMPLE_MESSAGES:
+            processor.process(message)
+
+    seconds = min(timeit.repeat(run, number=number, repeat=3))
+    return {"ops_per_sec": round(number * len(SAMPLE_MESSAGES) / seconds)}
+
+
+def bench_format(fn, data, number):
+    """Misst eine Formatierungsfunktion in Mikrosekunden pro Aufruf."""
+    seconds = min(timeit.repeat(lambda: fn(data), number=number, repeat=3))
+    return {"us_per_op": round(seconds / number * 1e6, 3)}
+
+
+def git_commit():
+    """Aktueller Commit des Repositories (oder None)."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def lookup(results, path):
+    """Liest einen verschachtelten Wert aus den Ergebnissen (oder None)."""
+    for key in path:
+        if not isinstance(results, dict) or key not in results:
+            return None
+        results = results[key]
+    return results
+
+
+def compare(baseline, current):
+    """Gibt die Veränderung der Kennzahlen gegenüber einem früheren Lauf aus."""
+    print(f"\nVergleich mit {baseline['meta'].get('commit') or 'Baseline'}:", file=sys.stderr)
+    for path, higher_is_better in HEADLINE_METRICS:
+        old = lookup(baseline["results"], path)
+        new = lookup(current["results"], path)
+        if not old or new is None:
+            continue
+        change = (new - old) / old * 100
+        better = change > 0 if higher_is_better else change < 0
+        marker = "besser" if better else "schlechter" if change else "gleich"
+        print(f"  {'.'.join(path):<28} {old:>12,.3f} -> {new:>12,.3f}  "
+              f"({change:+.1f}%, {marker})", file=sys.stderr)
+
+
+def main():
+    """Führt alle Benchmarks aus und schreibt die Ergebnisse als JSON."""
+    parser = argparse.ArgumentParser(description="Benchmark-Suite mit Upstream-Stub")
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="Simulierte Upstream-Latenz in Sekunden")
+    parser.add_argument("--requests", type=int, default=500,
+                        help="Anzahl /api/chat-Anfragen mit warmen Caches")
+    parser.add_argument("--cold-requests", type=int, default=50,
+                        help="Anzahl /api/chat-Anfragen mit kalten Caches")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallele Clients")
+    parser.add_argument("--number", type=int, default=2000,
+                        help="Durchläufe pro Mikro-Benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Seed der Nachrichtenmischung")
+    parser.add_argument("--import-repeat", type=int, default=5,
+                        help="Interpreterstarts pro Importzeit-Messung (schnellster zählt)")
+    parser.add_argument("--output", help="Ergebnisse in diese Datei schreiben (Standard: stdout)")
+    parser.add_argument("--compare", help="Früheres Ergebnis zum Vergleich")
+    args = parser.parse_args()
+
+    # In frischen Interpretern und vor dem Stub messen (unabhängig von dessen Umgebung)
+    startup = bench_imports(repeat=args.import_repeat)
+
+    stub = UpstreamStub(latency=args.latency).start()
+    # Vor dem Import setzen, da Config die Umgebung beim Import liest
+    os.environ.update(stub.environ())
+    os.environ.update({"NEWS_PREFETCH_COUNTRIES": "", "TIMING_LOG": "false"})
+
+    from web_app import app, assistant
+
+    try:
+        clear_caches(assistant)
+        results = {
+            "chat_cold": run_chat(
+                app, chat_messages(args.cold_requests, args.seed), 1, stub,
+                before_each=lambda: clear_caches(assistant)
+            ),
+            # Jede Nachricht einmal vorab, damit die Messung mit warmen Caches beginnt
+            "_warmup": run_chat(app, [message for message, _ in CHAT_MIX], 1, stub),
+            "chat_warm": run_chat(
+                app, chat_messages(args.requests, args.seed), args.concurrency, stub
+            ),
+            "nlp": bench_nlp(args.number),
+            "format_weather": bench_format(
+                assistant.weather_service.format_weather,
+                assistant.weather_service.get_weather("Bern"), args.number
+            ),
+            "format_news": bench_format(
+                assistant.news_service.format_news,
+                assistant.news_service.get_top_news(5), args.number
+            ),
+        }
+    finally:
+        stub.stop()
+    del results["_warmup"]
+    results.update(startup)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    for name in ("chat_cold", "chat_warm"):
+        result = results[name]
+        latency = result["latency_ms"]
+        print(f"{name:<16} {result['throughput_rps']:>10,.1f} req/s  "
+              f"p50 {latency['p50']:.2f} ms  p95 {latency['p95']:.2f} ms  "
+              f"p99 {latency['p99']:.2f} ms  Fehler {result['errors']}", file=sys.stderr)
+    print(f"{'nlp':<16} {results['nlp']['ops_per_sec']:>10,} ops/s", file=sys.stderr)
+    for name in ("format_weather", "format_news"):
+        print(f"{name:<16} {results[name]['us_per_op']:>10,.2f} µs/op", file=sys.stderr)
+    for name, result in results["imports"].items():
+        heaviest = ", ".join(f"{package['package']} {package['ms']:.1f}" for package in result["top"][:3])
+        print(f"{'import ' + name:<16} {result['total_ms']:>10,.1f} ms     ({heaviest})", file=sys.stderr)
+    print(f"{'app.py --version':<16} {results['startup']['cli_version_ms']:>10,.1f} ms     "
+          f"(Interpreter {results['startup']['interpreter_ms']:.1f})", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Lastgenerator für das Web-Interface.
+Spielt eine realistische Mischung von Chat-Nachrichten gegen /api/chat ab,
+entweder mit fester Zahl paralleler Benutzer (geschlossene Last) oder mit
+fester Anfragerate (offene Last), und gibt Durchsatz, Latenz-Perzentile und
+Fehlerquote aus.
+
+Ohne --url läuft die Anwendung im Prozess (Flask-Test-Client) gegen einen
+Upstream-Stub; mit --url wird ein laufender Server angesprochen:
+
+    python benchmarks/loadgen.py --concurrency 1,4,16,64 --duration 10
+    python benchmarks/loadgen.py --url http://127.0.0.1:10000 --rate 200 --duration 30
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# Füge das Projektverzeichnis zum Pfad hinzu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_suite import chat_messages, summarize_latencies
+from upstream_stub import UpstreamStub
+
+
+class TestClientTarget:
+    """Sendet Anfragen über den Flask-Test-Client (ein Client pro Thread)."""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def send(self, message: str) -> int:
+        """Schickt eine Nachricht und gibt den HTTP-Status zurück."""
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        return client.post("/api/chat", json={"message": message}).status_code
+
+
+class HTTPTarget:
+    """Sendet Anfragen an einen laufenden Server (eine Session pro Thread)."""
+
+    def __init__(self, url: str, timeout: float):
+        self.url = url.rstrip("/") + "/api/chat"
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def send(self, message: str) -> int:
+        """Schickt eine Nachricht und gibt den HTTP-Status zurück (0 bei Verbindungsfehlern)."""
+        import requests
+
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.trust_env = False
+        try:
+            return session.post(self.url, json={"message": message}, timeout=self.timeout).status_code
+        except requests.RequestException:
+            return 0
+
+
+def run_level(target, messages, concurrency, rate=None, duration=None):
+    """
+    Erzeugt Last auf einer Stufe.
+
+    Mit rate werden die Anfragen zu festen Zeitpunkten gestartet; die Latenz
+    zählt ab dem geplanten Zeitpunkt, sodass Wartezeiten bei ausgelasteten
+    Workern mitgemessen werden. Ohne rate schickt jeder der concurrency
+    Benutzer die nächste Nachricht, sobald seine Antwort da ist.
+
+    Args:
+        target: TestClientTarget oder HTTPTarget
+        messages: Nachrichten, die der Reihe nach (zyklisch) gesendet werden
+        concurrency: Parallele Benutzer bzw. maximale gleichzeitige Anfragen
+        rate: Anfragen pro Sekunde (offene Last) oder None
+        duration: Dauer in Sekunden oder None (dann genau len(messages) Anfragen)
+
+    Returns:
+        Dictionary mit Durchsatz, Latenzen, Fehlerquote und Statuscodes
+    """
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+    total = None if duration else len(messages)
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+
+    def record(scheduled, status):
+        latency = time.perf_counter() - scheduled
+        with lock:
+            latencies.append(latency)
+            statuses[status] += 1
+
+    def send(index, scheduled):
+        record(scheduled, target.send(messages[index % len(messages)]))
+
+    if rate:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            index = 0
+            while total is None or index < total:
+                scheduled = start + index / rate
+                if deadline is not None and scheduled >= deadline:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(send, index, scheduled)
+                index += 1
+    else:
+        counter = iter(range(sys.maxsize))
+        counter_lock = threading.Lock()
+
+        def user():
+            while True:
+                with counter_lock:
+                    index = next(counter)
+                if total is not None and index >= total:
+                    return
+                scheduled = time.perf_counter()
+                if deadline is not None and scheduled >= deadline:
+                    return
+                send(index, scheduled)
+
+        threads = [threading.Thread(target=user) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    seconds = time.perf_counter() - start
+    count = len(latencies)
+    errors = count - statuses.get(200, 0)
+    return {
+        "concurrency": concurrency,
+        "rate": rate,
+        "requests": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "seconds": round(seconds, 3),
+        "throughput_rps": round(count / seconds, 1) if seconds else 0.0,
+        "latency_ms": summarize_latencies(latencies),
+        "status_codes": {str(status): n for status, n in sorted(statuses.items())},
+    }
+
+
+def load_messages(path):
+    """Liest Nachrichten aus einer Datei (eine pro Zeile, leere Zeilen werden übersprungen)."""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def main():
+    """Führt die Laststufen aus und gibt eine Tabelle (und optional JSON) aus."""
+    parser = argparse.ArgumentParser(description="Lastgenerator für /api/chat")
+    parser.add_argument("--url", help="Basis-URL eines laufenden Servers (Standard: Test-Client)")
+    parser.add_argument("--concurrency", default="8",
+                        help="Parallele Benutzer, kommagetrennt für mehrere Stufen (z.B. 1,4,16)")
+    parser.add_argument("--rate", type=float,
+                        help="Feste Anfragerate pro Sekunde statt geschlossener Last")
+    parser.add_argument("--duration", type=float, default=10,
+                        help="Dauer pro Stufe in Sekunden (0 = --requests Anfragen)")
+    parser.add_argument("--requests", type=int, default=1000,
+                        help="Anzahl Anfragen pro Stufe, wenn --duration 0 ist")
+    parser.add_argument("--messages", help="Datei mit Nachrichten (Standard: gewichtete Mischung)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed der Nachrichtenmischung")
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="Latenz des Upstream-Stubs im Test-Client-Modus")
+    parser.add_argument("--timeout", type=float, default=30,
+                        help="Timeout pro Anfrage im --url-Modus")
+    parser.add_argument("--output", help="Ergebnisse als JSON in diese Datei schreiben")
+    args = parser.parse_args()
+
+    levels = [int(value) for value in args.concurrency.split(",")]
+    if args.messages:
+        messages = load_messages(args.messages)
+    else:
+        messages = chat_messages(args.requests, args.seed)
+
+    stub = None
+    if args.url:
+        target = HTTPTarget(args.url, args.timeout)
+    else:
+        stub = UpstreamStub(latency=args.latency).start()
+        # Vor dem Import setzen, da Config die Umgebung beim Import liest
+        os.environ.update(stub.environ())
+        os.environ.update({"NEWS_PREFETCH_COUNTRIES": "", "TIMING_LOG": "false"})
+        from web_app import app
+        target = TestClientTarget(app)
+
+    results = []
+    print(f"{'Benutzer':>8} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'max ms':>9} {'Fehler':>8}")
+    try:
+        for concurrency in levels:
+            result = run_level(
+                target,
+                messages[:args.requests] if not args.duration else messages,
+                concurrency,
+                rate=args.rate,
+                duration=args.duration or None
+            )
+            results.append(result)
+            latency = result["latency_ms"]
+            print(f"{concurrency:>8} {result['throughput_rps']:>10,.1f} {latency['p50']:>9.2f} "
+                  f"{latency['p95']:>9.2f} {latency['p99']:>9.2f} {latency['max']:>9.2f} "
+                  f"{result['error_rate']:>8.2%}")
+    finally:
+        if stub is not None:
+            stub.stop()
+
+    if args.output:
+        report = {
+            "target": args.url or "test-client",
+            "rate": args.rate,
+            "duration": args.duration,
+            "levels": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Lokaler Stub für Open-Meteo (Geocoding und Forecast) und NewsAPI.
+Liefert deterministische Antworten im Format der echten APIs mit
+konfigurierbarer Latenz, damit Benchmarks ohne Netzwerk reproduzierbar sind.
+
+    stub = UpstreamStub(latency=0.05).start()
+    stub.environ()  # {"WEATHER_API_URL": ..., "GEOCODING_API_URL": ..., ...}
+    ...
+    stub.stop()
+"""
+import json
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+GEOCODING_PATH = "/v1/search"
+FORECAST_PATH = "/v1/forecast"
+NEWS_PATH = "/v2/top-headlines"
+
+
+def _coordinates(name: str) -> tuple:
+    """Leitet reproduzierbare Koordinaten in Mitteleuropa aus einem Namen ab."""
+    value = zlib.crc32(name.casefold().encode("utf-8"))
+    return (round(45.5 + (value % 1000) / 250, 4), round(6.0 + (value // 1000 % 1000) / 100, 4))
+
+
+def _current(latitude: str, longitude: str) -> dict:
+    """Baut einen "current"-Block wie die Forecast-API."""
+    value = zlib.crc32(f"{latitude},{longitude}".encode("ascii"))
+    return {
+        "latitude": float(latitude),
+        "longitude": float(longitude),
+        "current": {
+            "time": "2024-01-01T12:00",
+            "temperature_2m": round(-5 + value % 300 / 10, 1),
+            "relative_humidity_2m": 40 + value % 50,
+            "apparent_temperature": round(-7 + value % 300 / 10, 1),
+            "weather_code": (0, 1, 2, 3, 45, 61, 71, 95)[value % 8],
+            "wind_speed_10m": round(value % 400 / 10, 1)
+        }
+    }
+
+
+def _series(latitude: str, longitude: str, days: int) -> dict:
+    """Baut "hourly"- und "daily"-Blöcke wie die Forecast-API (ab 2024-01-01)."""
+    value = zlib.crc32(f"{latitude},{longitude}".encode("ascii"))
+    dates = [f"2024-01-{day:02d}" for day in range(1, days + 1)]
+    hours = [f"{date}T{hour:02d}:00" for date in dates for hour in range(24)]
+    return {
+        "latitude": float(latitude),
+        "longitude": float(longitude),
+        "hourly": {
+            "time": hours,
+            "temperature_2m": [round(-5 + (value + i * 7) % 300 / 10, 1) for i in range(len(hours))],
+            "precipitation": [round((value + i * 13) % 40 / 10 - 2, 1) if (value + i) % 5 == 0 else 0.0
+                              for i in range(len(hours))]
+        },
+        "daily": {
+            "time": dates,
+            "weather_code": [(0, 1, 2, 3, 45, 61, 71, 95)[(value + i) % 8] for i in range(days)],
+            "precipitation_sum": [round((value + i * 17) % 200 / 10, 1) for i in range(days)],
+            "wind_speed_10m_max": [round((value + i * 31) % 600 / 10, 1) for i in range(days)]
+        }
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Beantwortet GET-Anfragen an die drei emulierten Endpunkte."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.server.stub.record(url.path)
+
+        if self.server.stub.latency:
+            time.sleep(self.server.stub.latency)
+
+        if url.path == GEOCODING_PATH:
+            payload = self._geocoding(params)
+        elif url.path == FORECAST_PATH:
+            payload = self._forecast(params)
+        elif url.path == NEWS_PATH:
+            payload = self._news(params)
+        else:
+            self._send(404, {"error": True, "reason": "Not Found"})
+            return
+        self._send(200, payload)
+
+    @staticmethod
+    def _geocoding(params: dict) -> dict:
+        name = params.get("name", "")
+        latitude, longitude = _coordinates(name)
+        return {"results": [{"name": name, "latitude": latitude, "longitude": longitude}]}
+
+    @staticmethod
+    def _forecast(params: dict):
+        # Mehrere Orte als kommagetrennte Listen -> Liste von Objekten
+        latitudes = params.get("latitude", "0").split(",")
+        longitudes = params.get("longitude", "0").split(",")
+        if "hourly" in params:
+            return _series(latitudes[0], longitudes[0], int(params.get("forecast_days", "7")))
+        results = [_current(lat, lon) for lat, lon in zip(latitudes, longitudes)]
+        return results if len(results) > 1 else results[0]
+
+    @staticmethod
+    def _news(params: dict) -> dict:
+        count = int(params.get("pageSize", "10"))
+        country = params.get("country", "de")
+        return {
+            "status": "ok",
+            "totalResults": count,
+            "articles": [
+                {
+                    "title": f"Schlagzeile {i} ({country})",
+                    "description": f"Beschreibung der Meldung {i}.",
+                    "source": {"name": "Stub"},
+                    "url": f"https://example.com/{country}/{i}"
+                }
+                for i in range(1, count + 1)
+            ]
+        }
+
+    def _send(self, status: int, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Unterdrückt das Zugriffs-Log."""
+
+
+class UpstreamStub:
+    """HTTP-Server im Hintergrund-Thread, der die Upstream-APIs emuliert."""
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialisiert den Stub.
+
+        Args:
+            latency: Künstliche Antwortzeit pro Anfrage in Sekunden
+            host: Bind-Adresse
+            port: Port (0 = freier Port)
+        """
+        self.latency = latency
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Basis-URL des Stubs."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def environ(self) -> dict:
+        """Umgebungsvariablen, die den Assistenten auf den Stub umleiten."""
+        return {
+            "GEOCODING_API_URL": self.url + GEOCODING_PATH,
+            "WEATHER_API_URL": self.url + FORECAST_PATH,
+            "NEWS_API_URL": self.url + NEWS_PATH,
+            "NEWSAPI_KEY": "stub",
+            "HTTP_PROXY": "",
+            "NO_PROXY": "127.0.0.1,localhost"
+        }
+
+    def record(self, path: str):
+        """Zählt eine Anfrage pro Pfad."""
+        with self._lock:
+            self.requests[path] += 1
+
+    def reset(self):
+        """Setzt die Anfragezähler zurück."""
+        with self._lock:
+            self.requests.clear()
+
+    def start(self) -> "UpstreamStub":
+        """Startet den Server im Hintergrund."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Beendet den Server."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main():
+    """Startet den Stub im Vordergrund und gibt die passenden Umgebungsvariablen aus."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stub für Open-Meteo und NewsAPI")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind-Adresse")
+    parser.add_argument("--port", type=int, default=18080, help="Port")
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="Künstliche Antwortzeit pro Anfrage in Sekunden")
+    args = parser.parse_args()
+
+    stub = UpstreamStub(latency=args.latency, host=args.host, port=args.port)
+    for name, value in stub.environ().items():
+        print(f"export {name}={value}", flush=True)
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+KI-Assistent Client
+Schlanker Client für den Daemon-Modus: leitet Anfragen über den Unix-Socket
+an einen laufenden Daemon (python app.py --daemon) weiter, ohne selbst
+Services, HTTP-Stack oder .env zu laden.
+
+    python ki_client.py "Wetter in Bern"
+    printf 'Top 3 News\\nWetter in Basel\\n' | python ki_client.py
+"""
+import argparse
+import sys
+from src.daemon import DaemonUnavailableError, ask
+
+
+def main():
+    """Haupteintrittspunkt."""
+    parser = argparse.ArgumentParser(description="Client für den KI-Assistent-Daemon")
+    parser.add_argument("message", nargs="*", help="Nachricht (ohne: zeilenweise von stdin)")
+    parser.add_argument("--socket", help="Pfad des Daemon-Sockets (Standard: DAEMON_SOCKET)")
+    parser.add_argument("--timeout", type=float, default=30, help="Timeout in Sekunden")
+    args = parser.parse_args()
+
+    if args.message:
+        messages = [" ".join(args.message)]
+    else:
+        messages = (line.strip() for line in sys.stdin if line.strip())
+
+    exit_code = 0
+    for message in messages:
+        try:
+            result = ask(message, args.socket, args.timeout)
+        except DaemonUnavailableError as e:
+            print(f"❌ {e} (Start mit: python app.py --daemon)", file=sys.stderr)
+            sys.exit(2)
+
+        if "error" in result:
+            print(f"❌ {result['error']}", file=sys.stderr)
+            exit_code = 1
+        else:
+            print(result["response"], flush=True)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,3 @@
 # KI Assistant Package
+
+__version__ = "1.0.0"
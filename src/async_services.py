@@ -0,0 +1,400 @@
+"""
+Asynchrone Services für den KI-Assistenten.
+Gegenstücke zu WeatherService und NewsService auf Basis von httpx.AsyncClient,
+die Caches, Ortsverzeichnis und Formatierung der synchronen Services teilen.
+"""
+import asyncio
+import weakref
+from typing import Dict, List
+import httpx
+from .cache import AsyncSingleFlight
+from .circuit_breaker import OPEN, CircuitOpenError
+from .config import Config
+from .forecast import ForecastQuery, ForecastSeries
+from .news import NewsService
+from .weather import WeatherService
+
+
+# Ein Client pro Event-Loop, da httpx-Verbindungen an ihren Loop gebunden sind
+_clients = weakref.WeakKeyDictionary()
+
+
+def create_async_client() -> httpx.AsyncClient:
+    """
+    Erstellt einen asynchronen HTTP-Client mit Connection-Pool und Proxy.
+
+    Returns:
+        Konfigurierter httpx.AsyncClient
+    """
+    transport = httpx.AsyncHTTPTransport(
+        retries=Config.HTTP_RETRIES,
+        proxy=Config.HTTP_PROXY or None,
+        limits=httpx.Limits(
+            max_connections=Config.HTTP_POOL_MAXSIZE,
+            max_keepalive_connections=Config.HTTP_POOL_MAXSIZE
+        )
+    )
+    timeout = httpx.Timeout(Config.HTTP_READ_TIMEOUT, connect=Config.HTTP_CONNECT_TIMEOUT)
+    return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Gibt den gemeinsam genutzten Client des laufenden Event-Loops zurück."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = create_async_client()
+        _clients[loop] = client
+    return client
+
+
+async def close_async_client():
+    """Schließt den Client des laufenden Event-Loops."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+class AsyncWeatherService(WeatherService):
+    """
+    Asynchroner Service zum Abrufen von Wetterdaten.
+
+    Alle öffentlichen Methoden, die Upstream-APIs abfragen können (locate,
+    get_weather, get_weather_at, get_weather_many, get_forecast,
+    get_forecast_at), sind Coroutinen; Formatierung und Hilfsmethoden ohne
+    Upstream-Aufruf bleiben synchron.
+    """
+
+    is_async = True
+
+    def __init__(self, client: httpx.AsyncClient = None, shared: WeatherService = None):
+        """
+        Initialisiert den Service.
+
+        Args:
+            client: HTTP-Client (Standard: gemeinsamer Client des Event-Loops)
+            shared: Synchroner Service, dessen Caches mitbenutzt werden
+        """
+        super().__init__(shared=shared)
+        self.client = client
+        self._async_geocoding_flight = AsyncSingleFlight()
+        self._async_flight = AsyncSingleFlight()
+        self._refresh_tasks = set()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Gibt den zu verwendenden HTTP-Client zurück."""
+        return self.client or get_async_client()
+
+    async def _geocode_city(self, city: str, language: str = "de") -> dict:
+        """
+        Ermittelt die Koordinaten einer Stadt (siehe WeatherService._geocode_city).
+
+        Args:
+            city: Name der Stadt
+            language: Sprache der Ergebnisse (Standard: de)
+
+        Returns:
+            Dictionary mit latitude, longitude und name oder None bei Fehler
+        """
+        location = self._lookup_location(city, language)
+        if location is not None:
+            return location
+
+        key = self._geocoding_cache_key(city, language)
+        if not self.geocoding_misses.get(key):
+            location = await self._async_geocoding_flight.do(
+                key, lambda: self._load_geocoding(city, language)
+            )
+            if location is not None:
+                return location
+        return self._correct_location(city, language)
+
+    async def _load_geocoding(self, city: str, language: str) -> dict:
+        """Fragt die Geocoding-API ab (None bei Fehler, unbekannter Stadt oder offenem Breaker)."""
+        try:
+            data = await self.geocoding_breaker.call_async(
+                lambda: self._request_geocoding(city, language)
+            )
+        except (httpx.HTTPError, ValueError, CircuitOpenError):
+            return None
+        return self._store_geocoding(city, language, data)
+
+    async def _request_geocoding(self, city: str, language: str) -> dict:
+        """Führt den HTTP-Aufruf der Geocoding-API aus."""
+        params = self._geocoding_params(city, language)
+        response = await self._get_client().get(self.geocoding_url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_weather(self, city: str = None) -> dict:
+        """
+        Ruft die aktuellen Wetterdaten für eine Stadt ab.
+
+        Args:
+            city: Name der Stadt (Standard: DEFAULT_CITY aus Konfiguration)
+
+        Returns:
+            Dictionary mit Wetterdaten oder Fehlermeldung
+        """
+        if city is None:
+            city = self.default_city
+
+        cities = self.split_cities(city)
+        if len(cities) > 1:
+            return await self.get_weather_many(cities)
+
+        location = await self._geocode_city(city)
+        if location is None:
+            return self.city_not_found(city)
+
+        return await self.get_weather_at(location)
+
+    async def locate(self, city: str = None) -> dict:
+        """
+        Ermittelt die Koordinaten einer Stadt (siehe WeatherService.locate).
+
+        Args:
+            city: Name der Stadt (Standard: DEFAULT_CITY aus Konfiguration)
+
+        Returns:
+            Dictionary mit latitude, longitude und name oder None
+        """
+        return await self._geocode_city(city or self.default_city)
+
+    async def get_weather_at(self, location: dict) -> dict:
+        """
+        Ruft die aktuellen Wetterdaten für bereits ermittelte Koordinaten ab.
+
+        Args:
+            location: Dictionary mit latitude, longitude und name
+
+        Returns:
+            Dictionary mit Wetterdaten oder Fehlermeldung
+        """
+        try:
+            current = await self._get_current(location["latitude"], location["longitude"])
+        except CircuitOpenError:
+            return self._get_demo_weather(location["name"])
+        except httpx.HTTPError as e:
+            return self._fetch_error(e)
+
+        return self._build_weather(location, current)
+
+    async def get_weather_many(self, cities: List[str]) -> dict:
+        """
+        Ruft die aktuellen Wetterdaten mehrerer Städte ab (siehe WeatherService.get_weather_many).
+
+        Args:
+            cities: Namen der Städte
+
+        Returns:
+            Dictionary mit "results" (ein Wetterergebnis je Stadt)
+        """
+        locations = await asyncio.gather(*(self._geocode_city(city) for city in cities))
+        currents, missing = self._cached_currents(locations)
+
+        error = None
+        if missing:
+            try:
+                currents.update(await self._async_flight.do(
+                    ";".join(missing), lambda: self._load_current_many(missing)
+                ))
+            except CircuitOpenError:
+                # Fehlende Orte werden mit Demo-Daten beantwortet
+                pass
+            except (httpx.HTTPError, KeyError, ValueError) as e:
+                error = self._fetch_error(e)
+
+        return self._build_weather_many(cities, locations, currents, error)
+
+    async def get_forecast(self, query: ForecastQuery) -> dict:
+        """
+        Beantwortet eine Vorhersage-Frage (siehe WeatherService.get_forecast).
+
+        Args:
+            query: Zeitraum, Aspekt und Stadt (Standard: DEFAULT_CITY)
+
+        Returns:
+            Dictionary mit Tageswerten und Aggregaten oder Fehlermeldung
+        """
+        city = query.city or self.default_city
+        location = await self._geocode_city(city)
+        if location is None:
+            return self.forecast_city_not_found(city)
+
+        return await self.get_forecast_at(location, query)
+
+    async def get_forecast_at(self, location: dict, query: ForecastQuery) -> dict:
+        """
+        Beantwortet eine Vorhersage-Frage für bereits ermittelte Koordinaten.
+
+        Args:
+            location: Dictionary mit latitude, longitude und name
+            query: Zeitraum und Aspekt
+
+        Returns:
+            Dictionary mit Tageswerten und Aggregaten oder Fehlermeldung
+        """
+        try:
+            series = await self._get_series(location["latitude"], location["longitude"])
+        except CircuitOpenError:
+            return self._forecast_unavailable()
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            return self._fetch_error(e)
+
+        return self._build_forecast(location, query, series)
+
+    async def _get_series(self, latitude: float, longitude: float) -> ForecastSeries:
+        """Liefert die Vorhersage-Reihen eines Orts aus Cache oder API."""
+        key, latitude, longitude, series = self._cached_series(latitude, longitude)
+        if series is not None:
+            return series
+
+        return await self._async_flight.do(
+            f"series:{key}", lambda: self._load_series(key, latitude, longitude)
+        )
+
+    async def _load_series(self, key: str, latitude: float, longitude: float) -> ForecastSeries:
+        """Ruft die Vorhersage-Reihen ab und legt sie im Cache ab."""
+        series = ForecastSeries.from_response(
+            await self._request_forecast(self._series_params(latitude, longitude))
+        )
+        self._store_series(key, latitude, longitude, series)
+        return series
+
+    async def _get_current(self, latitude: float, longitude: float) -> dict:
+        """
+        Liefert den "current"-Block aus Cache oder API (stale-while-revalidate).
+
+        Args:
+            latitude: Breitengrad
+            longitude: Längengrad
+
+        Returns:
+            Dictionary mit den aktuellen Messwerten
+        """
+        key, latitude, longitude, current = self._cached_current(latitude, longitude)
+        if current is not None:
+            return current
+
+        return await self._async_flight.do(key, lambda: self._load_current(key, latitude, longitude))
+
+    async def _load_current(self, key: str, latitude: float, longitude: float) -> dict:
+        """Ruft den "current"-Block ab und legt ihn im Forecast-Cache ab."""
+        current = (await self._request_forecast(self._current_params(latitude, longitude)))["current"]
+        self._store_current(key, latitude, longitude, current)
+        return current
+
+    async def _load_current_many(self, missing: Dict[str, tuple]) -> Dict[str, dict]:
+        """Ruft den "current"-Block mehrerer Orte mit einem Aufruf ab."""
+        params = self._current_params_many(list(missing.values()))
+        currents = self._parse_current_many(list(missing), await self._request_forecast(params))
+        for key, current in currents.items():
+            self._store_current(key, *missing[key], current)
+        return currents
+
+    async def _request_forecast(self, params: dict):
+        """Ruft die Forecast-API über den Circuit Breaker ab."""
+        async def request():
+            response = await self._get_client().get(self.api_url, params=params)
+            response.raise_for_status()
+            return response.json()
+        return await self.forecast_breaker.call_async(request)
+
+    def _refresh_in_background(self, key: str, latitude: float, longitude: float):
+        """Plant eine Aktualisierung als Task im laufenden Event-Loop."""
+        if self._async_flight.in_flight(key) or self.forecast_breaker.state == OPEN:
+            return
+        task = asyncio.get_running_loop().create_task(
+            self._background_refresh(key, latitude, longitude)
+        )
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _background_refresh(self, key: str, latitude: float, longitude: float):
+        """Aktualisiert einen veralteten Eintrag; bei Fehlern bleibt er erhalten."""
+        try:
+            await self._async_flight.do(key, lambda: self._load_current(key, latitude, longitude))
+        except (httpx.HTTPError, KeyError, ValueError, CircuitOpenError):
+            pass
+
+
+class AsyncNewsService(NewsService):
+    """
+    Asynchroner Service zum Abrufen von Nachrichten.
+
+    get_top_news und refresh sind Coroutinen; für NewsPrefetcher und
+    CacheWarmer wird der synchrone Service verwendet.
+    """
+
+    is_async = True
+
+    def __init__(self, client: httpx.AsyncClient = None, shared: NewsService = None):
+        """
+        Initialisiert den Service.
+
+        Args:
+            client: HTTP-Client (Standard: gemeinsamer Client des Event-Loops)
+            shared: Synchroner Service, dessen Cache mitbenutzt wird
+        """
+        super().__init__(shared=shared)
+        self.client = client
+        self._async_flight = AsyncSingleFlight()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Gibt den zu verwendenden HTTP-Client zurück."""
+        return self.client or get_async_client()
+
+    async def get_top_news(self, count: int = 3, country: str = "de") -> dict:
+        """
+        Ruft die Top-Nachrichten ab.
+
+        Args:
+            count: Anzahl der Nachrichten (Standard: 3)
+            country: Ländercode (Standard: de für Deutschland)
+
+        Returns:
+            Dictionary mit Nachrichten oder Fehlermeldung
+        """
+        if not self._is_api_key_valid():
+            return self._get_demo_news(count)
+
+        cached = self._cached_news(count, country)
+        if cached is not None:
+            return cached
+
+        return await self.refresh(country, count)
+
+    async def refresh(self, country: str, page_size: int) -> dict:
+        """
+        Ruft Nachrichten direkt von der NewsAPI ab (siehe NewsService.refresh).
+
+        Args:
+            country: Ländercode
+            page_size: Anzahl der abzurufenden Nachrichten
+
+        Returns:
+            Dictionary mit Nachrichten oder Fehlermeldung
+        """
+        key = self._news_cache_key(country, page_size)
+        return await self._async_flight.do(key, lambda: self._load_news(country, page_size))
+
+    async def _load_news(self, country: str, page_size: int) -> dict:
+        """Ruft Nachrichten von der NewsAPI ab (siehe NewsService._load_news)."""
+        try:
+            data = await self.news_breaker.call_async(lambda: self._request_news(country, page_size))
+        except CircuitOpenError:
+            return self._stale_news(page_size, country) or self._get_demo_news(page_size)
+        except (httpx.HTTPError, ValueError) as e:
+            return self._fetch_error(e)
+
+        news_data = self._parse_news(data, page_size)
+        self._store_news(country, page_size, news_data)
+        return news_data
+
+    async def _request_news(self, country: str, page_size: int) -> dict:
+        """Führt den HTTP-Aufruf der NewsAPI aus."""
+        params = self._news_params(page_size, country)
+        response = await self._get_client().get(self.api_url, params=params)
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,423 @@
+"""
+Cache-Hilfsklassen für den KI-Assistenten.
+In-Memory LRU-Cache mit Ablaufzeit (TTL), optionaler JSON-Persistenz,
+Bündelung gleichzeitiger Anfragen (Single-Flight) und erst beim ersten
+Zugriff erstellte Attribute (lazy_property).
+"""
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+
+# Caches mit JSON-Datei; schwach referenziert, damit verworfene Caches
+# nicht bis zum Prozessende am Leben bleiben
+_persistent_caches = weakref.WeakSet()
+
+
+def _flush_persistent_caches():
+    """Schreibt verzögerte Änderungen aller persistenten Caches."""
+    for cache in list(_persistent_caches):
+        cache.flush()
+
+
+# Verzögerte Änderungen beim Beenden des Prozesses noch schreiben
+atexit.register(_flush_persistent_caches)
+
+
+class TTLCache:
+    """Thread-sicherer LRU-Cache mit Ablaufzeit und Treffer-Zählern."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 3600, path: Optional[str] = None,
+                 stale_ttl: float = 0, save_delay: float = 5.0):
+        """
+        Initialisiert den Cache.
+
+        Args:
+            maxsize: Maximale Anzahl an Einträgen (älteste werden verdrängt)
+            ttl: Lebensdauer eines Eintrags in Sekunden
+            path: Optionaler Pfad einer JSON-Datei, die Neustarts überdauert
+            stale_ttl: Zusätzliche Sekunden, in denen abgelaufene Einträge über
+                get_entry() noch als veraltet ausgeliefert werden dürfen
+            save_delay: Sekunden, um die das Schreiben der JSON-Datei nach einer
+                Änderung verzögert wird; Änderungen in diesem Zeitraum werden
+                gemeinsam geschrieben (0 = sofort)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.path = path
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.save_delay = save_delay
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._save_timer = None
+        self._timer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+        if self.path:
+            self._load()
+            _persistent_caches.add(self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Liest einen Eintrag aus dem Cache.
+
+        Args:
+            key: Schlüssel des Eintrags
+            default: Rückgabewert bei fehlendem oder abgelaufenem Eintrag
+
+        Returns:
+            Gespeicherter Wert oder default
+        """
+        result = self.get_entry(key, allow_stale=False)
+        return default if result is None else result[0]
+
+    def get_entry(self, key: str, allow_stale: bool = True) -> Optional[Tuple[Any, bool]]:
+        """
+        Liest einen Eintrag inklusive Frische-Information.
+
+        Args:
+            key: Schlüssel des Eintrags
+            allow_stale: Abgelaufene Einträge innerhalb von stale_ttl liefern
+
+        Returns:
+            Tuple aus (Wert, frisch) oder None wenn kein nutzbarer Eintrag existiert
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] + self.stale_ttl <= now:
+                del self._data[key]
+                entry = None
+
+            if entry is None or (entry[0] <= now and not allow_stale):
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            fresh = entry[0] > now
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return entry[1], fresh
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Speichert einen Eintrag im Cache.
+
+        Args:
+            key: Schlüssel des Eintrags
+            value: Zu speichernder Wert (bei Persistenz JSON-serialisierbar)
+            ttl: Abweichende Lebensdauer in Sekunden (Standard: self.ttl)
+        """
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+        if self.path:
+            self._schedule_save()
+
+    def clear(self):
+        """Leert den Cache und setzt die Zähler zurück."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.stale_hits = 0
+            self.misses = 0
+
+        if self.path:
+            self._schedule_save()
+
+    def stats(self) -> dict:
+        """Gibt Treffer, Fehlschläge und aktuelle Größe des Caches zurück."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "size": len(self._data)
+            }
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] > time.time()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def keys(self) -> List[str]:
+        """Schlüssel aller gespeicherten Einträge (auch abgelaufener), älteste zuerst."""
+        with self._lock:
+            return list(self._data)
+
+    def snapshot(self) -> dict:
+        """
+        Gibt alle noch nutzbaren Einträge zurück (frisch oder innerhalb von stale_ttl).
+
+        Returns:
+            {Schlüssel: [Ablaufzeitpunkt, Wert]} in LRU-Reihenfolge, älteste zuerst
+        """
+        now = time.time()
+        with self._lock:
+            return {
+                key: [expires_at, value] for key, (expires_at, value) in self._data.items()
+                if expires_at + self.stale_ttl > now
+            }
+
+    def restore(self, entries: dict) -> int:
+        """
+        Übernimmt Einträge aus snapshot() oder einer Cache-Datei.
+
+        Abgelaufene Einträge werden übersprungen, vorhandene neuere Einträge
+        bleiben erhalten.
+
+        Args:
+            entries: {Schlüssel: [Ablaufzeitpunkt, Wert]}
+
+        Returns:
+            Anzahl übernommener Einträge
+        """
+        now = time.time()
+        restored = 0
+        with self._lock:
+            for key, (expires_at, value) in entries.items():
+                current = self._data.get(key)
+                if expires_at + self.stale_ttl > now and (current is None or current[0] < expires_at):
+                    self._data[key] = (expires_at, value)
+                    self._data.move_to_end(key)
+                    restored += 1
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return restored
+
+    def _load(self):
+        """Lädt noch gültige Einträge aus der JSON-Datei."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        self.restore(stored)
+
+    def _schedule_save(self):
+        """Merkt eine Änderung vor und schreibt sie nach save_delay Sekunden."""
+        with self._timer_lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                return
+            if self.save_delay > 0:
+                self._save_timer = threading.Timer(self.save_delay, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+                return
+        self.flush()
+
+    def flush(self):
+        """
+        Schreibt vorgemerkte Änderungen sofort atomar in die JSON-Datei.
+
+        Die Datei wird außerhalb des Cache-Locks geschrieben, Anfragen
+        warten also nicht auf die Festplatte. Jeder Schreibvorgang nutzt
+        eine eigene temporäre Datei, sodass sich mehrere Prozesse mit
+        derselben Datei nicht gegenseitig eine halb geschriebene Datei
+        unterschieben.
+        """
+        with self._write_lock:
+            with self._timer_lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+
+            with self._lock:
+                stored = {key: list(entry) for key, entry in self._data.items()}
+
+            directory, name = os.path.split(os.path.abspath(self.path))
+            try:
+                fd, tmp_path = tempfile.mkstemp(prefix=f"{name}.", suffix=".tmp", dir=directory)
+            except OSError:
+                # Persistenz ist optional - der In-Memory-Cache bleibt nutzbar
+                return
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(stored, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except (OSError, TypeError, ValueError):
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+
+class _Call:
+    """Ein laufender Aufruf innerhalb von SingleFlight."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Bündelt gleichzeitige Aufrufe mit identischem Schlüssel.
+
+    Solange ein Aufruf für einen Schlüssel läuft, warten weitere Aufrufer auf
+    dessen Ergebnis statt selbst eine Upstream-Anfrage auszulösen.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Führt fn aus, sofern nicht bereits ein Aufruf für key läuft.
+
+        Args:
+            key: Schlüssel der Anfrage
+            fn: Funktion ohne Argumente, die das Ergebnis liefert
+
+        Returns:
+            Ergebnis von fn (für alle wartenden Aufrufer identisch)
+
+        Raises:
+            Die von fn ausgelöste Exception, auch bei wartenden Aufrufern
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self, key: str) -> bool:
+        """Prüft ob gerade ein Aufruf für key läuft."""
+        with self._lock:
+            return key in self._calls
+
+
+class AsyncSingleFlight:
+    """
+    Asyncio-Gegenstück zu SingleFlight.
+
+    Aufrufe werden pro Event-Loop gebündelt, da Futures nicht zwischen
+    verschiedenen Loops geteilt werden können.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Wartet auf fn(), sofern nicht bereits ein Aufruf für key läuft.
+
+        Args:
+            key: Schlüssel der Anfrage
+            fn: Coroutine-Funktion ohne Argumente, die das Ergebnis liefert
+
+        Returns:
+            Ergebnis von fn (für alle wartenden Aufrufer identisch)
+        """
+        # asyncio erst hier laden, damit rein synchrone Prozesse (CLI) es nicht importieren
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        call_key = (loop, key)
+        future = self._calls.get(call_key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = loop.create_future()
+        self._calls[call_key] = future
+        try:
+            result = await fn()
+        except BaseException as e:
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                # Als abgerufen markieren, falls niemand gewartet hat
+                future.exception()
+            else:
+                future.cancel()
+            raise
+        finally:
+            del self._calls[call_key]
+
+        future.set_result(result)
+        return result
+
+    def in_flight(self, key: str) -> bool:
+        """Prüft ob im laufenden Event-Loop ein Aufruf für key läuft."""
+        import asyncio
+
+        return (asyncio.get_running_loop(), key) in self._calls
+
+
+class lazy_property:
+    """
+    Attribut, das beim ersten Zugriff einmal berechnet und danach in der
+    Instanz abgelegt wird (wie functools.cached_property, aber thread-sicher).
+
+    Damit werden Services und die Module, die sie importieren, erst erstellt
+    bzw. geladen, wenn eine Anfrage sie tatsächlich braucht. Eine Zuweisung
+    (z.B. eines Mocks in Tests) ersetzt den Wert wie bei einem normalen
+    Attribut.
+    """
+
+    # Ein gemeinsamer reentranter Lock: Attribute dürfen beim Erstellen andere
+    # lazy_property-Attribute verwenden, ohne dass es zu Deadlocks kommt
+    _lock = threading.RLock()
+
+    def __init__(self, func: Callable[[Any], Any]):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        # Nach dem ersten Zugriff liegt der Wert im Instanz-Dictionary und
+        # __get__ wird nicht mehr aufgerufen
+        with self._lock:
+            values = instance.__dict__
+            if self.name not in values:
+                values[self.name] = self.func(instance)
+            return values[self.name]
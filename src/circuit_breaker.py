@@ -0,0 +1,217 @@
+"""
+Circuit Breaker für den KI-Assistenten.
+Sperrt Aufrufe an eine Upstream-API, solange zu viele Aufrufe fehlschlagen
+oder zu langsam sind, damit Worker nicht auf hängende Verbindungen warten.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+from .config import Config
+from .metrics import UPSTREAM_REQUESTS, UPSTREAM_SECONDS
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Wird ausgelöst, wenn ein Aufruf wegen eines offenen Circuit Breakers abgelehnt wird."""
+
+    def __init__(self, name: str):
+        super().__init__(f"Upstream '{name}' ist vorübergehend nicht erreichbar")
+        self.name = name
+
+
+class CircuitBreaker:
+    """
+    Thread-sicherer Circuit Breaker mit Fehler- und Latenzschwelle.
+
+    Geschlossen werden die letzten window Aufrufe bewertet; ein Aufruf zählt
+    als Fehlschlag, wenn er eine Exception auslöst oder länger als
+    slow_call_duration dauert. Erreicht der Anteil der Fehlschläge
+    failure_rate (bei mindestens min_calls Aufrufen), öffnet der Breaker für
+    open_seconds. Danach wird genau ein Probe-Aufruf durchgelassen
+    (halb offen): Erfolg schließt den Breaker, ein Fehlschlag öffnet ihn erneut.
+    """
+
+    def __init__(self, name: str, window: int = None, min_calls: int = None,
+                 failure_rate: float = None, slow_call_duration: float = None,
+                 open_seconds: float = None):
+        """
+        Initialisiert den Circuit Breaker.
+
+        Args:
+            name: Name der Upstream-API (für Fehlermeldungen und Metriken)
+            window: Anzahl der bewerteten letzten Aufrufe (Standard: aus Config)
+            min_calls: Mindestanzahl Aufrufe vor dem Öffnen (Standard: aus Config)
+            failure_rate: Anteil Fehlschläge, ab dem geöffnet wird (Standard: aus Config)
+            slow_call_duration: Sekunden, ab denen ein Aufruf als Fehlschlag zählt
+                (Standard: aus Config)
+            open_seconds: Sekunden bis zum Probe-Aufruf (Standard: aus Config)
+        """
+        self.name = name
+        self.min_calls = Config.BREAKER_MIN_CALLS if min_calls is None else min_calls
+        self.failure_rate = Config.BREAKER_FAILURE_RATE if failure_rate is None else failure_rate
+        self.slow_call_duration = (
+            Config.BREAKER_SLOW_CALL_DURATION if slow_call_duration is None else slow_call_duration
+        )
+        self.open_seconds = Config.BREAKER_OPEN_SECONDS if open_seconds is None else open_seconds
+        self._results = deque(maxlen=Config.BREAKER_WINDOW if window is None else window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Aktueller Zustand ("closed", "open" oder "half_open")."""
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Prüft ob ein Aufruf durchgelassen wird.
+
+        Im halb offenen Zustand wird nur ein Probe-Aufruf gleichzeitig erlaubt;
+        der Aufrufer muss danach record() bzw. release() aufrufen.
+
+        Returns:
+            True wenn der Aufruf ausgeführt werden darf
+        """
+        with self._lock:
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    return False
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+
+            if self._state == HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record(self, duration: float, failed: bool = False):
+        """
+        Bewertet einen abgeschlossenen Aufruf.
+
+        Args:
+            duration: Dauer des Aufrufs in Sekunden
+            failed: True wenn der Aufruf eine Exception ausgelöst hat
+        """
+        failed = failed or duration >= self.slow_call_duration
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                if failed:
+                    self._open()
+                else:
+                    self._state = CLOSED
+                    self._results.clear()
+                return
+
+            # Nachzügler, die vor dem Öffnen gestartet wurden, nicht bewerten
+            if self._state == OPEN:
+                return
+
+            self._results.append(failed)
+            if (len(self._results) >= self.min_calls
+                    and sum(self._results) / len(self._results) >= self.failure_rate):
+                self._open()
+
+    def release(self):
+        """Gibt einen abgebrochenen Probe-Aufruf frei, ohne ihn zu bewerten."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def reset(self):
+        """Schließt den Breaker und verwirft alle Bewertungen."""
+        with self._lock:
+            self._state = CLOSED
+            self._probe_in_flight = False
+            self._results.clear()
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """
+        Führt fn durch den Breaker aus.
+
+        Args:
+            fn: Funktion ohne Argumente, die den Upstream-Aufruf ausführt
+
+        Returns:
+            Ergebnis von fn
+
+        Raises:
+            CircuitOpenError: Wenn der Breaker offen ist
+        """
+        if not self.allow():
+            UPSTREAM_REQUESTS.inc(upstream=self.name, outcome="rejected")
+            raise CircuitOpenError(self.name)
+
+        start = time.monotonic()
+        try:
+            result = fn()
+        except Exception:
+            self._finish(time.monotonic() - start, failed=True)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self._finish(time.monotonic() - start)
+        return result
+
+    async def call_async(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Wartet auf fn() durch den Breaker (siehe call).
+
+        Args:
+            fn: Coroutine-Funktion ohne Argumente, die den Upstream-Aufruf ausführt
+
+        Returns:
+            Ergebnis von fn
+
+        Raises:
+            CircuitOpenError: Wenn der Breaker offen ist
+        """
+        if not self.allow():
+            UPSTREAM_REQUESTS.inc(upstream=self.name, outcome="rejected")
+            raise CircuitOpenError(self.name)
+
+        start = time.monotonic()
+        try:
+            result = await fn()
+        except Exception:
+            self._finish(time.monotonic() - start, failed=True)
+            raise
+        except BaseException:
+            # Abgebrochene Tasks sagen nichts über den Upstream aus
+            self.release()
+            raise
+        self._finish(time.monotonic() - start)
+        return result
+
+    def stats(self) -> dict:
+        """Gibt Zustand und Fehlschläge im aktuellen Fenster zurück."""
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "calls": len(self._results),
+                "failures": sum(self._results)
+            }
+
+    def _finish(self, duration: float, failed: bool = False):
+        """Bewertet einen Aufruf und erfasst Dauer und Ergebnis als Metrik."""
+        UPSTREAM_SECONDS.observe(duration, upstream=self.name)
+        UPSTREAM_REQUESTS.inc(upstream=self.name, outcome="error" if failed else "success")
+        self.record(duration, failed)
+
+    def _open(self):
+        """Öffnet den Breaker (Lock muss gehalten werden)."""
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._results.clear()
@@ -3,9 +3,32 @@ Konfiguration für den KI-Assistenten.
 Lädt Umgebungsvariablen aus .env Datei.
 """
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+
+def _find_dotenv() -> str:
+    """
+    Sucht eine .env Datei im Paketverzeichnis und dessen Elternverzeichnissen
+    (wie python-dotenv ohne Pfadangabe).
+
+    Returns:
+        Pfad der Datei oder "" wenn keine gefunden wurde
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            return path
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return ""
+        directory = parent
+
+
+# python-dotenv nur importieren, wenn es etwas zu laden gibt (z.B. nicht im Container)
+_dotenv_path = _find_dotenv()
+if _dotenv_path:
+    from dotenv import load_dotenv
+    load_dotenv(_dotenv_path)
 
 
 class Config:
@@ -20,10 +43,101 @@ class Config:
     # Proxy-Konfiguration
     HTTP_PROXY = os.getenv("HTTP_PROXY", "http://proxy4zscaler.migros.ch:9480")
     
-    # API URLs
-    WEATHER_API_URL = "https://api.open-meteo.com/v1/forecast"
-    GEOCODING_API_URL = "https://geocoding-api.open-meteo.com/v1/search"
-    NEWS_API_URL = "https://newsapi.org/v2/top-headlines"
+    # HTTP-Connection-Pool und Retry-Strategie
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+    HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+    HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.3"))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "5"))
+    
+    # Circuit Breaker pro Upstream-API (Fehler- und Latenzschwelle)
+    BREAKER_WINDOW = int(os.getenv("BREAKER_WINDOW", "20"))
+    BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "5"))
+    BREAKER_FAILURE_RATE = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+    BREAKER_SLOW_CALL_DURATION = float(os.getenv("BREAKER_SLOW_CALL_DURATION", "3"))
+    BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", "30"))
+    
+    # Geocoding-Cache (Koordinaten ändern sich praktisch nie)
+    GEOCODING_CACHE_TTL = int(os.getenv("GEOCODING_CACHE_TTL", "2592000"))
+    GEOCODING_CACHE_SIZE = int(os.getenv("GEOCODING_CACHE_SIZE", "512"))
+    GEOCODING_CACHE_FILE = os.getenv("GEOCODING_CACHE_FILE") or None
+    
+    # Negativ-Cache für Namen, die die Geocoding-API nicht kennt ("heute", Tippfehler)
+    GEOCODING_NEGATIVE_TTL = int(os.getenv("GEOCODING_NEGATIVE_TTL", "86400"))
+    GEOCODING_NEGATIVE_CACHE_SIZE = int(os.getenv("GEOCODING_NEGATIVE_CACHE_SIZE", "1024"))
+    
+    # Forecast-Cache (Open-Meteo aktualisiert "current" alle 15 Minuten)
+    FORECAST_CACHE_TTL = int(os.getenv("FORECAST_CACHE_TTL", "900"))
+    FORECAST_CACHE_STALE_TTL = int(os.getenv("FORECAST_CACHE_STALE_TTL", "3600"))
+    FORECAST_CACHE_SIZE = int(os.getenv("FORECAST_CACHE_SIZE", "256"))
+    
+    # Koordinaten-Raster für Forecast-Abrufe und Umkreis, in dem eine bereits
+    # abgerufene Vorhersage wiederverwendet wird (Kilometer, 0 = aus)
+    FORECAST_GRID_KM = float(os.getenv("FORECAST_GRID_KM", "2"))
+    FORECAST_REUSE_RADIUS_KM = float(os.getenv("FORECAST_REUSE_RADIUS_KM", "3"))
+    
+    # News-Cache und Hintergrund-Aktualisierung (NewsAPI ist stark limitiert)
+    NEWS_CACHE_TTL = int(os.getenv("NEWS_CACHE_TTL", "900"))
+    # Abgelaufene Schlagzeilen, die bei offenem Circuit Breaker noch geliefert werden
+    NEWS_CACHE_STALE_TTL = int(os.getenv("NEWS_CACHE_STALE_TTL", "3600"))
+    NEWS_CACHE_SIZE = int(os.getenv("NEWS_CACHE_SIZE", "64"))
+    NEWS_PREFETCH_COUNTRIES = [
+        country.strip() for country in os.getenv("NEWS_PREFETCH_COUNTRIES", "").split(",")
+        if country.strip()
+    ]
+    NEWS_PREFETCH_SIZE = int(os.getenv("NEWS_PREFETCH_SIZE", "10"))
+    NEWS_PREFETCH_INTERVAL = int(os.getenv("NEWS_PREFETCH_INTERVAL", "600"))
+    
+    # Cache gerenderter Antworten (Wetter- und News-Antworten; Begrüßung/Hilfe unbegrenzt)
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+    
+    # Cache für stündliche/tägliche Vorhersagen (Sekunden, Anzahl Orte)
+    FORECAST_SERIES_TTL = int(os.getenv("FORECAST_SERIES_TTL", "3600"))
+    FORECAST_SERIES_CACHE_SIZE = int(os.getenv("FORECAST_SERIES_CACHE_SIZE", "128"))
+    
+    # Aufwärmphase beim Start von Web-Interface und Daemon: Standardstadt,
+    # beliebte Städte und Nachrichtenländer werden im Hintergrund geladen
+    WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() in ("1", "true", "yes")
+    WARMUP_CITIES = [
+        city.strip() for city in os.getenv("WARMUP_CITIES", "").split(",") if city.strip()
+    ]
+    WARMUP_NEWS_COUNTRIES = [
+        country.strip() for country in os.getenv("WARMUP_NEWS_COUNTRIES", "").split(",")
+        if country.strip()
+    ]
+    WARMUP_WORKERS = int(os.getenv("WARMUP_WORKERS", "8"))
+    
+    # Snapshot der Caches: beim Beenden geschrieben, beim Start geladen (leer = aus)
+    CACHE_SNAPSHOT_FILE = os.getenv("CACHE_SNAPSHOT_FILE") or None
+    
+    # Offline-Ortsverzeichnis vor der Geocoding-API befragen
+    GAZETTEER_ENABLED = os.getenv("GAZETTEER_ENABLED", "true").lower() in ("1", "true", "yes")
+    
+    # Strukturierte Timing-Logs pro Anfrage (Logger "ki.timing", eine JSON-Zeile)
+    TIMING_LOG = os.getenv("TIMING_LOG", "false").lower() in ("1", "true", "yes")
+    
+    # Web-Server (ASGI-Modus)
+    WEB_HOST = os.getenv("WEB_HOST", "127.0.0.1")
+    WEB_PORT = int(os.getenv("WEB_PORT", "10000"))
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", "1"))
+    WEB_THREADS = int(os.getenv("WEB_THREADS", "64"))
+    WEB_GRACEFUL_TIMEOUT = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+    BATCH_MAX_MESSAGES = int(os.getenv("BATCH_MAX_MESSAGES", "100"))
+    
+    # Batch-Modus der CLI (gleichzeitig verarbeitete Anfragen)
+    BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "8"))
+    
+    # API URLs (überschreibbar, z.B. für Benchmarks gegen einen lokalen Stub)
+    WEATHER_API_URL = os.getenv("WEATHER_API_URL", "https://api.open-meteo.com/v1/forecast")
+    GEOCODING_API_URL = os.getenv("GEOCODING_API_URL", "https://geocoding-api.open-meteo.com/v1/search")
+    NEWS_API_URL = os.getenv("NEWS_API_URL", "https://newsapi.org/v2/top-headlines")
+    
+    @classmethod
+    def get_timeout(cls) -> tuple:
+        """Gibt (Connect-Timeout, Read-Timeout) für requests zurück."""
+        return (cls.HTTP_CONNECT_TIMEOUT, cls.HTTP_READ_TIMEOUT)
     
     @classmethod
     def get_proxies(cls) -> dict | None:
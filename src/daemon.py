@@ -0,0 +1,179 @@
+"""
+Daemon-Modus für den KI-Assistenten.
+Ein langlebiger Prozess hält den Assistenten samt Caches und Connection-Pool
+warm und beantwortet Anfragen über einen Unix-Domain-Socket.
+
+Protokoll: eine JSON-Zeile pro Anfrage ({"message": "..."}), eine JSON-Zeile
+pro Antwort ({"response": "..."} oder {"error": "..."}); mehrere Anfragen pro
+Verbindung sind möglich.
+
+Das Modul importiert bewusst weder Config noch die Services, damit der
+Client (ki_client.py) ohne dotenv und HTTP-Stack in Millisekunden startet.
+"""
+import json
+import os
+import socket
+import socketserver
+from typing import Callable
+
+
+# Maximale Länge einer Anfragezeile in Bytes
+MAX_LINE = 64 * 1024
+
+
+def socket_path() -> str:
+    """
+    Pfad des Sockets aus DAEMON_SOCKET, sonst ein benutzerspezifischer Standard.
+
+    Returns:
+        Pfad des Unix-Domain-Sockets
+    """
+    path = os.getenv("DAEMON_SOCKET")
+    if path:
+        return path
+    directory = os.getenv("XDG_RUNTIME_DIR")
+    if not directory:
+        import tempfile
+        directory = tempfile.gettempdir()
+    return os.path.join(directory, f"ki-assistent-{os.getuid()}.sock")
+
+
+class DaemonUnavailableError(Exception):
+    """Wird ausgelöst, wenn kein Daemon am Socket erreichbar ist."""
+
+    def __init__(self, path: str):
+        super().__init__(f"Kein KI-Assistent-Daemon unter {path} erreichbar")
+        self.path = path
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Beantwortet JSON-Zeilen einer Verbindung."""
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline(MAX_LINE + 1)
+            if not line:
+                return
+            if len(line) > MAX_LINE:
+                self._send({"error": "Anfrage zu lang"})
+                return
+            if line.strip():
+                self._send(self.server.answer_line(line))
+
+    def _send(self, payload: dict):
+        self.wfile.write(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class AssistantDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix-Socket-Server, der Anfragen an answer weiterreicht.
+
+    Jede Verbindung wird in einem eigenen Thread bedient; der Socket ist nur
+    für den eigenen Benutzer zugänglich. Eine verwaiste Socket-Datei eines
+    beendeten Daemons wird beim Start entfernt.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, answer: Callable[[str], str], path: str = None):
+        """
+        Initialisiert den Daemon und bindet den Socket.
+
+        Args:
+            answer: Funktion, die eine Nachricht beantwortet
+            path: Pfad des Sockets (Standard: socket_path())
+
+        Raises:
+            RuntimeError: Wenn bereits ein Daemon am Socket läuft
+        """
+        self.answer = answer
+        self.path = path or socket_path()
+        self._remove_stale_socket()
+
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(self.path, _Handler)
+        finally:
+            os.umask(old_umask)
+
+    def answer_line(self, line: bytes) -> dict:
+        """
+        Beantwortet eine Anfragezeile.
+
+        Args:
+            line: JSON-Zeile mit "message"
+
+        Returns:
+            {"response": ...} oder {"error": ...}
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"error": "Ungültiges JSON"}
+
+        message = request.get("message") if isinstance(request, dict) else None
+        if not isinstance(message, str) or not message.strip():
+            return {"error": 'Erwartet wird ein Objekt mit "message"'}
+
+        try:
+            return {"response": self.answer(message.strip())}
+        except Exception as e:
+            return {"error": str(e) or type(e).__name__}
+
+    def server_close(self):
+        """Schließt den Socket und entfernt die Socket-Datei."""
+        super().server_close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _remove_stale_socket(self):
+        """Entfernt die Socket-Datei, wenn kein Daemon mehr daran lauscht."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(self.path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(self.path)
+            return
+        raise RuntimeError(f"Unter {self.path} läuft bereits ein Daemon")
+
+
+def ask(message: str, path: str = None, timeout: float = 30) -> dict:
+    """
+    Schickt eine Nachricht an den Daemon.
+
+    Args:
+        message: Nachricht an den Assistenten
+        path: Pfad des Sockets (Standard: socket_path())
+        timeout: Sekunden bis zum Abbruch
+
+    Returns:
+        {"response": ...} oder {"error": ...}, auch wenn der Daemon nicht
+        innerhalb von timeout antwortet oder die Verbindung abbricht
+
+    Raises:
+        DaemonUnavailableError: Wenn kein Daemon erreichbar ist
+    """
+    path = path or socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        try:
+            client.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError) as e:
+            raise DaemonUnavailableError(path) from e
+
+        try:
+            client.sendall(json.dumps({"message": message}, ensure_ascii=False).encode("utf-8") + b"\n")
+            with client.makefile("rb") as reader:
+                line = reader.readline()
+        except socket.timeout:
+            return {"error": f"Keine Antwort vom Daemon innerhalb von {timeout:g} s"}
+        except OSError as e:
+            return {"error": f"Verbindung zum Daemon unterbrochen: {e}"}
+    if not line:
+        return {"error": "Verbindung vom Daemon geschlossen"}
+    return json.loads(line)
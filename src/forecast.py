@@ -0,0 +1,216 @@
+"""
+Stündliche und tägliche Vorhersagen für den KI-Assistenten.
+Eine Vorhersage wird pro Ort einmal abgerufen und als spaltenweise Arrays
+abgelegt, aus denen Folgefragen (Temperatur, Regenstunden, windigster Tag)
+ohne weiteren Upstream-Aufruf beantwortet werden.
+"""
+import datetime
+from array import array
+from typing import List, NamedTuple, Optional, Tuple
+
+
+# Anzahl abgefragter Vorhersagetage (heute eingeschlossen)
+FORECAST_DAYS = 7
+
+HOURLY_VARIABLES = "temperature_2m,precipitation"
+DAILY_VARIABLES = "weather_code,precipitation_sum,wind_speed_10m_max"
+
+# Sekunden pro Tag (Ablauf gecachter Reihen um Mitternacht des Orts)
+DAY_SECONDS = 86400
+
+# Niederschlag in mm pro Stunde, ab dem eine Stunde als Regenstunde zählt
+RAIN_THRESHOLD = 0.1
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+WEEKDAY_NAMES = ("Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag")
+
+# Zeiträume und ihre Bezeichnung in Antworten
+PERIOD_LABELS = {
+    "tomorrow": "morgen",
+    "day_after_tomorrow": "übermorgen",
+    "week": "in den nächsten 7 Tagen",
+    "weekend": "am Wochenende",
+    **{weekday: f"am {name}" for weekday, name in zip(WEEKDAYS, WEEKDAY_NAMES)},
+}
+
+# Gefragter Aspekt: Übersicht, Regen, Wind oder Temperatur
+ASPECTS = ("summary", "rain", "wind", "temperature")
+
+
+class ForecastQuery(NamedTuple):
+    """Vorhersage-Anfrage aus Zeitraum, Aspekt und optionaler Stadt."""
+
+    period: str
+    aspect: str = "summary"
+    city: Optional[str] = None
+
+    def to_parameter(self) -> str:
+        """Kodiert die Anfrage als Parameter-String ("tomorrow|rain|Bern")."""
+        return f"{self.period}|{self.aspect}|{self.city or ''}"
+
+    @classmethod
+    def from_parameter(cls, parameter: str) -> "ForecastQuery":
+        """
+        Dekodiert einen Parameter-String (siehe to_parameter).
+
+        Unbekannte Zeiträume oder Aspekte fallen auf "week" bzw. "summary" zurück.
+        """
+        period, aspect, city = (parameter.split("|", 2) + ["", ""])[:3]
+        return cls(
+            period if period in PERIOD_LABELS else "week",
+            aspect if aspect in ASPECTS else "summary",
+            city or None
+        )
+
+
+class ForecastSeries:
+    """
+    Vorhersage eines Orts als spaltenweise Arrays.
+
+    Stündliche Werte liegen in zusammenhängenden Arrays; day_offsets[i] ist
+    der Index der ersten Stunde von Tag i, sodass jeder Zeitraum ein
+    einfacher Slice ist. Aggregationen (min, max, sum) laufen dadurch in C
+    über die Slices statt über Python-Dictionaries. utc_offset ist der
+    Abstand der Ortszeit zu UTC in Sekunden.
+    """
+
+    __slots__ = ("dates", "day_offsets", "temperature", "rain_hours", "weather_code",
+                 "precipitation_sum", "wind_speed_max", "utc_offset")
+
+    def __init__(self, dates: List[datetime.date], day_offsets: array, temperature: array,
+                 rain_hours: array, weather_code: array, precipitation_sum: array,
+                 wind_speed_max: array, utc_offset: int = 0):
+        self.dates = dates
+        self.day_offsets = day_offsets
+        self.temperature = temperature
+        self.rain_hours = rain_hours
+        self.weather_code = weather_code
+        self.precipitation_sum = precipitation_sum
+        self.wind_speed_max = wind_speed_max
+        self.utc_offset = utc_offset
+
+    @classmethod
+    def from_response(cls, data: dict) -> "ForecastSeries":
+        """
+        Baut die Arrays aus einer Antwort der Forecast-API.
+
+        Args:
+            data: JSON-Antwort mit "hourly" und "daily" (Zeitzone des Orts)
+
+        Returns:
+            ForecastSeries
+
+        Raises:
+            KeyError, ValueError: Bei unvollständigen Antworten
+        """
+        hourly = data["hourly"]
+        daily = data["daily"]
+        dates = [datetime.date.fromisoformat(day) for day in daily["time"]]
+        if not dates:
+            raise ValueError("Vorhersage enthält keine Tage")
+
+        # Stunden den Tagen zuordnen (an Zeitumstellungen hat ein Tag 23 bzw. 25 Stunden)
+        day_offsets = array("I")
+        hour_dates = [time[:10] for time in hourly["time"]]
+        index = 0
+        for day in daily["time"]:
+            while index < len(hour_dates) and hour_dates[index] < day:
+                index += 1
+            day_offsets.append(index)
+        day_offsets.append(len(hour_dates))
+
+        # Fehlende Messwerte (null) mit dem letzten bekannten Wert füllen
+        temperature = array("f")
+        last = 0.0
+        for value in hourly["temperature_2m"]:
+            if value is not None:
+                last = value
+            temperature.append(last)
+        rain_hours = array("B", (
+            (value or 0.0) >= RAIN_THRESHOLD for value in hourly["precipitation"]
+        ))
+        if len(temperature) != len(hour_dates) or len(rain_hours) != len(hour_dates):
+            raise ValueError("Stündliche Reihen sind unterschiedlich lang")
+
+        return cls(
+            dates,
+            day_offsets,
+            temperature,
+            rain_hours,
+            array("B", (int(code or 0) for code in daily["weather_code"])),
+            array("f", (value or 0.0 for value in daily["precipitation_sum"])),
+            array("f", (value or 0.0 for value in daily["wind_speed_10m_max"])),
+            int(data.get("utc_offset_seconds") or 0)
+        )
+
+    def seconds_until_midnight(self, now: float) -> float:
+        """
+        Sekunden bis Mitternacht in der Zeitzone des Orts.
+
+        Danach ist der erste Tag der Reihe nicht mehr "heute"; gecachte
+        Reihen dürfen höchstens so lange gelten.
+
+        Args:
+            now: Aktuelle Zeit (Unix-Zeitstempel)
+        """
+        return DAY_SECONDS - (now + self.utc_offset) % DAY_SECONDS
+
+    def days(self, period: str) -> List[int]:
+        """
+        Indizes der Tage eines Zeitraums.
+
+        Der erste Tag der Reihe ist "heute" in der Zeitzone des Orts. Das
+        Wochenende ist der nächste Samstag mit dem folgenden Sonntag; ist
+        heute Sonntag, nur der heutige Tag (das laufende Wochenende).
+
+        Args:
+            period: Zeitraum (siehe PERIOD_LABELS)
+
+        Returns:
+            Liste von Tagesindizes (leer, wenn der Zeitraum nicht abgedeckt ist)
+        """
+        count = len(self.dates)
+        if period == "tomorrow":
+            return [1] if count > 1 else []
+        if period == "day_after_tomorrow":
+            return [2] if count > 2 else []
+        if period == "weekend":
+            for i, date in enumerate(self.dates):
+                if date.weekday() == 6:
+                    return [i]
+                if date.weekday() == 5:
+                    return [i, i + 1] if i + 1 < count else [i]
+            return []
+        if period in WEEKDAYS:
+            weekday = WEEKDAYS.index(period)
+            return [i for i, date in enumerate(self.dates) if date.weekday() == weekday][:1]
+        return list(range(count))
+
+    def _hours(self, day: int) -> slice:
+        """Slice der stündlichen Werte eines Tages."""
+        return slice(self.day_offsets[day], self.day_offsets[day + 1])
+
+    def temperature_range(self, days: List[int]) -> Tuple[float, float, float]:
+        """
+        Tiefst-, Höchst- und Mitteltemperatur über mehrere Tage.
+
+        Args:
+            days: Tagesindizes (zusammenhängend oder nicht)
+
+        Returns:
+            (min, max, mean) in °C
+        """
+        values = array("f")
+        for day in days:
+            values.extend(self.temperature[self._hours(day)])
+        if not values:
+            raise ValueError("Keine stündlichen Temperaturen im Zeitraum")
+        return min(values), max(values), sum(values) / len(values)
+
+    def day_rain_hours(self, day: int) -> int:
+        """Anzahl der Regenstunden eines Tages."""
+        return sum(self.rain_hours[self._hours(day)])
+
+    def windiest_day(self, days: List[int]) -> int:
+        """Index des Tages mit der höchsten Windgeschwindigkeit."""
+        return max(days, key=self.wind_speed_max.__getitem__)
@@ -0,0 +1,342 @@
+"""
+Offline-Ortsverzeichnis für den KI-Assistenten.
+Enthält die bevölkerungsreichsten Städte im DACH-Raum und in Europa,
+sodass häufige Wetteranfragen ohne Geocoding-API auskommen.
+"""
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from typing import List, Optional, Set
+
+
+# (Name, Ländercode, Breitengrad, Längengrad, alternative Schreibweisen)
+CITIES = (
+    # Schweiz
+    ("Zürich", "CH", 47.3769, 8.5417, ("Zurich",)),
+    ("Genf", "CH", 46.2044, 6.1432, ("Genève", "Geneva")),
+    ("Basel", "CH", 47.5596, 7.5886, ()),
+    ("Lausanne", "CH", 46.5197, 6.6323, ()),
+    ("Bern", "CH", 46.9480, 7.4474, ()),
+    ("Winterthur", "CH", 47.4988, 8.7237, ()),
+    ("Luzern", "CH", 47.0502, 8.3093, ("Lucerne",)),
+    ("St. Gallen", "CH", 47.4245, 9.3767, ("Sankt Gallen",)),
+    ("Lugano", "CH", 46.0037, 8.9511, ()),
+    ("Biel", "CH", 47.1368, 7.2468, ("Bienne",)),
+    ("Thun", "CH", 46.7580, 7.6280, ()),
+    ("Uster", "CH", 47.3471, 8.7209, ()),
+    ("Schaffhausen", "CH", 47.6973, 8.6349, ()),
+    ("Fribourg", "CH", 46.8065, 7.1620, ()),
+    ("Chur", "CH", 46.8499, 9.5329, ()),
+    ("Neuenburg", "CH", 46.9900, 6.9293, ("Neuchâtel",)),
+    ("Zug", "CH", 47.1662, 8.5155, ()),
+    ("Sitten", "CH", 46.2331, 7.3606, ("Sion",)),
+    ("Aarau", "CH", 47.3904, 8.0457, ()),
+    # Liechtenstein
+    ("Vaduz", "LI", 47.1410, 9.5209, ()),
+    # Deutschland
+    ("Berlin", "DE", 52.5200, 13.4050, ()),
+    ("Hamburg", "DE", 53.5511, 9.9937, ()),
+    ("München", "DE", 48.1374, 11.5755, ("Munich",)),
+    ("Köln", "DE", 50.9375, 6.9603, ("Cologne",)),
+    ("Frankfurt am Main", "DE", 50.1109, 8.6821, ("Frankfurt",)),
+    ("Stuttgart", "DE", 48.7758, 9.1829, ()),
+    ("Düsseldorf", "DE", 51.2277, 6.7735, ()),
+    ("Leipzig", "DE", 51.3397, 12.3731, ()),
+    ("Dortmund", "DE", 51.5136, 7.4653, ()),
+    ("Essen", "DE", 51.4556, 7.0116, ()),
+    ("Bremen", "DE", 53.0793, 8.8017, ()),
+    ("Dresden", "DE", 51.0504, 13.7373, ()),
+    ("Hannover", "DE", 52.3759, 9.7320, ()),
+    ("Nürnberg", "DE", 49.4521, 11.0767, ("Nuremberg",)),
+    ("Duisburg", "DE", 51.4344, 6.7623, ()),
+    ("Bochum", "DE", 51.4818, 7.2162, ()),
+    ("Wuppertal", "DE", 51.2562, 7.1508, ()),
+    ("Bielefeld", "DE", 52.0302, 8.5325, ()),
+    ("Bonn", "DE", 50.7374, 7.0982, ()),
+    ("Münster", "DE", 51.9607, 7.6261, ()),
+    ("Mannheim", "DE", 49.4875, 8.4660, ()),
+    ("Karlsruhe", "DE", 49.0069, 8.4037, ()),
+    ("Augsburg", "DE", 48.3705, 10.8978, ()),
+    ("Wiesbaden", "DE", 50.0782, 8.2398, ()),
+    ("Mainz", "DE", 49.9929, 8.2473, ()),
+    ("Freiburg im Breisgau", "DE", 47.9990, 7.8421, ("Freiburg",)),
+    ("Heidelberg", "DE", 49.3988, 8.6724, ()),
+    ("Kiel", "DE", 54.3233, 10.1228, ()),
+    ("Rostock", "DE", 54.0924, 12.0991, ()),
+    ("Aachen", "DE", 50.7753, 6.0839, ()),
+    ("Kassel", "DE", 51.3127, 9.4797, ()),
+    ("Potsdam", "DE", 52.3906, 13.0645, ()),
+    ("Erfurt", "DE", 50.9848, 11.0299, ()),
+    ("Magdeburg", "DE", 52.1205, 11.6276, ()),
+    ("Regensburg", "DE", 49.0134, 12.1016, ()),
+    ("Ulm", "DE", 48.4011, 9.9876, ()),
+    ("Konstanz", "DE", 47.6779, 9.1732, ()),
+    # Österreich
+    ("Wien", "AT", 48.2082, 16.3738, ("Vienna",)),
+    ("Graz", "AT", 47.0707, 15.4395, ()),
+    ("Linz", "AT", 48.3069, 14.2858, ()),
+    ("Salzburg", "AT", 47.8095, 13.0550, ()),
+    ("Innsbruck", "AT", 47.2692, 11.4041, ()),
+    ("Klagenfurt", "AT", 46.6247, 14.3053, ()),
+    ("Villach", "AT", 46.6103, 13.8558, ()),
+    ("Wels", "AT", 48.1575, 14.0289, ()),
+    ("St. Pölten", "AT", 48.2047, 15.6256, ("Sankt Pölten",)),
+    ("Bregenz", "AT", 47.5031, 9.7471, ()),
+    # Europa
+    ("Paris", "FR", 48.8566, 2.3522, ()),
+    ("Lyon", "FR", 45.7640, 4.8357, ()),
+    ("Marseille", "FR", 43.2965, 5.3698, ()),
+    ("Nizza", "FR", 43.7102, 7.2620, ("Nice",)),
+    ("Straßburg", "FR", 48.5734, 7.7521, ("Strasbourg",)),
+    ("London", "GB", 51.5074, -0.1278, ()),
+    ("Dublin", "IE", 53.3498, -6.2603, ()),
+    ("Madrid", "ES", 40.4168, -3.7038, ()),
+    ("Barcelona", "ES", 41.3874, 2.1686, ()),
+    ("Lissabon", "PT", 38.7223, -9.1393, ("Lisbon", "Lisboa")),
+    ("Porto", "PT", 41.1579, -8.6291, ()),
+    ("Rom", "IT", 41.9028, 12.4964, ("Rome", "Roma")),
+    ("Mailand", "IT", 45.4642, 9.1900, ("Milan", "Milano")),
+    ("Neapel", "IT", 40.8518, 14.2681, ("Naples", "Napoli")),
+    ("Turin", "IT", 45.0703, 7.6869, ("Torino",)),
+    ("Venedig", "IT", 45.4408, 12.3155, ("Venice", "Venezia")),
+    ("Florenz", "IT", 43.7696, 11.2558, ("Florence", "Firenze")),
+    ("Amsterdam", "NL", 52.3676, 4.9041, ()),
+    ("Rotterdam", "NL", 51.9244, 4.4777, ()),
+    ("Brüssel", "BE", 50.8503, 4.3517, ("Brussels", "Bruxelles")),
+    ("Antwerpen", "BE", 51.2194, 4.4025, ("Antwerp",)),
+    ("Luxemburg", "LU", 49.6116, 6.1319, ("Luxembourg",)),
+    ("Kopenhagen", "DK", 55.6761, 12.5683, ("Copenhagen",)),
+    ("Stockholm", "SE", 59.3293, 18.0686, ()),
+    ("Oslo", "NO", 59.9139, 10.7522, ()),
+    ("Helsinki", "FI", 60.1699, 24.9384, ()),
+    ("Warschau", "PL", 52.2297, 21.0122, ("Warsaw", "Warszawa")),
+    ("Krakau", "PL", 50.0647, 19.9450, ("Krakow", "Kraków")),
+    ("Prag", "CZ", 50.0755, 14.4378, ("Prague", "Praha")),
+    ("Budapest", "HU", 47.4979, 19.0402, ()),
+    ("Bratislava", "SK", 48.1486, 17.1077, ("Pressburg",)),
+    ("Ljubljana", "SI", 46.0569, 14.5058, ()),
+    ("Zagreb", "HR", 45.8150, 15.9819, ()),
+    ("Belgrad", "RS", 44.7866, 20.4489, ("Belgrade",)),
+    ("Bukarest", "RO", 44.4268, 26.1025, ("Bucharest",)),
+    ("Sofia", "BG", 42.6977, 23.3219, ()),
+    ("Athen", "GR", 37.9838, 23.7275, ("Athens",)),
+    ("Vilnius", "LT", 54.6872, 25.2797, ()),
+    ("Riga", "LV", 56.9496, 24.1052, ()),
+    ("Tallinn", "EE", 59.4370, 24.7536, ()),
+)
+
+# Umschreibungen von Umlauten, die auf den Grundbuchstaben abgebildet werden
+_DIGRAPHS = (("ae", "a"), ("oe", "o"), ("ue", "u"))
+
+# Fehlertoleranz der unscharfen Suche: kürzere Namen werden nie korrigiert,
+# ab FUZZY_LONG_NAME Zeichen sind zwei statt einer Abweichung erlaubt
+FUZZY_MIN_LENGTH = 5
+FUZZY_LONG_NAME = 9
+
+
+@lru_cache(maxsize=4096)
+def normalize_city(name: str) -> str:
+    """
+    Normalisiert einen Stadtnamen für den Index.
+
+    Groß-/Kleinschreibung, Akzente, Umlaute (auch als ae/oe/ue geschrieben),
+    Satzzeichen und Mehrfach-Leerzeichen werden vereinheitlicht.
+
+    Args:
+        name: Stadtname in beliebiger Schreibweise
+
+    Returns:
+        Normalisierter Schlüssel, z.B. "zurich" für "Zürich" oder "Zuerich"
+    """
+    text = name.casefold().replace("ß", "ss")
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    for digraph, letter in _DIGRAPHS:
+        text = text.replace(digraph, letter)
+    text = "".join(char if char.isalnum() else " " for char in text)
+    return " ".join(text.split())
+
+
+def trigrams(key: str) -> Set[str]:
+    """Trigramme eines normalisierten Namens (mit Randmarkierung)."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Editierdistanz mit Vertauschungen (Optimal String Alignment).
+
+    Die Berechnung bricht ab, sobald limit sicher überschritten ist.
+
+    Returns:
+        Distanz oder limit + 1
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class Gazetteer:
+    """Kompaktes, Array-basiertes Ortsverzeichnis mit sortiertem Index."""
+
+    def __init__(self, cities=CITIES):
+        """
+        Baut Tabelle und Index auf.
+
+        Args:
+            cities: Iterable aus (Name, Ländercode, Breite, Länge, Aliasse)
+        """
+        self._names = []
+        self._countries = []
+        self._latitudes = array("d")
+        self._longitudes = array("d")
+
+        index = {}
+        for row, (name, country, latitude, longitude, aliases) in enumerate(cities):
+            self._names.append(name)
+            self._countries.append(country)
+            self._latitudes.append(latitude)
+            self._longitudes.append(longitude)
+            for spelling in (name, *aliases):
+                index.setdefault(normalize_city(spelling), row)
+
+        # Sortierte Schlüssel mit paralleler Zeilennummer für bisect-Suche
+        self._keys = sorted(index)
+        self._rows = array("H", (index[key] for key in self._keys))
+
+        # Trigramm-Index (Trigramm -> Positionen in _keys) für die unscharfe Suche
+        self._trigrams = {}
+        for position, key in enumerate(self._keys):
+            for gram in trigrams(key):
+                self._trigrams.setdefault(gram, array("H")).append(position)
+        self._fuzzy_row = lru_cache(maxsize=4096)(self._find_fuzzy_row)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _entry(self, row: int) -> dict:
+        """Gibt eine Tabellenzeile im Format des Geocoding-Ergebnisses zurück."""
+        return {
+            "latitude": self._latitudes[row],
+            "longitude": self._longitudes[row],
+            "name": self._names[row],
+            "country_code": self._countries[row]
+        }
+
+    def lookup(self, name: str) -> Optional[dict]:
+        """
+        Sucht eine Stadt über ihren (normalisierten) Namen.
+
+        Args:
+            name: Stadtname, z.B. "zuerich" oder "Genève"
+
+        Returns:
+            Dictionary mit latitude, longitude, name und country_code oder None
+        """
+        key = normalize_city(name)
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return self._entry(self._rows[position])
+        return None
+
+    def fuzzy(self, name: str) -> Optional[dict]:
+        """
+        Sucht eine Stadt trotz Tippfehlern ("Berln", "Müchen", "Zuirch").
+
+        Kandidaten werden über gemeinsame Trigramme vorausgewählt und per
+        Editierdistanz geprüft. Namen unter FUZZY_MIN_LENGTH Zeichen werden
+        nicht korrigiert; liegen mehrere Städte gleich nah, gibt es keinen Treffer.
+
+        Args:
+            name: Stadtname in beliebiger Schreibweise
+
+        Returns:
+            Dictionary mit latitude, longitude, name und country_code oder None
+        """
+        row = self._fuzzy_row(normalize_city(name))
+        return None if row is None else self._entry(row)
+
+    def resolve(self, name: str) -> Optional[dict]:
+        """Sucht eine Stadt exakt und, falls nicht gefunden, unscharf."""
+        return self.lookup(name) or self.fuzzy(name)
+
+    def _find_fuzzy_row(self, key: str) -> Optional[int]:
+        """Zeile der eindeutig nächsten Stadt zu einem normalisierten Namen."""
+        if len(key) < FUZZY_MIN_LENGTH:
+            return None
+        limit = 1 if len(key) < FUZZY_LONG_NAME else 2
+
+        # Jede Abweichung zerstört höchstens vier Trigramme (Vertauschung)
+        grams = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._trigrams.get(gram, ()))
+        minimum = len(grams) - 4 * limit
+
+        # Rang: kleinste Distanz, bei Gleichstand die meisten gemeinsamen
+        # Trigramme ("berln" -> "berlin" statt "bern")
+        best, rows = None, set()
+        for position, count in shared.items():
+            if count < minimum:
+                continue
+            distance = edit_distance(key, self._keys[position], limit)
+            if distance > limit:
+                continue
+            rank = (distance, -count)
+            if best is None or rank < best:
+                best, rows = rank, {self._rows[position]}
+            elif rank == best:
+                rows.add(self._rows[position])
+
+        return rows.pop() if len(rows) == 1 else None
+
+    def prefix(self, text: str, limit: int = 10) -> List[dict]:
+        """
+        Liefert Städte, deren Name mit dem gegebenen Präfix beginnt.
+
+        Args:
+            text: Präfix in beliebiger Schreibweise
+            limit: Maximale Anzahl an Treffern
+
+        Returns:
+            Liste von Städten (ohne Duplikate durch Aliasse)
+        """
+        key = normalize_city(text)
+        if not key:
+            return []
+
+        results = []
+        seen = set()
+        position = bisect_left(self._keys, key)
+        while position < len(self._keys) and self._keys[position].startswith(key):
+            row = self._rows[position]
+            if row not in seen:
+                seen.add(row)
+                results.append(self._entry(row))
+                if len(results) >= limit:
+                    break
+            position += 1
+        return results
+
+
+@lru_cache(maxsize=1)
+def get_gazetteer() -> Gazetteer:
+    """Gibt das gemeinsam genutzte Ortsverzeichnis zurück (einmalig aufgebaut)."""
+    return Gazetteer()
@@ -0,0 +1,148 @@
+"""
+Räumliche Hilfsfunktionen für den KI-Assistenten.
+Koordinaten werden auf ein Raster gelegt, damit nahe beieinanderliegende
+Orte dieselbe Vorhersage teilen, und ein Gitterindex findet bereits
+abgerufene Vorhersagen in der Umgebung eines Orts.
+"""
+import math
+import threading
+from collections import defaultdict
+from typing import List, Tuple
+
+
+# Mittlerer Erdradius und Länge eines Breitengrads in Kilometern
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+
+def distance_km(latitude1: float, longitude1: float, latitude2: float, longitude2: float) -> float:
+    """
+    Großkreisentfernung zweier Punkte (Haversine-Formel).
+
+    Returns:
+        Entfernung in Kilometern
+    """
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    delta_phi = phi2 - phi1
+    delta_lambda = math.radians(longitude2 - longitude1)
+    a = (math.sin(delta_phi / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def snap_to_grid(latitude: float, longitude: float, cell_km: float) -> Tuple[float, float]:
+    """
+    Legt Koordinaten auf den Mittelpunkt einer Rasterzelle.
+
+    Die Zellen sind in Nord-Süd- und Ost-West-Richtung etwa cell_km breit;
+    der Abstand der Längengrade wird dazu pro Rasterzeile an den
+    Breitengrad angepasst. Das Ergebnis ist idempotent.
+
+    Args:
+        latitude: Breitengrad
+        longitude: Längengrad
+        cell_km: Kantenlänge einer Zelle in Kilometern (> 0)
+
+    Returns:
+        (Breitengrad, Längengrad) des Zellmittelpunkts, auf 4 Stellen gerundet
+    """
+    latitude_step = cell_km / KM_PER_DEGREE
+    latitude = max(-90.0, min(90.0, round(latitude / latitude_step) * latitude_step))
+    longitude_step = latitude_step / max(math.cos(math.radians(latitude)), 0.01)
+    longitude = round(longitude / longitude_step) * longitude_step
+    return round(latitude, 4), round(longitude, 4)
+
+
+class GridIndex:
+    """
+    Thread-sicherer Index von Orten für Umkreissuchen.
+
+    Die Orte liegen in quadratischen Buckets mit der Kantenlänge des
+    Suchradius (in Breitengraden); eine Suche prüft nur die Buckets, die
+    den Umkreis überdecken, statt alle Orte. Mit radius_km <= 0 ist der
+    Index abgeschaltet und findet nichts.
+    """
+
+    def __init__(self, radius_km: float):
+        """
+        Initialisiert den Index.
+
+        Args:
+            radius_km: Suchradius in Kilometern
+        """
+        self.radius_km = radius_km
+        self._cell = radius_km / KM_PER_DEGREE if radius_km > 0 else 0.0
+        self._buckets = defaultdict(dict)
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        """Bucket eines Punkts."""
+        return math.floor(latitude / self._cell), math.floor(longitude / self._cell)
+
+    def add(self, key: str, latitude: float, longitude: float):
+        """
+        Nimmt einen Ort auf (ein vorhandener Eintrag mit gleichem Schlüssel wird ersetzt).
+
+        Args:
+            key: Schlüssel des Orts (z.B. Cache-Schlüssel)
+            latitude: Breitengrad
+            longitude: Längengrad
+        """
+        if not self._cell:
+            return
+        with self._lock:
+            self._remove(key)
+            bucket = self._bucket(latitude, longitude)
+            self._buckets[bucket][key] = (latitude, longitude)
+            self._positions[key] = bucket
+
+    def discard(self, key: str):
+        """Entfernt einen Ort, falls vorhanden."""
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str):
+        """Entfernt einen Ort (Lock muss gehalten werden)."""
+        bucket = self._positions.pop(key, None)
+        if bucket is not None:
+            entries = self._buckets[bucket]
+            entries.pop(key, None)
+            if not entries:
+                del self._buckets[bucket]
+
+    def nearest(self, latitude: float, longitude: float) -> List[Tuple[str, float, float]]:
+        """
+        Sucht alle Orte im Umkreis radius_km.
+
+        Args:
+            latitude: Breitengrad
+            longitude: Längengrad
+
+        Returns:
+            Liste aus (Schlüssel, Breitengrad, Längengrad), nächster Ort zuerst
+        """
+        if not self._cell:
+            return []
+
+        # Ost-West-Ausdehnung des Umkreises wächst mit dem Breitengrad
+        longitude_span = self._cell / max(math.cos(math.radians(latitude)), 0.01)
+        row, _ = self._bucket(latitude, longitude)
+        first_column = math.floor((longitude - longitude_span) / self._cell)
+        last_column = math.floor((longitude + longitude_span) / self._cell)
+
+        found = []
+        with self._lock:
+            for r in range(row - 1, row + 2):
+                for column in range(first_column, last_column + 1):
+                    for key, (lat, lon) in self._buckets.get((r, column), {}).items():
+                        distance = distance_km(latitude, longitude, lat, lon)
+                        if distance <= self.radius_km:
+                            found.append((distance, key, lat, lon))
+
+        found.sort()
+        return [(key, lat, lon) for _, key, lat, lon in found]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._positions)
@@ -0,0 +1,72 @@
+"""
+HTTP-Client für den KI-Assistenten.
+Gemeinsam genutzte requests.Session mit Connection-Pooling, Keep-Alive und
+Retry-Strategie, damit Proxy-CONNECT und TLS-Handshake wiederverwendet werden.
+"""
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .config import Config
+
+
+# Nur idempotente Abrufe bei vorübergehenden Upstream-Fehlern wiederholen
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_connections: int = None, pool_maxsize: int = None,
+                   retries: int = None, backoff_factor: float = None) -> requests.Session:
+    """
+    Erstellt eine neue Session mit konfiguriertem Connection-Pool.
+
+    Args:
+        pool_connections: Anzahl der gecachten Host-Pools (Standard: aus Config)
+        pool_maxsize: Maximale Verbindungen pro Host (Standard: aus Config)
+        retries: Anzahl der Wiederholungen (Standard: aus Config)
+        backoff_factor: Faktor für exponentielles Backoff (Standard: aus Config)
+
+    Returns:
+        Konfigurierte requests.Session
+    """
+    retry = Retry(
+        total=Config.HTTP_RETRIES if retries is None else retries,
+        backoff_factor=Config.HTTP_BACKOFF_FACTOR if backoff_factor is None else backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+        # Retry-After (z.B. 120 s bei 429) würde den Worker-Thread ohne Timeout
+        # blockieren - es gilt nur das eigene Backoff, danach der Circuit Breaker
+        respect_retry_after_header=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=Config.HTTP_POOL_CONNECTIONS if pool_connections is None else pool_connections,
+        pool_maxsize=Config.HTTP_POOL_MAXSIZE if pool_maxsize is None else pool_maxsize,
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.proxies.update(Config.get_proxies())
+    return session
+
+
+def get_session() -> requests.Session:
+    """Gibt die prozessweit gemeinsam genutzte Session zurück."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def close_session():
+    """Schließt die gemeinsam genutzte Session und ihre Verbindungen."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,257 @@
+"""
+Metriken für den KI-Assistenten.
+Einfache Zähler und Histogramme im Prometheus-Textformat sowie optionale
+strukturierte Timing-Logs pro Anfrage.
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Tuple
+from .config import Config
+
+
+# Bucket-Grenzen in Sekunden (von Cache-Treffern bis zu Upstream-Timeouts)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+timing_logger = logging.getLogger("ki.timing")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Formatiert Labels als {name="wert",...} mit Prometheus-Escaping."""
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Formatiert einen Messwert (ganze Zahlen ohne Nachkommastellen)."""
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monoton steigender Zähler mit Labels."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        """Erhöht den Zähler für die angegebenen Labels."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Gibt den aktuellen Wert für die angegebenen Labels zurück."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Gibt alle Messwerte als (Name, Labels, Wert) zurück."""
+        with self._lock:
+            return [
+                (self.name, dict(zip(self.labelnames, key)), value)
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class Histogram:
+    """Histogramm mit festen Bucket-Grenzen und Labels."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        """Erfasst einen Messwert (z.B. eine Dauer in Sekunden)."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Misst die Dauer des with-Blocks."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        """Gibt die Anzahl der Messwerte für die angegebenen Labels zurück."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            entry = self._values.get(key)
+            return 0 if entry is None else entry[2]
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Gibt kumulative Buckets, Summe und Anzahl je Label-Kombination zurück."""
+        samples = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                labels = dict(zip(self.labelnames, key))
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    samples.append((f"{self.name}_bucket", dict(labels, le=_format_value(bound)), cumulative))
+                samples.append((f"{self.name}_bucket", dict(labels, le="+Inf"), count))
+                samples.append((f"{self.name}_sum", labels, total))
+                samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+class Registry:
+    """Sammlung von Metriken und Collector-Funktionen."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Registriert einen Zähler (oder gibt den bestehenden zurück)."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """Registriert ein Histogramm (oder gibt das bestehende zurück)."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[tuple]]):
+        """
+        Registriert eine Funktion, die beim Export Messwerte liefert.
+
+        Der Collector gibt Tupel aus (Name, Typ, Beschreibung, Samples) zurück,
+        wobei Samples eine Liste aus (Labels, Wert) ist.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def unregister_collector(self, collector: Callable[[], Iterable[tuple]]):
+        """Entfernt einen registrierten Collector."""
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def render(self) -> str:
+        """Exportiert alle Metriken im Prometheus-Textformat."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for collector in collectors:
+            for name, metric_type, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        """Legt eine Metrik unter ihrem Namen ab."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.counter(
+    "ki_requests_total", "Verarbeitete Chat-Anfragen", ["intent", "cached"]
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "ki_request_seconds", "Gesamtdauer der Verarbeitung einer Chat-Anfrage", ["intent"]
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "ki_stage_seconds", "Dauer einzelner Verarbeitungsschritte", ["stage"]
+)
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    "ki_upstream_requests_total", "Aufrufe an Upstream-APIs", ["upstream", "outcome"]
+)
+UPSTREAM_SECONDS = REGISTRY.histogram(
+    "ki_upstream_seconds", "Dauer der Aufrufe an Upstream-APIs", ["upstream"]
+)
+
+
+class RequestTimer:
+    """
+    Misst die Schritte einer Anfrage.
+
+    finish() erfasst jeden Schritt einmal pro Anfrage in STAGE_SECONDS
+    (mehrfach betretene Schritte wie beim Streaming summiert), zählt die
+    Anfrage und schreibt bei TIMING_LOG eine JSON-Zeile in den Logger "ki.timing".
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Misst die Dauer des with-Blocks als (Teil des) Schritt(s) name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def finish(self, intent: str, cached: bool = False) -> float:
+        """
+        Schließt die Messung ab.
+
+        Args:
+            intent: Erkannte Absicht
+            cached: True wenn die Antwort aus dem Antwort-Cache kam
+
+        Returns:
+            Gesamtdauer in Sekunden
+        """
+        total = time.perf_counter() - self._start
+        for name, duration in self.stages.items():
+            STAGE_SECONDS.observe(duration, stage=name)
+        REQUESTS.inc(intent=intent, cached=str(cached).lower())
+        REQUEST_SECONDS.observe(total, intent=intent)
+
+        if Config.TIMING_LOG:
+            timing_logger.info(json.dumps({
+                "intent": intent,
+                "cached": cached,
+                "total_ms": round(total * 1000, 3),
+                "stages_ms": {name: round(value * 1000, 3) for name, value in self.stages.items()}
+            }))
+        return total
@@ -2,16 +2,69 @@
 News-Service für den KI-Assistenten.
 Nutzt die NewsAPI.
 """
+import threading
+from typing import Iterable, Optional
 import requests
+from .cache import SingleFlight, TTLCache
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 from .config import Config
+from .http_client import get_session
 
 
 class NewsService:
     """Service zum Abrufen von Nachrichten."""
     
-    def __init__(self):
+    # Öffentliche Abrufmethoden sind Coroutinen (siehe AsyncNewsService)
+    is_async = False
+    
+    def __init__(self, session: requests.Session = None, shared: "NewsService" = None):
+        """
+        Initialisiert den Service.
+        
+        Args:
+            session: HTTP-Session (Standard: gemeinsam genutzte Session)
+            shared: Service, dessen Cache und Circuit Breaker mitbenutzt
+                werden, statt eigene anzulegen
+        """
+        self.session = session or get_session()
+        self.timeout = Config.get_timeout()
         self.api_key = Config.NEWSAPI_KEY
         self.api_url = Config.NEWS_API_URL
+        self._news_flight = SingleFlight()
+        if shared is not None:
+            self.news_cache = shared.news_cache
+            self._largest_page = shared._largest_page
+            self.news_breaker = shared.news_breaker
+        else:
+            self.news_cache = TTLCache(
+                maxsize=Config.NEWS_CACHE_SIZE,
+                ttl=Config.NEWS_CACHE_TTL,
+                stale_ttl=Config.NEWS_CACHE_STALE_TTL
+            )
+            # Größte gecachte Seitengröße pro Land, aus der kleinere Anfragen bedient werden
+            self._largest_page = {}
+            self.news_breaker = CircuitBreaker("newsapi")
+    
+    def snapshot_caches(self) -> dict:
+        """Gibt den News-Cache für einen Snapshot zurück (siehe TTLCache.snapshot)."""
+        return {"news": self.news_cache.snapshot()}
+    
+    def restore_caches(self, snapshot: dict) -> int:
+        """
+        Übernimmt den News-Cache aus einem Snapshot.
+        
+        Args:
+            snapshot: Ergebnis von snapshot_caches
+            
+        Returns:
+            Anzahl übernommener Einträge
+        """
+        restored = self.news_cache.restore(snapshot.get("news", {}))
+        for key in self.news_cache.keys():
+            country, _, page_size = key.rpartition(":")
+            if int(page_size) > self._largest_page.get(country, 0):
+                self._largest_page[country] = int(page_size)
+        return restored
     
     def _is_api_key_valid(self) -> bool:
         """Prüft ob ein gültiger API-Key konfiguriert ist."""
@@ -31,40 +84,168 @@ class NewsService:
         if not self._is_api_key_valid():
             return self._get_demo_news(count)
         
+        cached = self._cached_news(count, country)
+        if cached is not None:
+            return cached
+        
+        return self.refresh(country, count)
+    
+    def refresh(self, country: str, page_size: int) -> dict:
+        """
+        Ruft Nachrichten direkt von der NewsAPI ab und legt sie im Cache ab.
+        
+        Gleichzeitige Aufrufe für dasselbe Land und dieselbe Anzahl teilen
+        sich einen Upstream-Aufruf und dessen Ergebnis.
+        
+        Args:
+            country: Ländercode
+            page_size: Anzahl der abzurufenden Nachrichten
+            
+        Returns:
+            Dictionary mit Nachrichten oder Fehlermeldung
+        """
+        key = self._news_cache_key(country, page_size)
+        return self._news_flight.do(key, lambda: self._load_news(country, page_size))
+    
+    def _load_news(self, country: str, page_size: int) -> dict:
+        """
+        Ruft Nachrichten von der NewsAPI ab und legt Erfolge im Cache ab.
+        
+        Solange der Circuit Breaker offen ist, werden abgelaufene Nachrichten
+        aus dem Cache (siehe _stale_news) und erst ohne solche Demo-Nachrichten
+        geliefert.
+        """
         try:
-            params = {
-                "country": country,
-                "pageSize": count,
-                "apiKey": self.api_key
-            }
-            response = requests.get(self.api_url, params=params, timeout=10, proxies=Config.get_proxies())
-            response.raise_for_status()
-            data = response.json()
+            data = self.news_breaker.call(lambda: self._request_news(country, page_size))
+        except CircuitOpenError:
+            return self._stale_news(page_size, country) or self._get_demo_news(page_size)
+        except (requests.RequestException, ValueError) as e:
+            return self._fetch_error(e)
+        
+        news_data = self._parse_news(data, page_size)
+        self._store_news(country, page_size, news_data)
+        return news_data
+    
+    def _request_news(self, country: str, page_size: int) -> dict:
+        """Führt den HTTP-Aufruf der NewsAPI aus."""
+        params = self._news_params(page_size, country)
+        response = self.session.get(self.api_url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+    
+    @staticmethod
+    def _news_cache_key(country: str, page_size: int) -> str:
+        """Bildet den Cache-Schlüssel aus Land und Seitengröße."""
+        return f"{country}:{page_size}"
+    
+    def _cached_news(self, count: int, country: str) -> Optional[dict]:
+        """
+        Sucht Nachrichten im Cache.
+        
+        Zuerst wird der exakte Eintrag (Land, Anzahl) geprüft, danach der
+        größte gecachte Eintrag des Landes, aus dem die ersten count
+        Nachrichten geschnitten werden.
+        
+        Args:
+            count: Anzahl der Nachrichten
+            country: Ländercode
             
-            if data.get("status") != "ok":
+        Returns:
+            Dictionary mit Nachrichten oder None
+        """
+        cached = self.news_cache.get(self._news_cache_key(country, count))
+        if cached is not None:
+            return cached
+        
+        largest = self._largest_page.get(country, 0)
+        if largest > count:
+            cached = self.news_cache.get(self._news_cache_key(country, largest))
+            if cached is not None:
                 return {
-                    "success": False,
-                    "error": data.get("message", "Unbekannter API-Fehler")
+                    "success": True,
+                    "articles": cached["articles"][:count]
                 }
+        return None
+    
+    def _stale_news(self, count: int, country: str) -> Optional[dict]:
+        """
+        Sucht auch abgelaufene Nachrichten (innerhalb von NEWS_CACHE_STALE_TTL).
+        
+        Rückfall bei offenem Circuit Breaker: echte, etwas ältere
+        Schlagzeilen sind besser als Demo-Nachrichten.
+        
+        Args:
+            count: Anzahl der Nachrichten
+            country: Ländercode
             
-            articles = []
-            for article in data.get("articles", [])[:count]:
-                articles.append({
-                    "title": article.get("title", "Kein Titel"),
-                    "description": article.get("description", "Keine Beschreibung"),
-                    "source": article.get("source", {}).get("name", "Unbekannt"),
-                    "url": article.get("url", "")
-                })
+        Returns:
+            Dictionary mit Nachrichten oder None
+        """
+        for page_size in (count, self._largest_page.get(country, 0)):
+            if page_size < count:
+                continue
+            entry = self.news_cache.get_entry(self._news_cache_key(country, page_size))
+            if entry is not None:
+                return {"success": True, "articles": entry[0]["articles"][:count]}
+        return None
+    
+    def _store_news(self, country: str, page_size: int, news_data: dict):
+        """Legt erfolgreiche Ergebnisse im Cache ab."""
+        if not news_data.get("success"):
+            return
+        
+        self.news_cache.set(self._news_cache_key(country, page_size), news_data)
+        largest = self._largest_page.get(country, 0)
+        if page_size >= largest or self._news_cache_key(country, largest) not in self.news_cache:
+            self._largest_page[country] = page_size
+    
+    def _news_params(self, count: int, country: str) -> dict:
+        """Baut die Query-Parameter für die NewsAPI."""
+        return {
+            "country": country,
+            "pageSize": count,
+            "apiKey": self.api_key
+        }
+    
+    @staticmethod
+    def _parse_news(data: dict, count: int) -> dict:
+        """
+        Wertet eine Antwort der NewsAPI aus.
+        
+        Args:
+            data: JSON-Antwort der NewsAPI
+            count: Maximale Anzahl der Nachrichten
             
-            return {
-                "success": True,
-                "articles": articles
-            }
-        except requests.RequestException as e:
+        Returns:
+            Dictionary mit Nachrichten oder Fehlermeldung
+        """
+        if data.get("status") != "ok":
             return {
                 "success": False,
-                "error": f"Fehler beim Abrufen der Nachrichten: {str(e)}"
+                "error": data.get("message", "Unbekannter API-Fehler")
             }
+        
+        articles = []
+        for article in data.get("articles", [])[:count]:
+            articles.append({
+                "title": article.get("title", "Kein Titel"),
+                "description": article.get("description", "Keine Beschreibung"),
+                "source": article.get("source", {}).get("name", "Unbekannt"),
+                "url": article.get("url", "")
+            })
+        
+        return {
+            "success": True,
+            "articles": articles
+        }
+    
+    @staticmethod
+    def _fetch_error(error: Exception) -> dict:
+        """Fehlerergebnis für einen fehlgeschlagenen Nachrichtenabruf."""
+        return {
+            "success": False,
+            "error": f"Fehler beim Abrufen der Nachrichten: {str(error)}"
+        }
     
     def _get_demo_news(self, count: int) -> dict:
         """Gibt Demo-Nachrichten zurück wenn kein API-Key konfiguriert ist."""
@@ -107,17 +288,81 @@ class NewsService:
         if not news_data.get("success"):
             return news_data.get("error", "Unbekannter Fehler")
         
+        output = self.format_header(news_data)
+        
+        for i, article in enumerate(news_data["articles"], 1):
+            output += f"\n{self.format_article(i, article)}\n"
+        
+        return output.strip()
+    
+    @staticmethod
+    def format_header(news_data: dict) -> str:
+        """Formatiert die Überschrift einer erfolgreichen Nachrichtenliste."""
         demo_note = ""
         if news_data.get("demo"):
             demo_note = "(Demo-Daten - Konfiguriere NEWSAPI_KEY für echte Nachrichten)\n\n"
         
-        output = f"📰 Top {len(news_data['articles'])} Nachrichten:\n{demo_note}"
-        
-        for i, article in enumerate(news_data["articles"], 1):
-            output += f"""
-{i}. {article['title']}
+        return f"📰 Top {len(news_data['articles'])} Nachrichten:\n{demo_note}"
+    
+    @staticmethod
+    def format_article(index: int, article: dict) -> str:
+        """Formatiert eine einzelne Nachricht mit ihrer laufenden Nummer."""
+        return f"""{index}. {article['title']}
    📍 Quelle: {article['source']}
-   📝 {article['description'][:100]}{'...' if len(article['description']) > 100 else ''}
-"""
+   📝 {article['description'][:100]}{'...' if len(article['description']) > 100 else ''}"""
+
+
+class NewsPrefetcher:
+    """Aktualisiert die Top-Nachrichten konfigurierter Länder im Hintergrund."""
+    
+    def __init__(self, news_service: NewsService, countries: Iterable[str] = None,
+                 page_size: int = None, interval: float = None):
+        """
+        Initialisiert den Prefetcher.
         
-        return output.strip()
+        Args:
+            news_service: Service, dessen Cache befüllt wird
+            countries: Ländercodes (Standard: NEWS_PREFETCH_COUNTRIES aus Config)
+            page_size: Anzahl vorab geladener Nachrichten (Standard: aus Config)
+            interval: Sekunden zwischen zwei Aktualisierungen (Standard: aus Config)
+            
+        Raises:
+            TypeError: Bei einem asynchronen Service (refresh würde nie ausgeführt)
+        """
+        if news_service.is_async:
+            raise TypeError("NewsPrefetcher benötigt einen synchronen NewsService")
+        self.news_service = news_service
+        self.countries = list(Config.NEWS_PREFETCH_COUNTRIES if countries is None else countries)
+        self.page_size = Config.NEWS_PREFETCH_SIZE if page_size is None else page_size
+        self.interval = Config.NEWS_PREFETCH_INTERVAL if interval is None else interval
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def run_once(self):
+        """Lädt die Nachrichten aller konfigurierten Länder einmal neu."""
+        if not self.news_service._is_api_key_valid():
+            return
+        for country in self.countries:
+            self.news_service.refresh(country, self.page_size)
+    
+    def start(self):
+        """Startet die periodische Aktualisierung in einem Daemon-Thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="news-prefetch", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = None):
+        """Beendet die periodische Aktualisierung."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _run(self):
+        """Schleife des Hintergrund-Threads (erste Aktualisierung sofort)."""
+        while True:
+            self.run_once()
+            if self._stop.wait(self.interval):
+                return
@@ -3,7 +3,24 @@ NLP-Verarbeitung für den KI-Assistenten.
 Einfache Keyword-basierte Erkennung von Benutzerabsichten.
 """
 import re
-from typing import Tuple, Optional
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple, Optional
+from .forecast import WEEKDAY_NAMES, WEEKDAYS, ForecastQuery
+from .gazetteer import get_gazetteer
+
+
+# Maximale Anzahl gemerkter Ergebnisse pro process_many-Aufruf (Standard für memo_size)
+PROCESS_MANY_MEMO_SIZE = 4096
+
+# Maximale Anzahl Städte in einer Wetteranfrage ("Wetter in Zürich, Bern und Basel")
+MAX_CITIES = 10
+
+
+def _process_chunk(processor_class: type, word_boundary: bool,
+                   texts: List[str]) -> List[Tuple[str, Optional[str]]]:
+    """Klassifiziert einen Block von Texten in einem Worker-Prozess."""
+    return list(processor_class(word_boundary=word_boundary).process_many(texts))
 
 
 class NLPProcessor:
@@ -35,6 +52,124 @@ class NLPProcessor:
         "bye", "ciao", "ende"
     ]
     
+    # Absichten in Prioritätsreihenfolge (exit > help > greeting > weather > news).
+    # Wetter-, Nachrichten- und Hilfe-Begriffe werden auch innerhalb von
+    # Komposita erkannt ("Unwetter", "Sportnachrichten", "Außentemperatur").
+    # Bei Wortgrenzen-Matching müssen die kurzen Grüße und Exit-Befehle als
+    # ganzes Wort vorkommen ("hi" trifft nicht "hier", "ende" nicht "Wochenende").
+    INTENTS = (
+        ("exit", "EXIT_KEYWORDS", False),
+        ("help", "HELP_KEYWORDS", True),
+        ("greeting", "GREETING_KEYWORDS", False),
+        ("weather", "WEATHER_KEYWORDS", True),
+        ("news", "NEWS_KEYWORDS", True),
+    )
+    
+    # Eine oder mehrere Städte, getrennt durch Komma, "und" oder "&"
+    CITY_LIST = r"(\w+(?:(?:\s*,\s*|\s+und\s+|\s*&\s*)\w+)*)"
+    
+    CITY_PATTERNS = [
+        re.compile(rf"(?:wetter|temperatur)\s+(?:in|für|bei)\s+{CITY_LIST}", re.IGNORECASE),
+        re.compile(rf"(?:in|für|bei)\s+{CITY_LIST}\s+(?:wetter|temperatur)", re.IGNORECASE),
+    ]
+    
+    CITY_SEPARATOR = re.compile(r"\s*,\s*|\s+und\s+|\s*&\s*", re.IGNORECASE)
+    
+    # Wörter nach Komma/"und", die keine weitere Stadt sind ("Bern, bitte",
+    # "Zürich und Umgebung", "Bern und wie warm ist es?")
+    CITY_LIST_STOPWORDS = {
+        "bitte", "danke", "wie", "was", "wo", "wann", "warum", "ob", "ist", "gibt",
+        "es", "auch", "dann", "jetzt", "umgebung", "umland", "region", "gegend",
+        "nähe", "land", "stadt", "kanton"
+    }
+    
+    # Zeiträume, die eine Wetterfrage zur Vorhersage machen ("Guten Morgen" ist keiner)
+    FORECAST_PERIODS = [
+        ("day_after_tomorrow", re.compile(r"\bübermorgen\b")),
+        ("tomorrow", re.compile(r"(?<!guten )\bmorgen\b")),
+        ("weekend", re.compile(r"\bwochenende\b")),
+        ("week", re.compile(r"\bwoche\b|\b(?:nächsten|kommenden|7|sieben)\s+tagen?\b")),
+    ] + [
+        (weekday, re.compile(rf"\b{name.lower()}\b")) for weekday, name in zip(WEEKDAYS, WEEKDAY_NAMES)
+    ]
+    
+    # Gefragter Aspekt einer Vorhersage (ohne Treffer: Übersicht)
+    FORECAST_ASPECTS = [
+        ("rain", re.compile(r"\b(?:regen|regn|niederschl|schauer)\w*")),
+        ("wind", re.compile(r"\b(?:wind|sturm|stürm|böe)\w*")),
+        ("temperature", re.compile(
+            r"\b(?:temperatur|warm|wärm|kalt|kält|heiß|heiss|grad|frost|höchst|tiefst)\w*"
+        )),
+    ]
+    
+    # Ort in Vorhersagefragen ("Regen diese Woche in Bern")
+    PLACE_PATTERN = re.compile(r"\b(?:in|für|bei)\s+(\w+)")
+    PLACE_STOPWORDS = {
+        "der", "die", "das", "dem", "den", "des", "ein", "eine", "einer", "einem",
+        "diese", "dieser", "diesem", "dieses", "heute", "zukunft"
+    }
+    
+    NEWS_COUNT_PATTERNS = [
+        re.compile(r"top\s*(\d+)", re.IGNORECASE),
+        re.compile(r"(\d+)\s*(?:news|nachrichten|meldungen)", re.IGNORECASE),
+    ]
+    
+    # Kompilierte Matcher je Modus (Wortgrenzen ja/nein), einmal pro Klasse gebaut
+    _matchers = {}
+    
+    def __init__(self, word_boundary: bool = True):
+        """
+        Initialisiert den Prozessor.
+        
+        Args:
+            word_boundary: Grüße und Exit-Befehle nur als ganze Wörter erkennen
+                (False: reine Teilstring-Suche wie in früheren Versionen)
+        """
+        self.word_boundary = word_boundary
+        self._matcher = self._get_matcher(word_boundary)
+        self._priority = {intent: rank for rank, (intent, _, _) in enumerate(self.INTENTS)}
+    
+    @classmethod
+    def _get_matcher(cls, word_boundary: bool) -> re.Pattern:
+        """
+        Baut einen einzigen regulären Ausdruck für alle Absichten.
+        
+        Jede Absicht ist eine benannte Gruppe in Prioritätsreihenfolge. Die
+        Alternation steht in einem Lookahead, sodass an jeder Position alle
+        (auch überlappende) Treffer wie bei den früheren Einzel-Scans gefunden
+        werden; ein Schlüsselwort verdeckt keines einer anderen Absicht
+        ("Wetterhilfe" ist Hilfe). Mit Wortgrenzen stehen Grüße und
+        Exit-Befehle zwischen \\b, alle anderen Begriffe werden auch mitten
+        im Wort erkannt.
+        """
+        key = (cls, word_boundary)
+        if key not in cls._matchers:
+            groups = []
+            for intent, attribute, in_compounds in cls.INTENTS:
+                keywords = sorted(getattr(cls, attribute), key=len, reverse=True)
+                alternation = "|".join(re.escape(keyword) for keyword in keywords)
+                if word_boundary and not in_compounds:
+                    alternation = rf"\b(?:{alternation})\b"
+                groups.append(f"(?P<{intent}>{alternation})")
+            
+            cls._matchers[key] = re.compile(f"(?=(?:{'|'.join(groups)}))")
+        return cls._matchers[key]
+    
+    def find_intents(self, text: str) -> List[Tuple[str, int]]:
+        """
+        Findet alle Absichts-Treffer in einem Durchlauf.
+        
+        Beginnen an einer Position Schlüsselwörter mehrerer Absichten, wird
+        nur die Absicht mit der höchsten Priorität gemeldet.
+        
+        Args:
+            text: Benutzereingabe (wird nicht normalisiert)
+            
+        Returns:
+            Liste aus (intent, position) in Textreihenfolge
+        """
+        return [(match.lastgroup, match.start()) for match in self._matcher.finditer(text)]
+    
     def process(self, text: str) -> Tuple[str, Optional[str]]:
         """
         Verarbeitet Benutzereingabe und erkennt die Absicht.
@@ -44,7 +179,8 @@ class NLPProcessor:
             
         Returns:
             Tuple aus (intent, parameter)
-            intent kann sein: "weather", "news", "greeting", "help", "exit", "unknown"
+            intent kann sein: "weather", "forecast", "news", "greeting", "help",
+            "exit", "unknown"; bei "forecast" ist parameter eine kodierte ForecastQuery
         """
         text_lower = text.lower().strip()
         
@@ -52,56 +188,205 @@ class NLPProcessor:
         if not text_lower:
             return ("unknown", None)
         
-        # Exit-Befehle prüfen
-        if any(keyword in text_lower for keyword in self.EXIT_KEYWORDS):
-            return ("exit", None)
-        
-        # Hilfe prüfen (vor Begrüßung wegen "hilfe" enthält "hi")
-        if any(keyword in text_lower for keyword in self.HELP_KEYWORDS):
-            return ("help", None)
+        intent = self._classify(text_lower)
         
-        # Begrüßung prüfen
-        if any(keyword in text_lower for keyword in self.GREETING_KEYWORDS):
-            return ("greeting", None)
+        # Wetter - mit Zeitraum ("morgen", "diese Woche") als Vorhersage, sonst aktuell.
+        # Ohne Wetter-Schlüsselwort zählt eine Frage mit Zeitraum und Aspekt
+        # ("Regnet es morgen?") ebenfalls als Vorhersage.
+        if intent in ("weather", "unknown"):
+            forecast = self._extract_forecast(text_lower)
+            if forecast is not None and (intent == "weather" or forecast.aspect != "summary"):
+                return ("forecast", forecast.to_parameter())
         
-        # Wetter prüfen - auch nach Stadt suchen
-        if any(keyword in text_lower for keyword in self.WEATHER_KEYWORDS):
-            city = self._extract_city(text_lower)
+        if intent == "weather":
+            city = self._extract_city(text.strip())
             return ("weather", city)
         
-        # Nachrichten prüfen - auch nach Anzahl suchen
-        if any(keyword in text_lower for keyword in self.NEWS_KEYWORDS):
+        # Nachrichten - auch nach Anzahl suchen
+        if intent == "news":
             count = self._extract_news_count(text_lower)
             return ("news", str(count) if count else None)
         
+        return (intent, None)
+    
+    def process_many(self, texts: Iterable[str], processes: int = None,
+                     chunksize: int = 1000,
+                     memo_size: int = PROCESS_MANY_MEMO_SIZE) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Klassifiziert viele Eingaben und liefert die Ergebnisse als Stream.
+        
+        Jede unterschiedliche Eingabe kostet einen Aufruf von process; es gibt
+        keine Vektorisierung. Gespart wird nur bei wiederholten Eingaben: die
+        Ergebnisse der ersten memo_size verschiedenen Texte werden für diesen
+        Aufruf gemerkt. Mit processes > 1 werden Blöcke von chunksize Texten
+        auf einen Prozess-Pool verteilt, was sich wegen des Prozessstarts und
+        der Serialisierung erst bei sehr großen Eingaben lohnt. Die
+        Reihenfolge der Ergebnisse entspricht immer der Eingabe.
+        
+        Args:
+            texts: Beliebiges Iterable von Benutzereingaben (auch Generatoren)
+            processes: Anzahl Worker-Prozesse (Standard: im aktuellen Prozess)
+            chunksize: Texte pro Block im Prozess-Pool
+            memo_size: Maximale Anzahl gemerkter Ergebnisse (0 = keine)
+            
+        Returns:
+            Iterator über (intent, parameter) je Eingabe
+        """
+        if processes is not None and processes > 1:
+            return self._process_many_parallel(texts, processes, chunksize)
+        return self._process_many_serial(texts, memo_size)
+    
+    def _process_many_serial(self, texts: Iterable[str],
+                             memo_size: int) -> Iterator[Tuple[str, Optional[str]]]:
+        """Klassifiziert im aktuellen Prozess und merkt sich bis zu memo_size Eingaben."""
+        memo = {}
+        process = self.process
+        for text in texts:
+            result = memo.get(text)
+            if result is None:
+                result = process(text)
+                if len(memo) < memo_size:
+                    memo[text] = result
+            yield result
+    
+    def _process_many_parallel(self, texts: Iterable[str], processes: int,
+                               chunksize: int) -> Iterator[Tuple[str, Optional[str]]]:
+        """Verteilt Blöcke auf einen Prozess-Pool mit begrenzter Anzahl offener Blöcke."""
+        # multiprocessing erst bei Bedarf laden (kostet sonst bei jedem Start)
+        from concurrent.futures import ProcessPoolExecutor
+
+        iterator = iter(texts)
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            while True:
+                while len(pending) < processes * 2:
+                    chunk = list(islice(iterator, chunksize))
+                    if not chunk:
+                        break
+                    pending.append(executor.submit(
+                        _process_chunk, type(self), self.word_boundary, chunk
+                    ))
+                
+                if not pending:
+                    return
+                yield from pending.popleft().result()
+    
+    def _classify(self, text_lower: str) -> str:
+        """Wählt unter allen Treffern die Absicht mit der höchsten Priorität."""
+        best = None
+        for match in self._matcher.finditer(text_lower):
+            rank = self._priority[match.lastgroup]
+            if best is None or rank < best:
+                best = rank
+                if best == 0:
+                    break
+        
         # Keine Absicht erkannt
-        return ("unknown", None)
+        if best is None:
+            return "unknown"
+        return self.INTENTS[best][0]
     
     def _extract_city(self, text: str) -> Optional[str]:
-        """Versucht eine Stadt aus dem Text zu extrahieren."""
-        # Einfache Muster wie "Wetter in Berlin" oder "Wetter für München"
-        patterns = [
-            r"(?:wetter|temperatur)\s+(?:in|für|bei)\s+(\w+)",
-            r"(?:in|für|bei)\s+(\w+)\s+(?:wetter|temperatur)",
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        """
+        Versucht eine oder mehrere Städte aus dem Text zu extrahieren.
+        
+        Mehrere Städte ("Wetter in Zürich, Bern und Basel") werden als
+        kommagetrennte Liste zurückgegeben ("Zürich, Bern, Basel"). Text
+        sollte die Originalschreibweise haben, siehe _is_listed_city.
+        """
+        cities = self._extract_cities(text)
+        return ", ".join(cities) if cities else None
+    
+    def _extract_cities(self, text: str) -> List[str]:
+        """
+        Extrahiert alle genannten Städte (ohne Duplikate, höchstens MAX_CITIES).
+        
+        Bekannte Städte werden über das Ortsverzeichnis auf ihre kanonische
+        Schreibweise gebracht (z.B. "zuerich" -> "Zürich"). Tippfehler bleiben
+        stehen ("Berln"); sie korrigiert erst der Wetter-Service, wenn die
+        Geocoding-API den Namen nicht kennt. Die Aufzählung endet beim ersten
+        Eintrag nach Komma, "und" oder "&", der keine Stadt ist
+        ("Wetter in Bern, bitte" -> ["Bern"]).
+        """
+        # Einfache Muster wie "Wetter in Berlin" oder "Wetter für München und Wien"
+        for pattern in self.CITY_PATTERNS:
+            match = pattern.search(text)
             if match:
-                return match.group(1).capitalize()
+                cities = []
+                for position, candidate in enumerate(self.CITY_SEPARATOR.split(match.group(1))):
+                    entry = get_gazetteer().lookup(candidate)
+                    if (position > 0 and entry is None and get_gazetteer().fuzzy(candidate) is None
+                            and not self._is_listed_city(candidate)):
+                        break
+                    city = entry["name"] if entry is not None else candidate.capitalize()
+                    if city not in cities:
+                        cities.append(city)
+                return cities[:MAX_CITIES]
+        
+        return []
+    
+    def _extract_forecast(self, text: str) -> Optional[ForecastQuery]:
+        """
+        Erkennt Zeitraum, Aspekt und Ort einer Vorhersagefrage.
+        
+        Returns:
+            ForecastQuery oder None, wenn kein Zeitraum genannt ist
+        """
+        period = next((name for name, pattern in self.FORECAST_PERIODS if pattern.search(text)), None)
+        if period is None:
+            return None
+        
+        aspect = next(
+            (name for name, pattern in self.FORECAST_ASPECTS if pattern.search(text)), "summary"
+        )
+        return ForecastQuery(period, aspect, self._extract_place(text))
+    
+    def _extract_place(self, text: str) -> Optional[str]:
+        """
+        Sucht einen Ort nach "in", "für" oder "bei" ("Regen morgen in Bern").
+        
+        Bekannte Städte werden kanonisch geschrieben; Artikel und Zeitangaben
+        ("in der Woche", "für morgen") werden übersprungen.
+        """
+        cities = self._extract_cities(text)
+        if cities and self._is_place(cities[0].lower()):
+            return cities[0]
         
+        for match in self.PLACE_PATTERN.finditer(text):
+            candidate = match.group(1)
+            entry = get_gazetteer().lookup(candidate)
+            if entry is not None:
+                return entry["name"]
+            if self._is_place(candidate):
+                return candidate.capitalize()
         return None
     
+    def _is_listed_city(self, candidate: str) -> bool:
+        """
+        Prüft, ob ein unbekanntes Wort in einer Aufzählung eine weitere Stadt ist.
+        
+        Nur großgeschriebene Wörter, die weder Füllwort noch Zeitangabe sind,
+        zählen ("Wetter in Bern und Thalwil", aber nicht "Bern und Umgebung").
+        """
+        lowered = candidate.lower()
+        return (
+            candidate[:1].isupper() and lowered not in self.CITY_LIST_STOPWORDS
+            and self._is_place(lowered)
+        )
+    
+    def _is_place(self, candidate: str) -> bool:
+        """Prüft, ob ein Wort nach "in"/"für" ein Ort sein kann (kein Artikel, keine Zeitangabe)."""
+        first = candidate.split()[0] if candidate.split() else ""
+        return bool(first) and not (
+            first in self.PLACE_STOPWORDS or first.isdigit()
+            or any(pattern.search(candidate) for _, pattern in self.FORECAST_PERIODS)
+        )
+    
     def _extract_news_count(self, text: str) -> Optional[int]:
         """Versucht die gewünschte Anzahl von Nachrichten zu extrahieren."""
         # Suche nach Zahlen im Text
-        patterns = [
-            r"top\s*(\d+)",
-            r"(\d+)\s*(?:news|nachrichten|meldungen)",
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in self.NEWS_COUNT_PATTERNS:
+            match = pattern.search(text)
             if match:
                 count = int(match.group(1))
                 return min(max(count, 1), 10)  # Zwischen 1 und 10
@@ -0,0 +1,118 @@
+"""
+Antwort-Cache für den KI-Assistenten.
+Hält fertig gerenderte Antworten (Text, JSON-Bytes und ETag) je
+(intent, parameter) vor, sodass häufige Anfragen den Service-Layer nicht
+erreichen und nicht erneut serialisiert werden.
+"""
+import hashlib
+import json
+import threading
+from typing import NamedTuple, Optional
+from .cache import TTLCache
+from .config import Config
+
+
+# Lebensdauer deterministischer Antworten (Begrüßung, Hilfe, ...) für HTTP-Clients
+STATIC_MAX_AGE = 86400
+
+
+class RenderedResponse(NamedTuple):
+    """Eine fertig gerenderte Antwort."""
+
+    text: str
+    body: bytes
+    etag: str
+    max_age: int
+
+
+class ResponseCache:
+    """
+    Cache gerenderter Antworten.
+
+    Deterministische Antworten werden unbegrenzt gehalten, dynamische
+    (Wetter je Stadt, Nachrichten je Anzahl) nur für RESPONSE_CACHE_TTL.
+    """
+
+    def __init__(self, maxsize: int = None, ttl: float = None):
+        """
+        Initialisiert den Cache.
+
+        Args:
+            maxsize: Maximale Anzahl dynamischer Antworten (Standard: aus Config)
+            ttl: Lebensdauer dynamischer Antworten in Sekunden (Standard: aus Config)
+        """
+        self.ttl = Config.RESPONSE_CACHE_TTL if ttl is None else ttl
+        self._static = {}
+        self._static_lock = threading.Lock()
+        self._dynamic = TTLCache(
+            maxsize=Config.RESPONSE_CACHE_SIZE if maxsize is None else maxsize,
+            ttl=self.ttl
+        )
+
+    @staticmethod
+    def render(text: str, max_age: int = 0) -> RenderedResponse:
+        """
+        Serialisiert eine Antwort als JSON und berechnet ihren ETag.
+
+        Args:
+            text: Antworttext des Assistenten
+            max_age: Sekunden, die Clients die Antwort wiederverwenden dürfen
+
+        Returns:
+            RenderedResponse mit Text, JSON-Bytes und ETag
+        """
+        body = json.dumps({"response": text}, ensure_ascii=False).encode("utf-8")
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        return RenderedResponse(text, body, etag, max_age)
+
+    @staticmethod
+    def is_cacheable(data: dict) -> bool:
+        """
+        Prüft, ob ein Service-Ergebnis in den Cache darf.
+
+        Demo-Daten (z.B. bei offenem Circuit Breaker) und Tabellen mehrerer
+        Städte mit fehlgeschlagenen Einträgen würden sonst für die ganze TTL
+        ausgeliefert, obwohl der Upstream längst wieder antwortet.
+
+        Args:
+            data: Ergebnis von WeatherService oder NewsService
+
+        Returns:
+            True, wenn die Abfrage vollständig mit echten Daten gelungen ist
+        """
+        entries = data.get("results", [data])
+        return bool(data.get("success")) and not data.get("demo") and all(
+            entry.get("success") and not entry.get("demo") for entry in entries
+        )
+
+    def get(self, intent: str, parameter: Optional[str]) -> Optional[RenderedResponse]:
+        """Liefert eine gecachte Antwort oder None."""
+        key = (intent, parameter)
+        rendered = self._static.get(key)
+        if rendered is None:
+            rendered = self._dynamic.get(key)
+        return rendered
+
+    def put_static(self, intent: str, parameter: Optional[str], text: str) -> RenderedResponse:
+        """Rendert und speichert eine deterministische Antwort ohne Ablaufzeit."""
+        rendered = self.render(text, STATIC_MAX_AGE)
+        with self._static_lock:
+            return self._static.setdefault((intent, parameter), rendered)
+
+    def put(self, intent: str, parameter: Optional[str], text: str) -> RenderedResponse:
+        """Rendert und speichert eine dynamische Antwort für self.ttl Sekunden."""
+        rendered = self.render(text, int(self.ttl))
+        self._dynamic.set((intent, parameter), rendered)
+        return rendered
+
+    def clear(self):
+        """Leert den Cache."""
+        with self._static_lock:
+            self._static.clear()
+        self._dynamic.clear()
+
+    def stats(self) -> dict:
+        """Gibt Größe und Treffer-Zähler des Caches zurück."""
+        stats = self._dynamic.stats()
+        stats["static"] = len(self._static)
+        return stats
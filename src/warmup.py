@@ -0,0 +1,176 @@
+"""
+Aufwärmphase für den KI-Assistenten.
+Nach dem Start werden die Standardstadt, beliebte Städte und Nachrichten-
+länder im Hintergrund geladen und die Caches optional aus einem Snapshot
+des letzten Laufs wiederhergestellt, damit die ersten Anfragen nach einem
+Deploy nicht auf leere Caches treffen.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+from .config import Config
+from .forecast import ForecastQuery
+
+
+# Version des Snapshot-Formats (ältere oder neuere Dateien werden ignoriert)
+SNAPSHOT_VERSION = 1
+
+warmup_logger = logging.getLogger("ki.warmup")
+
+
+class CacheWarmer:
+    """Füllt die Caches von Wetter- und News-Service beim Start."""
+
+    def __init__(self, weather_service, news_service, cities: Iterable[str] = None,
+                 countries: Iterable[str] = None, snapshot_path: Optional[str] = None,
+                 workers: int = None):
+        """
+        Initialisiert die Aufwärmphase.
+
+        Args:
+            weather_service: Wetter-Service, dessen Caches befüllt werden
+            news_service: News-Service, dessen Cache befüllt wird
+            cities: Beliebte Städte (Standard: WARMUP_CITIES aus Config)
+            countries: Nachrichtenländer (Standard: WARMUP_NEWS_COUNTRIES aus Config)
+            snapshot_path: Snapshot-Datei (Standard: CACHE_SNAPSHOT_FILE aus Config)
+            workers: Parallele Abrufe (Standard: WARMUP_WORKERS aus Config)
+
+        Raises:
+            TypeError: Bei asynchronen Services (die Abrufe würden nie ausgeführt)
+        """
+        if weather_service.is_async or news_service.is_async:
+            raise TypeError("CacheWarmer benötigt synchrone Services")
+        self.weather_service = weather_service
+        self.news_service = news_service
+        self.cities = list(Config.WARMUP_CITIES if cities is None else cities)
+        self.countries = list(Config.WARMUP_NEWS_COUNTRIES if countries is None else countries)
+        self.snapshot_path = Config.CACHE_SNAPSHOT_FILE if snapshot_path is None else snapshot_path
+        self.workers = Config.WARMUP_WORKERS if workers is None else workers
+        self._thread = None
+
+    def run(self) -> dict:
+        """
+        Führt die Aufwärmphase einmal blockierend aus.
+
+        Die Standardstadt wird aufgelöst und samt Vorhersage geladen; alle
+        Städte werden parallel geocodiert und ihr aktuelles Wetter mit einem
+        gemeinsamen Forecast-Aufruf abgefragt. Nachrichtenländer laufen
+        parallel dazu. Fehler einzelner Abrufe beenden die Phase nicht.
+
+        Returns:
+            Dictionary mit Anzahl der Städte, Länder, Fehler und Dauer
+        """
+        start = time.perf_counter()
+        default_city = self.weather_service.default_city
+        cities = list(dict.fromkeys([default_city, *self.cities]))
+        countries = self.countries if self.news_service._is_api_key_valid() else []
+
+        with ThreadPoolExecutor(max_workers=max(1, self.workers),
+                                thread_name_prefix="ki-warmup") as executor:
+            news = [
+                executor.submit(self.news_service.refresh, country, Config.NEWS_PREFETCH_SIZE)
+                for country in countries
+            ]
+            forecast = executor.submit(
+                self.weather_service.get_forecast, ForecastQuery("week", city=default_city)
+            )
+            list(executor.map(self.weather_service.locate, cities))
+            weather = executor.submit(self.weather_service.get_weather_many, cities)
+
+            errors = 0
+            for future in [*news, forecast, weather]:
+                try:
+                    result = future.result()
+                except Exception:
+                    errors += 1
+                    continue
+                if result.get("success") is False:
+                    errors += 1
+
+        stats = {
+            "cities": len(cities),
+            "countries": len(countries),
+            "errors": errors,
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+        warmup_logger.info("Aufwärmphase abgeschlossen: %s", json.dumps(stats))
+        return stats
+
+    def start(self):
+        """Startet die Aufwärmphase in einem Daemon-Thread (der Start wartet nicht darauf)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run_safely, name="ki-warmup", daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: float = None):
+        """Wartet auf eine laufende Aufwärmphase."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run_safely(self):
+        """Führt run aus; unerwartete Fehler dürfen den Dienst nicht beenden."""
+        try:
+            self.run()
+        except Exception:
+            warmup_logger.exception("Aufwärmphase fehlgeschlagen")
+
+    def restore(self) -> int:
+        """
+        Stellt die Caches aus der Snapshot-Datei wieder her.
+
+        Fehlende, beschädigte oder fremde Dateien werden ignoriert; abgelaufene
+        Einträge werden übersprungen.
+
+        Returns:
+            Anzahl übernommener Einträge
+        """
+        if not self.snapshot_path:
+            return 0
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+            return 0
+
+        try:
+            return (self.weather_service.restore_caches(snapshot.get("weather", {}))
+                    + self.news_service.restore_caches(snapshot.get("news", {})))
+        except (TypeError, ValueError, AttributeError):
+            warmup_logger.warning("Snapshot %s ist ungültig und wurde ignoriert", self.snapshot_path)
+            return 0
+
+    def save(self) -> bool:
+        """
+        Schreibt die Caches atomar in die Snapshot-Datei.
+
+        Returns:
+            True, wenn der Snapshot geschrieben wurde
+        """
+        if not self.snapshot_path:
+            return False
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": time.time(),
+            "weather": self.weather_service.snapshot_caches(),
+            "news": self.news_service.snapshot_caches()
+        }
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.snapshot_path)
+        except (OSError, TypeError, ValueError):
+            # Der Snapshot ist optional - beim nächsten Start sind die Caches dann kalt
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return False
+        return True
@@ -2,13 +2,28 @@
 Wetter-Service für den KI-Assistenten.
 Nutzt die Open-Meteo API (kostenlos, kein API-Key erforderlich).
 """
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 import requests
+from .cache import SingleFlight, TTLCache
+from .circuit_breaker import CLOSED, OPEN, CircuitBreaker, CircuitOpenError
 from .config import Config
+from .forecast import (
+    DAILY_VARIABLES, FORECAST_DAYS, HOURLY_VARIABLES, PERIOD_LABELS, WEEKDAY_NAMES,
+    ForecastQuery, ForecastSeries
+)
+from .gazetteer import get_gazetteer
+from .geo import GridIndex, snap_to_grid
+from .http_client import get_session
 
 
 # Konvertierungsfaktor von km/h zu m/s
 KMH_TO_MS = 3.6
 
+# Nachkommastellen für Forecast-Cache-Schlüssel ohne Raster (FORECAST_GRID_KM = 0)
+FORECAST_COORDINATE_PRECISION = 2
+
 # Mapping von WMO Wettercodes zu deutschen Beschreibungen
 WMO_CODES = {
     0: "sonnig",
@@ -38,47 +53,268 @@ WMO_CODES = {
 class WeatherService:
     """Service zum Abrufen von Wetterdaten."""
     
-    def __init__(self):
+    # Öffentliche Abrufmethoden sind Coroutinen (siehe AsyncWeatherService)
+    is_async = False
+    
+    def __init__(self, session: requests.Session = None, shared: "WeatherService" = None):
+        """
+        Initialisiert den Service.
+        
+        Args:
+            session: HTTP-Session (Standard: gemeinsam genutzte Session)
+            shared: Service, dessen Caches, Indizes und Circuit Breaker
+                mitbenutzt werden, statt eigene anzulegen
+        """
+        self.session = session or get_session()
+        self.timeout = Config.get_timeout()
         self.api_url = Config.WEATHER_API_URL
         self.geocoding_url = Config.GEOCODING_API_URL
         self.default_city = Config.DEFAULT_CITY
+        self._geocoding_flight = SingleFlight()
+        self._forecast_flight = SingleFlight()
+        if shared is not None:
+            self.gazetteer = shared.gazetteer
+            self.geocoding_cache = shared.geocoding_cache
+            self.geocoding_misses = shared.geocoding_misses
+            self.forecast_cache = shared.forecast_cache
+            self.series_cache = shared.series_cache
+            self.forecast_index = shared.forecast_index
+            self.series_index = shared.series_index
+            self.geocoding_breaker = shared.geocoding_breaker
+            self.forecast_breaker = shared.forecast_breaker
+        else:
+            self.geocoding_cache = TTLCache(
+                maxsize=Config.GEOCODING_CACHE_SIZE,
+                ttl=Config.GEOCODING_CACHE_TTL,
+                path=Config.GEOCODING_CACHE_FILE
+            )
+            self.geocoding_misses = TTLCache(
+                maxsize=Config.GEOCODING_NEGATIVE_CACHE_SIZE,
+                ttl=Config.GEOCODING_NEGATIVE_TTL
+            )
+            self.gazetteer = get_gazetteer() if Config.GAZETTEER_ENABLED else None
+            self.forecast_cache = TTLCache(
+                maxsize=Config.FORECAST_CACHE_SIZE,
+                ttl=Config.FORECAST_CACHE_TTL,
+                stale_ttl=Config.FORECAST_CACHE_STALE_TTL
+            )
+            self.series_cache = TTLCache(
+                maxsize=Config.FORECAST_SERIES_CACHE_SIZE,
+                ttl=Config.FORECAST_SERIES_TTL
+            )
+            # Gecachte Rasterpunkte für die Wiederverwendung in der Umgebung
+            self.forecast_index = GridIndex(Config.FORECAST_REUSE_RADIUS_KM)
+            self.series_index = GridIndex(Config.FORECAST_REUSE_RADIUS_KM)
+            self.geocoding_breaker = CircuitBreaker("open-meteo-geocoding")
+            self.forecast_breaker = CircuitBreaker("open-meteo-forecast")
+        self._refreshing = {}
+        self._refresh_lock = threading.Lock()
+    
+    def snapshot_caches(self) -> dict:
+        """
+        Gibt Geocoding- und Forecast-Caches für einen Snapshot zurück.
+        
+        Die Vorhersage-Reihen (Arrays) sind nicht enthalten; sie werden bei
+        der ersten Vorhersagefrage neu geladen.
+        
+        Returns:
+            {Cache-Name: Einträge (siehe TTLCache.snapshot)}
+        """
+        return {
+            "geocoding": self.geocoding_cache.snapshot(),
+            "geocoding_negative": self.geocoding_misses.snapshot(),
+            "forecast": self.forecast_cache.snapshot()
+        }
+    
+    def restore_caches(self, snapshot: dict) -> int:
+        """
+        Übernimmt Caches aus einem Snapshot und baut den Umkreisindex neu auf.
+        
+        Args:
+            snapshot: Ergebnis von snapshot_caches
+            
+        Returns:
+            Anzahl übernommener Einträge
+        """
+        restored = (
+            self.geocoding_cache.restore(snapshot.get("geocoding", {}))
+            + self.geocoding_misses.restore(snapshot.get("geocoding_negative", {}))
+            + self.forecast_cache.restore(snapshot.get("forecast", {}))
+        )
+        for key in self.forecast_cache.keys():
+            latitude, longitude = (float(value) for value in key.split(","))
+            self.forecast_index.add(key, latitude, longitude)
+        return restored
+    
+    @staticmethod
+    def _geocoding_cache_key(city: str, language: str) -> str:
+        """Bildet den Cache-Schlüssel aus normalisiertem Stadtnamen und Sprache."""
+        return f"{language}:{' '.join(city.split()).casefold()}"
+    
+    def _lookup_location(self, city: str, language: str) -> dict:
+        """
+        Sucht eine Stadt lokal (Ortsverzeichnis und Geocoding-Cache).
+        
+        Nur exakte Treffer; Tippfehler korrigiert erst _correct_location,
+        wenn die Geocoding-API den Namen nicht kennt ("Lienz" ist nicht Linz).
+        
+        Args:
+            city: Name der Stadt
+            language: Sprache der Ergebnisse
+            
+        Returns:
+            Dictionary mit latitude, longitude und name oder None
+        """
+        # Die Namen im Ortsverzeichnis sind deutsch
+        use_gazetteer = self.gazetteer is not None and language == "de"
+        if use_gazetteer:
+            entry = self.gazetteer.lookup(city)
+            if entry is not None:
+                return self._gazetteer_location(entry)
+        
+        return self.geocoding_cache.get(self._geocoding_cache_key(city, language))
+    
+    def _correct_location(self, city: str, language: str) -> dict:
+        """
+        Korrigiert einen Tippfehler ("Berln", "Müchen") über die unscharfe
+        Suche im Ortsverzeichnis.
+        
+        Greift nur, wenn die Geocoding-API den Namen nachweislich nicht kennt
+        (Eintrag im Negativ-Cache), damit echte Orte wie "Lienz" oder "Essex"
+        nicht durch ähnlich geschriebene ersetzt werden.
+        
+        Args:
+            city: Name der Stadt
+            language: Sprache der Ergebnisse
+            
+        Returns:
+            Dictionary mit latitude, longitude, name und corrected_from oder None
+        """
+        if self.gazetteer is None or language != "de":
+            return None
+        if self._geocoding_cache_key(city, language) not in self.geocoding_misses:
+            return None
+        entry = self.gazetteer.fuzzy(city)
+        if entry is None:
+            return None
+        location = self._gazetteer_location(entry)
+        location["corrected_from"] = city
+        return location
+    
+    @staticmethod
+    def _gazetteer_location(entry: dict) -> dict:
+        """Wandelt einen Eintrag des Ortsverzeichnisses in ein Geocoding-Ergebnis."""
+        return {
+            "latitude": entry["latitude"],
+            "longitude": entry["longitude"],
+            "name": entry["name"]
+        }
+    
+    @staticmethod
+    def _geocoding_params(city: str, language: str) -> dict:
+        """Baut die Query-Parameter für die Geocoding-API."""
+        return {
+            "name": city,
+            "count": 1,
+            "language": language,
+            "format": "json"
+        }
+    
+    def _store_geocoding(self, city: str, language: str, data: dict) -> dict:
+        """
+        Wertet eine Geocoding-Antwort aus und legt Treffer im Cache ab.
+        
+        Namen ohne Treffer kommen in den Negativ-Cache, damit sie bis
+        GEOCODING_NEGATIVE_TTL keinen weiteren Aufruf auslösen.
+        
+        Args:
+            city: Angefragter Stadtname
+            language: Sprache der Ergebnisse
+            data: JSON-Antwort der Geocoding-API
+            
+        Returns:
+            Dictionary mit latitude, longitude und name oder None
+        """
+        if "results" in data and len(data["results"]) > 0:
+            result = data["results"][0]
+            location = {
+                "latitude": result["latitude"],
+                "longitude": result["longitude"],
+                "name": result.get("name", city)
+            }
+            self.geocoding_cache.set(self._geocoding_cache_key(city, language), location)
+            return location
+        self.geocoding_misses.set(self._geocoding_cache_key(city, language), True)
+        return None
     
-    def _geocode_city(self, city: str) -> dict:
+    def _geocode_city(self, city: str, language: str = "de") -> dict:
         """
         Ermittelt die Koordinaten einer Stadt.
         
+        Zuerst wird das Offline-Ortsverzeichnis befragt. Erfolgreiche
+        API-Ergebnisse werden im Geocoding-Cache abgelegt, sodass wiederholte
+        Anfragen für dieselbe Stadt keinen HTTP-Aufruf auslösen; gleichzeitige
+        Anfragen teilen sich einen Aufruf. Namen, die die API kürzlich nicht
+        gefunden hat, werden ohne Aufruf als Tippfehler korrigiert
+        (siehe _correct_location) oder abgelehnt.
+        
         Args:
             city: Name der Stadt
+            language: Sprache der Ergebnisse (Standard: de)
             
         Returns:
             Dictionary mit latitude, longitude und name oder None bei Fehler
         """
+        location = self._lookup_location(city, language)
+        if location is not None:
+            return location
+        
+        key = self._geocoding_cache_key(city, language)
+        if not self.geocoding_misses.get(key):
+            location = self._geocoding_flight.do(key, lambda: self._load_geocoding(city, language))
+            if location is not None:
+                return location
+        return self._correct_location(city, language)
+    
+    def _load_geocoding(self, city: str, language: str) -> dict:
+        """Fragt die Geocoding-API ab (None bei Fehler, unbekannter Stadt oder offenem Breaker)."""
         try:
-            params = {
-                "name": city,
-                "count": 1,
-                "language": "de",
-                "format": "json"
-            }
-            response = requests.get(self.geocoding_url, params=params, timeout=10, proxies=Config.get_proxies())
-            response.raise_for_status()
-            data = response.json()
-            
-            if "results" in data and len(data["results"]) > 0:
-                result = data["results"][0]
-                return {
-                    "latitude": result["latitude"],
-                    "longitude": result["longitude"],
-                    "name": result.get("name", city)
-                }
-            return None
-        except requests.RequestException:
+            data = self.geocoding_breaker.call(lambda: self._request_geocoding(city, language))
+        except (requests.RequestException, ValueError, CircuitOpenError):
             return None
+        return self._store_geocoding(city, language, data)
+    
+    def _request_geocoding(self, city: str, language: str) -> dict:
+        """Führt den HTTP-Aufruf der Geocoding-API aus."""
+        params = self._geocoding_params(city, language)
+        response = self.session.get(self.geocoding_url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+    
+    def locate(self, city: str = None) -> dict:
+        """
+        Ermittelt die Koordinaten einer Stadt (erster Schritt von get_weather).
+        
+        Args:
+            city: Name der Stadt (Standard: DEFAULT_CITY aus Konfiguration)
+            
+        Returns:
+            Dictionary mit latitude, longitude und name oder None
+        """
+        return self._geocode_city(city or self.default_city)
+    
+    @staticmethod
+    def split_cities(city: str) -> List[str]:
+        """Zerlegt eine kommagetrennte Städteliste ("Zürich, Bern, Basel")."""
+        return [part.strip() for part in city.split(",") if part.strip()]
     
     def get_weather(self, city: str = None) -> dict:
         """
         Ruft die aktuellen Wetterdaten für eine Stadt ab.
         
+        Eine kommagetrennte Liste mehrerer Städte wird an get_weather_many
+        weitergereicht.
+        
         Args:
             city: Name der Stadt (Standard: DEFAULT_CITY aus Konfiguration)
             
@@ -88,43 +324,530 @@ class WeatherService:
         if city is None:
             city = self.default_city
         
+        cities = self.split_cities(city)
+        if len(cities) > 1:
+            return self.get_weather_many(cities)
+        
         # Koordinaten der Stadt ermitteln
         location = self._geocode_city(city)
         if location is None:
-            return {
-                "success": False,
-                "error": f"Stadt '{city}' konnte nicht gefunden werden."
-            }
+            return self.city_not_found(city)
+        
+        return self.get_weather_at(location)
+    
+    def get_weather_at(self, location: dict) -> dict:
+        """
+        Ruft die aktuellen Wetterdaten für bereits ermittelte Koordinaten ab.
         
+        Args:
+            location: Dictionary mit latitude, longitude und name
+            
+        Returns:
+            Dictionary mit Wetterdaten oder Fehlermeldung
+        """
         try:
-            params = {
-                "latitude": location["latitude"],
-                "longitude": location["longitude"],
-                "current": "temperature_2m,relative_humidity_2m,apparent_temperature,weather_code,wind_speed_10m",
-                "timezone": "auto"
-            }
-            response = requests.get(self.api_url, params=params, timeout=10, proxies=Config.get_proxies())
-            response.raise_for_status()
-            data = response.json()
+            current = self._get_current(location["latitude"], location["longitude"])
+        except CircuitOpenError:
+            return self._get_demo_weather(location["name"])
+        except requests.RequestException as e:
+            return self._fetch_error(e)
+        
+        return self._build_weather(location, current)
+    
+    def get_weather_many(self, cities: List[str]) -> dict:
+        """
+        Ruft die aktuellen Wetterdaten mehrerer Städte ab.
+        
+        Alle nicht im Forecast-Cache liegenden Koordinaten werden mit einem
+        einzigen Aufruf der Forecast-API abgefragt.
+        
+        Args:
+            cities: Namen der Städte
             
-            current = data["current"]
-            weather_code = current.get("weather_code", 0)
-            description = WMO_CODES.get(weather_code, "unbekannt")
+        Returns:
+            Dictionary mit "results" (ein Wetterergebnis je Stadt)
+        """
+        locations = [self._geocode_city(city) for city in cities]
+        currents, missing = self._cached_currents(locations)
+        
+        error = None
+        if missing:
+            try:
+                currents.update(self._forecast_flight.do(
+                    ";".join(missing), lambda: self._load_current_many(missing)
+                ))
+            except CircuitOpenError:
+                # Fehlende Orte werden mit Demo-Daten beantwortet
+                pass
+            except (requests.RequestException, KeyError, ValueError) as e:
+                error = self._fetch_error(e)
+        
+        return self._build_weather_many(cities, locations, currents, error)
+    
+    def _cached_currents(self, locations: List[dict]) -> Tuple[Dict[str, dict], Dict[str, tuple]]:
+        """
+        Teilt Orte in Cache-Treffer und noch abzurufende Koordinaten auf.
+        
+        Veraltete Einträge werden ausgeliefert und im Hintergrund erneuert;
+        abzurufende Koordinaten sind gerastert (siehe _cached_current).
+        
+        Args:
+            locations: Ermittelte Orte (None für unbekannte Städte)
             
-            return {
-                "success": True,
-                "city": location["name"],
-                "temperature": current["temperature_2m"],
-                "feels_like": current["apparent_temperature"],
-                "humidity": current["relative_humidity_2m"],
-                "description": description,
-                "wind_speed": round(current["wind_speed_10m"] / KMH_TO_MS, 1)
-            }
-        except requests.RequestException as e:
+        Returns:
+            Tuple aus ({Schlüssel: current}, {Schlüssel: (latitude, longitude)})
+        """
+        currents = {}
+        missing = {}
+        for location in locations:
+            if location is None:
+                continue
+            key = self._forecast_cache_key(location["latitude"], location["longitude"])
+            if key in currents or key in missing:
+                continue
+            key, latitude, longitude, current = self._cached_current(
+                location["latitude"], location["longitude"]
+            )
+            if current is None:
+                missing[key] = (latitude, longitude)
+            else:
+                currents[key] = current
+        return currents, missing
+    
+    def _build_weather_many(self, cities: List[str], locations: List[dict],
+                            currents: Dict[str, dict], error: dict = None) -> dict:
+        """
+        Baut das Ergebnis von get_weather_many in der Reihenfolge der Städte.
+        
+        Orte ohne Messwerte erhalten error bzw. Demo-Daten, wenn kein Fehler
+        vorliegt (offener Circuit Breaker).
+        """
+        results = []
+        for city, location in zip(cities, locations):
+            if location is None:
+                results.append(self.city_not_found(city))
+                continue
+            key = self._forecast_cache_key(location["latitude"], location["longitude"])
+            if key in currents:
+                results.append(self._build_weather(location, currents[key]))
+            elif error is not None:
+                results.append(error)
+            else:
+                results.append(self._get_demo_weather(location["name"]))
+        
+        return {"success": True, "results": results}
+    
+    def get_forecast(self, query: ForecastQuery) -> dict:
+        """
+        Beantwortet eine Vorhersage-Frage (Übersicht, Regen, Wind oder Temperatur).
+        
+        Args:
+            query: Zeitraum, Aspekt und Stadt (Standard: DEFAULT_CITY)
+            
+        Returns:
+            Dictionary mit Tageswerten und Aggregaten oder Fehlermeldung
+        """
+        city = query.city or self.default_city
+        location = self._geocode_city(city)
+        if location is None:
+            return self.forecast_city_not_found(city)
+        
+        return self.get_forecast_at(location, query)
+    
+    def get_forecast_at(self, location: dict, query: ForecastQuery) -> dict:
+        """
+        Beantwortet eine Vorhersage-Frage für bereits ermittelte Koordinaten.
+        
+        Args:
+            location: Dictionary mit latitude, longitude und name
+            query: Zeitraum und Aspekt
+            
+        Returns:
+            Dictionary mit Tageswerten und Aggregaten oder Fehlermeldung
+        """
+        try:
+            series = self._get_series(location["latitude"], location["longitude"])
+        except CircuitOpenError:
+            return self._forecast_unavailable()
+        except (requests.RequestException, KeyError, ValueError) as e:
+            return self._fetch_error(e)
+        
+        return self._build_forecast(location, query, series)
+    
+    def _get_series(self, latitude: float, longitude: float) -> ForecastSeries:
+        """
+        Liefert die stündliche/tägliche Vorhersage eines Orts.
+        
+        Die Reihen werden pro Ort einmal abgerufen und für alle Folgefragen
+        aus dem Cache beantwortet; gleichzeitige Anfragen teilen sich einen Aufruf.
+        """
+        key, latitude, longitude, series = self._cached_series(latitude, longitude)
+        if series is not None:
+            return series
+        
+        return self._forecast_flight.do(
+            f"series:{key}", lambda: self._load_series(key, latitude, longitude)
+        )
+    
+    def _load_series(self, key: str, latitude: float, longitude: float) -> ForecastSeries:
+        """Ruft die Vorhersage-Reihen ab und legt sie im Cache ab."""
+        series = ForecastSeries.from_response(
+            self._request_forecast(self._series_params(latitude, longitude))
+        )
+        self._store_series(key, latitude, longitude, series)
+        return series
+    
+    def _cached_series(self, latitude: float, longitude: float) -> tuple:
+        """
+        Sucht die Vorhersage-Reihen eines Orts oder eines Nachbarn im Umkreis.
+        
+        Returns:
+            Tuple aus (Schlüssel, Breitengrad, Längengrad, Reihen oder None)
+            mit gerasterten Koordinaten für einen Abruf
+        """
+        latitude, longitude = self._snap(latitude, longitude)
+        key = self._forecast_cache_key(latitude, longitude)
+        found = self._nearest_entry(self.series_cache, self.series_index, key, latitude, longitude)
+        return key, latitude, longitude, found[0][0] if found else None
+    
+    def _store_series(self, key: str, latitude: float, longitude: float, series: ForecastSeries):
+        """
+        Legt Vorhersage-Reihen im Cache ab und nimmt den Rasterpunkt in den Index auf.
+        
+        Die Reihen verfallen spätestens um Mitternacht am Ort, weil Tag 0
+        danach nicht mehr "heute" ist ("morgen" wäre sonst der heutige Tag).
+        """
+        ttl = min(self.series_cache.ttl, series.seconds_until_midnight(time.time()))
+        self.series_cache.set(key, series, ttl=ttl)
+        self.series_index.add(key, latitude, longitude)
+    
+    @staticmethod
+    def _series_params(latitude: float, longitude: float) -> dict:
+        """Baut die Query-Parameter für die stündlichen und täglichen Reihen."""
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "hourly": HOURLY_VARIABLES,
+            "daily": DAILY_VARIABLES,
+            "forecast_days": FORECAST_DAYS,
+            "timezone": "auto"
+        }
+    
+    def forecast_city_not_found(self, city: str) -> dict:
+        """Fehlerergebnis einer Vorhersage für eine nicht aufgelöste Stadt (siehe city_not_found)."""
+        return self.city_not_found(city)
+    
+    @staticmethod
+    def _forecast_unavailable() -> dict:
+        """Fehlerergebnis bei offenem Circuit Breaker."""
+        return {
+            "success": False,
+            "error": "Die Vorhersage ist vorübergehend nicht verfügbar."
+        }
+    
+    @staticmethod
+    def _build_forecast(location: dict, query: ForecastQuery, series: ForecastSeries) -> dict:
+        """
+        Wertet die Reihen für Zeitraum und Aspekt einer Anfrage aus.
+        
+        Args:
+            location: Ermittelter Ort
+            query: Zeitraum und Aspekt
+            series: Vorhersage-Reihen des Orts
+            
+        Returns:
+            Dictionary mit Tageswerten, Temperaturspanne, Regenstunden und
+            windigstem Tag des Zeitraums
+        """
+        label = PERIOD_LABELS[query.period]
+        days = series.days(query.period)
+        if not days:
             return {
                 "success": False,
-                "error": f"Fehler beim Abrufen der Wetterdaten: {str(e)}"
+                "error": f"Für {label} liegt noch keine Vorhersage vor."
             }
+        
+        day_results = []
+        for day in days:
+            low, high, _ = series.temperature_range([day])
+            date = series.dates[day]
+            day_results.append({
+                "date": date.isoformat(),
+                "weekday": WEEKDAY_NAMES[date.weekday()],
+                "min": round(low, 1),
+                "max": round(high, 1),
+                "description": WMO_CODES.get(series.weather_code[day], "unbekannt"),
+                "rain_hours": series.day_rain_hours(day),
+                "precipitation": round(series.precipitation_sum[day], 1),
+                "wind_speed": round(series.wind_speed_max[day] / KMH_TO_MS, 1)
+            })
+        
+        low, high, mean = series.temperature_range(days)
+        result = {
+            "success": True,
+            "city": location["name"],
+            "period": query.period,
+            "aspect": query.aspect,
+            "label": label,
+            "days": day_results,
+            "temperature": {"min": round(low, 1), "max": round(high, 1), "mean": round(mean, 1)},
+            "rain_hours": sum(day["rain_hours"] for day in day_results),
+            "windiest_day": day_results[days.index(series.windiest_day(days))]
+        }
+        if "corrected_from" in location:
+            result["corrected_from"] = location["corrected_from"]
+        return result
+    
+    def city_not_found(self, city: str) -> dict:
+        """
+        Ergebnis für eine Stadt, die nicht aufgelöst werden konnte.
+        
+        Demo-Daten gibt es nur für Orte, die Ortsverzeichnis oder
+        Geocoding-Cache kennen; ein unbekannter Name (z.B. ein Tippfehler)
+        bleibt auch bei offenem Circuit Breaker ein Fehler.
+        """
+        error = f"Stadt '{city}' konnte nicht gefunden werden."
+        if self.geocoding_breaker.state != CLOSED:
+            error += " Die Ortssuche ist vorübergehend nicht erreichbar."
+        return {"success": False, "error": error}
+    
+    @staticmethod
+    def _fetch_error(error: Exception) -> dict:
+        """Fehlerergebnis für einen fehlgeschlagenen Wetterabruf."""
+        return {
+            "success": False,
+            "error": f"Fehler beim Abrufen der Wetterdaten: {str(error)}"
+        }
+    
+    @staticmethod
+    def _build_weather(location: dict, current: dict) -> dict:
+        """
+        Baut das Wetterergebnis aus Ort und "current"-Block.
+        
+        Args:
+            location: Dictionary mit latitude, longitude und name
+            current: "current"-Block der Open-Meteo-Antwort
+            
+        Returns:
+            Dictionary mit Wetterdaten
+        """
+        weather_code = current.get("weather_code", 0)
+        description = WMO_CODES.get(weather_code, "unbekannt")
+        
+        result = {
+            "success": True,
+            "city": location["name"],
+            "temperature": current["temperature_2m"],
+            "feels_like": current["apparent_temperature"],
+            "humidity": current["relative_humidity_2m"],
+            "description": description,
+            "wind_speed": round(current["wind_speed_10m"] / KMH_TO_MS, 1)
+        }
+        if "corrected_from" in location:
+            result["corrected_from"] = location["corrected_from"]
+        return result
+    
+    @staticmethod
+    def _snap(latitude: float, longitude: float) -> Tuple[float, float]:
+        """
+        Legt Koordinaten auf das Raster FORECAST_GRID_KM.
+        
+        Orte derselben Rasterzelle teilen sich Cache-Eintrag und Upstream-
+        Abruf; ohne Raster werden die Koordinaten nur gerundet.
+        """
+        if Config.FORECAST_GRID_KM > 0:
+            return snap_to_grid(latitude, longitude, Config.FORECAST_GRID_KM)
+        return (round(latitude, FORECAST_COORDINATE_PRECISION),
+                round(longitude, FORECAST_COORDINATE_PRECISION))
+    
+    @classmethod
+    def _forecast_cache_key(cls, latitude: float, longitude: float) -> str:
+        """Bildet den Cache-Schlüssel aus gerasterten Koordinaten."""
+        latitude, longitude = cls._snap(latitude, longitude)
+        return f"{latitude},{longitude}"
+    
+    @staticmethod
+    def _nearest_entry(cache: TTLCache, index: GridIndex, key: str,
+                       latitude: float, longitude: float) -> Optional[tuple]:
+        """
+        Sucht einen Cache-Eintrag für einen Rasterpunkt oder seinen nächsten Nachbarn.
+        
+        Ohne Eintrag für den Rasterpunkt selbst wird der nächstgelegene
+        gecachte Ort im Umkreis FORECAST_REUSE_RADIUS_KM verwendet. Orte,
+        deren Eintrag inzwischen verdrängt wurde, werden aus dem Index entfernt.
+        
+        Args:
+            cache: Cache der Einträge
+            index: Index der gecachten Rasterpunkte
+            key: Schlüssel des Rasterpunkts
+            latitude: Gerasterter Breitengrad
+            longitude: Gerasterter Längengrad
+            
+        Returns:
+            Tuple aus ((Wert, frisch), (Schlüssel, Breitengrad, Längengrad) des
+            gefundenen Orts) oder None
+        """
+        entry = cache.get_entry(key)
+        if entry is not None:
+            return entry, (key, latitude, longitude)
+        
+        for neighbour in index.nearest(latitude, longitude):
+            if neighbour[0] != key:
+                entry = cache.get_entry(neighbour[0])
+                if entry is not None:
+                    return entry, neighbour
+            index.discard(neighbour[0])
+        return None
+    
+    def _cached_current(self, latitude: float, longitude: float) -> tuple:
+        """
+        Sucht den "current"-Block eines Orts oder eines Nachbarn im Umkreis.
+        
+        Veraltete Einträge werden ausgeliefert und im Hintergrund erneuert.
+        
+        Args:
+            latitude: Breitengrad
+            longitude: Längengrad
+            
+        Returns:
+            Tuple aus (Schlüssel, Breitengrad, Längengrad, current oder None)
+            mit gerasterten Koordinaten für einen Abruf
+        """
+        latitude, longitude = self._snap(latitude, longitude)
+        key = self._forecast_cache_key(latitude, longitude)
+        found = self._nearest_entry(self.forecast_cache, self.forecast_index, key, latitude, longitude)
+        if found is None:
+            return key, latitude, longitude, None
+        
+        (current, fresh), (entry_key, entry_latitude, entry_longitude) = found
+        if not fresh:
+            self._refresh_in_background(entry_key, entry_latitude, entry_longitude)
+        return key, latitude, longitude, current
+    
+    def _store_current(self, key: str, latitude: float, longitude: float, current: dict):
+        """Legt einen "current"-Block im Forecast-Cache ab und nimmt den Rasterpunkt in den Index auf."""
+        self.forecast_cache.set(key, current)
+        self.forecast_index.add(key, latitude, longitude)
+    
+    @staticmethod
+    def _current_params(latitude: float, longitude: float) -> dict:
+        """Baut die Query-Parameter für den "current"-Block."""
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "current": "temperature_2m,relative_humidity_2m,apparent_temperature,weather_code,wind_speed_10m",
+            "timezone": "auto"
+        }
+    
+    def _get_current(self, latitude: float, longitude: float) -> dict:
+        """
+        Liefert den "current"-Block der Wettervorhersage.
+        
+        Frische Einträge kommen direkt aus dem Forecast-Cache, auch von einem
+        bereits abgerufenen Ort in der Nähe. Veraltete Einträge werden sofort
+        ausgeliefert und im Hintergrund erneuert (stale-while-revalidate).
+        Gleichzeitige Anfragen für dieselbe Rasterzelle lösen nur einen
+        Upstream-Aufruf mit den gerasterten Koordinaten aus.
+        
+        Args:
+            latitude: Breitengrad
+            longitude: Längengrad
+            
+        Returns:
+            Dictionary mit den aktuellen Messwerten
+            
+        Raises:
+            requests.RequestException: Wenn kein Cache-Eintrag existiert und
+                der Abruf fehlschlägt
+        """
+        key, latitude, longitude, current = self._cached_current(latitude, longitude)
+        if current is not None:
+            return current
+        
+        return self._forecast_flight.do(key, lambda: self._load_current(key, latitude, longitude))
+    
+    def _load_current(self, key: str, latitude: float, longitude: float) -> dict:
+        """Ruft den "current"-Block ab und legt ihn im Forecast-Cache ab."""
+        current = self._request_forecast(self._current_params(latitude, longitude))["current"]
+        self._store_current(key, latitude, longitude, current)
+        return current
+    
+    def _current_params_many(self, coordinates: List[tuple]) -> dict:
+        """Baut die Query-Parameter für mehrere Orte (kommagetrennte Koordinaten)."""
+        return self._current_params(
+            ",".join(str(latitude) for latitude, _ in coordinates),
+            ",".join(str(longitude) for _, longitude in coordinates)
+        )
+    
+    @staticmethod
+    def _parse_current_many(keys: List[str], data) -> Dict[str, dict]:
+        """
+        Ordnet die Antwort einer Mehrfach-Abfrage den Cache-Schlüsseln zu.
+        
+        Open-Meteo liefert bei mehreren Orten eine Liste, bei einem Ort ein
+        einzelnes Objekt.
+        """
+        if isinstance(data, dict):
+            data = [data]
+        if len(data) != len(keys):
+            raise ValueError("Anzahl der Orte in der Antwort stimmt nicht überein")
+        return {key: item["current"] for key, item in zip(keys, data)}
+    
+    def _load_current_many(self, missing: Dict[str, tuple]) -> Dict[str, dict]:
+        """
+        Ruft den "current"-Block mehrerer Orte mit einem Aufruf ab.
+        
+        Args:
+            missing: {Cache-Schlüssel: (latitude, longitude)}
+            
+        Returns:
+            {Cache-Schlüssel: current}
+        """
+        params = self._current_params_many(list(missing.values()))
+        currents = self._parse_current_many(list(missing), self._request_forecast(params))
+        for key, current in currents.items():
+            self._store_current(key, *missing[key], current)
+        return currents
+    
+    def _request_forecast(self, params: dict):
+        """
+        Ruft die Forecast-API über den Circuit Breaker ab.
+        
+        Raises:
+            CircuitOpenError: Wenn der Breaker offen ist
+            requests.RequestException: Bei HTTP- oder Verbindungsfehlern
+        """
+        def request():
+            response = self.session.get(self.api_url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        return self.forecast_breaker.call(request)
+    
+    def _refresh_in_background(self, key: str, latitude: float, longitude: float):
+        """Startet höchstens eine Hintergrund-Aktualisierung pro Cache-Schlüssel."""
+        # Bei offenem Breaker bleiben die veralteten Daten ohne Aktualisierungsversuch
+        if self.forecast_breaker.state == OPEN:
+            return
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            thread = threading.Thread(
+                target=self._background_refresh,
+                args=(key, latitude, longitude),
+                daemon=True
+            )
+            self._refreshing[key] = thread
+        thread.start()
+    
+    def _background_refresh(self, key: str, latitude: float, longitude: float):
+        """Aktualisiert einen veralteten Eintrag; bei Fehlern bleibt er erhalten."""
+        try:
+            self._forecast_flight.do(key, lambda: self._load_current(key, latitude, longitude))
+        except (requests.RequestException, KeyError, ValueError, CircuitOpenError):
+            pass
+        finally:
+            with self._refresh_lock:
+                self._refreshing.pop(key, None)
     
     def _get_demo_weather(self, city: str) -> dict:
         """Gibt Demo-Wetterdaten zurück (für Tests)."""
@@ -152,12 +875,124 @@ class WeatherService:
         if not weather_data.get("success"):
             return weather_data.get("error", "Unbekannter Fehler")
         
+        if "results" in weather_data:
+            return self._format_weather_table(weather_data["results"])
+        
         demo_note = ""
         if weather_data.get("demo"):
             demo_note = "\n(Demo-Daten)"
         
-        return f"""🌤️ Wetter in {weather_data['city']}:
+        return f"""{self._correction_note(weather_data)}🌤️ Wetter in {weather_data['city']}:
 • Temperatur: {weather_data['temperature']}°C (gefühlt: {weather_data['feels_like']}°C)
 • Wetterlage: {weather_data['description']}
 • Luftfeuchtigkeit: {weather_data['humidity']}%
 • Wind: {weather_data['wind_speed']} m/s{demo_note}"""
+    
+    def format_forecast(self, forecast_data: dict) -> str:
+        """
+        Formatiert eine Vorhersage passend zum gefragten Aspekt.
+        
+        Args:
+            forecast_data: Ergebnis von get_forecast
+            
+        Returns:
+            Formatierter String
+        """
+        if not forecast_data.get("success"):
+            return forecast_data.get("error", "Unbekannter Fehler")
+        
+        return self._correction_note(forecast_data) + self._format_forecast_text(forecast_data)
+    
+    def _format_forecast_text(self, forecast_data: dict) -> str:
+        """Formatiert eine erfolgreiche Vorhersage (siehe format_forecast)."""
+        city = forecast_data["city"]
+        label = forecast_data["label"]
+        days = forecast_data["days"]
+        aspect = forecast_data["aspect"]
+        
+        if aspect == "rain":
+            if not forecast_data["rain_hours"]:
+                return f"☀️ {label[0].upper() + label[1:]} wird in {city} kein Regen erwartet."
+            lines = [f"🌧️ Regen in {city} {label}: {forecast_data['rain_hours']} Regenstunden"]
+            lines += [
+                f"• {self._format_day(day)}: {day['rain_hours']} h ({day['precipitation']} mm)"
+                for day in days if day["rain_hours"]
+            ]
+            return "\n".join(lines)
+        
+        if aspect == "wind":
+            windiest = forecast_data["windiest_day"]
+            if len(days) == 1:
+                return f"💨 Wind in {city} {label}: bis zu {windiest['wind_speed']} m/s"
+            return (f"💨 Windigster Tag in {city} {label}: {self._format_day(windiest)} "
+                    f"mit bis zu {windiest['wind_speed']} m/s")
+        
+        if aspect == "temperature":
+            temperature = forecast_data["temperature"]
+            return (f"🌡️ Temperatur in {city} {label}: {temperature['min']}°C bis "
+                    f"{temperature['max']}°C (Mittel: {temperature['mean']}°C)")
+        
+        lines = [f"📅 Vorhersage für {city} {label}:"]
+        lines += [
+            f"• {self._format_day(day)}: {day['min']}°C bis {day['max']}°C, {day['description']}, "
+            f"{day['rain_hours']} h Regen, Wind bis {day['wind_speed']} m/s"
+            for day in days
+        ]
+        return "\n".join(lines)
+    
+    @staticmethod
+    def _correction_note(data: dict) -> str:
+        """Hinweis auf eine Tippfehler-Korrektur ("Meinten Sie Linz?") oder leerer String."""
+        if "corrected_from" not in data:
+            return ""
+        return f"🔎 \"{data['corrected_from']}\" nicht gefunden. Meinten Sie {data['city']}?\n"
+    
+    @staticmethod
+    def _format_day(day: dict) -> str:
+        """Formatiert einen Tag als "Mo 20.05."."""
+        _, month, date = day["date"].split("-")
+        return f"{day['weekday'][:2]} {date}.{month}."
+    
+    @staticmethod
+    def _format_weather_table(results: List[dict]) -> str:
+        """
+        Formatiert die Ergebnisse mehrerer Städte als kompakte Tabelle.
+        
+        Args:
+            results: Wetterergebnisse (erfolgreich oder Fehler) je Stadt
+            
+        Returns:
+            Formatierter String mit einer Zeile je Stadt
+        """
+        rows = []
+        for result in results:
+            if result.get("success"):
+                rows.append((
+                    result["city"],
+                    f"{result['temperature']}°C",
+                    f"{result['feels_like']}°C",
+                    result["description"],
+                    f"{result['humidity']}%",
+                    f"{result['wind_speed']} m/s"
+                ))
+            else:
+                rows.append((result.get("error", "Unbekannter Fehler"),))
+        
+        header = ("Stadt", "Temp.", "Gefühlt", "Wetterlage", "Feuchte", "Wind")
+        table = [header] + [row for row in rows if len(row) == len(header)]
+        widths = [max(len(row[i]) for row in table) for i in range(len(header))]
+        
+        lines = [f"🌤️ Wetter in {len(results)} Städten:"]
+        for row in [header] + rows:
+            if len(row) == len(header):
+                lines.append(" | ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+            else:
+                lines.append(f"⚠️ {row[0]}")
+        
+        lines += [
+            WeatherService._correction_note(result).rstrip() for result in results
+            if "corrected_from" in result
+        ]
+        if any(result.get("demo") for result in results):
+            lines.append("(Demo-Daten)")
+        return "\n".join(lines)
@@ -0,0 +1,172 @@
+"""
+Tests für den Batch-Modus der CLI.
+"""
+import io
+import json
+import subprocess
+import threading
+import time
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+# Füge src zum Pfad hinzu
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import GOODBYE, KIAssistant
+from src import __version__
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+class TestBatchMode(unittest.TestCase):
+    """Tests für KIAssistant.run_batch."""
+
+    def setUp(self):
+        """Initialisiert den Assistenten für jeden Test."""
+        self.assistant = KIAssistant()
+
+    def test_text_output_keeps_input_order(self):
+        """Testet dass Textausgaben trotz paralleler Verarbeitung in Eingabereihenfolge erscheinen."""
+        delays = {"langsam": 0.05, "schnell": 0.0}
+
+        def process(message):
+            time.sleep(delays[message])
+            return f"Antwort {message}"
+
+        output = io.StringIO()
+        with patch.object(self.assistant, 'process_input', side_effect=process):
+            failures = self.assistant.run_batch(["langsam\n", "\n", "schnell\n"], output, workers=2)
+
+        self.assertEqual(failures, 0)
+        self.assertEqual(output.getvalue(),
+                         "> langsam\nAntwort langsam\n\n> schnell\nAntwort schnell\n\n")
+
+    def test_jsonl(self):
+        """Testet JSON-Lines mit ids, Klartext-Nachrichten und fehlerhaften Zeilen."""
+        lines = ['{"id": "a", "message": "hilfe"}', '"Hallo"', 'kein json', '{"text": "x"}']
+        output = io.StringIO()
+        failures = self.assistant.run_batch(lines, output, jsonl=True, workers=1)
+
+        results = {result["id"]: result for result in map(json.loads, output.getvalue().splitlines())}
+        self.assertEqual(failures, 2)
+        self.assertIn("Verfügbare Befehle", results["a"]["response"])
+        self.assertIn("Hallo", results[2]["response"])
+        self.assertIn("error", results[3])
+        self.assertIn("error", results[4])
+
+    def test_exit_does_not_stop_batch(self):
+        """Testet dass "beenden" im Batch-Modus nur eine Antwort erzeugt."""
+        output = io.StringIO()
+        self.assistant.run_batch(["beenden", "hilfe"], output)
+
+        self.assertIn(GOODBYE, output.getvalue())
+        self.assertIn("Verfügbare Befehle", output.getvalue())
+
+    def test_exceptions_are_reported(self):
+        """Testet dass eine fehlschlagende Anfrage den Batch nicht abbricht."""
+        output = io.StringIO()
+        with patch.object(self.assistant, 'process_input', side_effect=[RuntimeError("kaputt"), "ok"]):
+            failures = self.assistant.run_batch(['"eins"', '"zwei"'], output, jsonl=True, workers=1)
+
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(failures, 1)
+        self.assertEqual(results[0]["error"], "kaputt")
+        self.assertEqual(results[1]["response"], "ok")
+
+    def test_bounded_concurrency(self):
+        """Testet dass höchstens workers Anfragen gleichzeitig laufen."""
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def process(message):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            return message
+
+        with patch.object(self.assistant, 'process_input', side_effect=process):
+            self.assistant.run_batch([f"frage {i}" for i in range(20)], io.StringIO(), workers=3)
+
+        self.assertLessEqual(peak, 3)
+        self.assertGreater(peak, 1)
+
+
+    def test_output_errors_stop_batch(self):
+        """Testet dass ein Schreibfehler den Batch beendet statt ihn zu blockieren."""
+        class ClosedPipe(io.StringIO):
+            def write(self, text):
+                raise BrokenPipeError("Pipe geschlossen")
+
+        for jsonl in (False, True):
+            with self.subTest(jsonl=jsonl):
+                lines = (f'"frage {i}"' for i in range(1000))
+                with patch.object(self.assistant, 'process_input', side_effect=lambda message: message):
+                    errors = []
+                    thread = threading.Thread(
+                        target=lambda: errors.append(self._run_batch_catching(lines, ClosedPipe(), jsonl)),
+                        daemon=True
+                    )
+                    thread.start()
+                    thread.join(timeout=10)
+
+                self.assertFalse(thread.is_alive())
+                self.assertIsInstance(errors[0], BrokenPipeError)
+                # Nach dem Fehler werden keine weiteren Zeilen gelesen
+                self.assertIsNotNone(next(lines, None))
+
+    def _run_batch_catching(self, lines, output, jsonl):
+        """Führt run_batch aus und gibt die ausgelöste Ausnahme zurück."""
+        try:
+            self.assistant.run_batch(lines, output, jsonl=jsonl, workers=2)
+        except OSError as e:
+            return e
+        return None
+
+    def test_broken_pipe_exits_quietly(self):
+        """Testet "app.py --batch | head" im frischen Interpreter: kein Hängen, kein Traceback."""
+        script = (
+            "import subprocess, sys\n"
+            "app = subprocess.Popen([sys.executable, 'app.py', '--batch', '--workers', '2'],\n"
+            "                       stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)\n"
+            "app.stdin.write(b'hilfe\\n' * 2000); app.stdin.close()\n"
+            "app.stdout.readline(); app.stdout.close()\n"
+            "print(app.wait(timeout=20), len(app.stderr.read()))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True,
+                                text=True, check=True, timeout=30)
+        self.assertEqual(result.stdout.split(), ["1", "0"])
+
+
+
+class TestStartup(unittest.TestCase):
+    """Tests für den Start der CLI in einem frischen Interpreter."""
+
+    def run_python(self, *args):
+        """Führt Python im Projektverzeichnis aus und gibt stdout zurück."""
+        return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True,
+                              text=True, check=True, timeout=30).stdout
+
+    def test_static_answers_skip_http_stack(self):
+        """Testet dass Begrüßung und Hilfe weder requests noch asyncio laden."""
+        output = self.run_python("-c", (
+            "import sys, app\n"
+            "assistant = app.KIAssistant()\n"
+            "assistant.answer('Hallo'), assistant.answer('hilfe')\n"
+            "print(sorted({'requests', 'urllib3', 'asyncio', 'multiprocessing'} & set(sys.modules)))"
+        ))
+        self.assertEqual(output.strip(), "[]")
+
+    def test_version(self):
+        """Testet die Ausgabe von --version."""
+        self.assertEqual(self.run_python("app.py", "--version").strip(), f"app.py {__version__}")
+
+
+if __name__ == '__main__':
+    unittest.main()
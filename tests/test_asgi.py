@@ -0,0 +1,74 @@
+"""
+Tests für den ASGI-Einstiegspunkt des Web-Interfaces.
+"""
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from asgi import application
+from web_app import assistant
+
+
+class TestASGIApplication(unittest.IsolatedAsyncioTestCase):
+    """Tests für die ASGI-Anwendung."""
+
+    async def test_chat_api(self):
+        """Testet den Chat-Endpunkt über ASGI."""
+        transport = httpx.ASGITransport(app=application)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post('/api/chat', json={'message': 'hilfe'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Verfügbare Befehle', response.json()['response'])
+
+    async def test_concurrent_requests_do_not_block(self):
+        """Testet dass langsame Upstream-Aufrufe parallel abgearbeitet werden."""
+        async def slow_weather(city=None):
+            await asyncio.sleep(0.3)
+            return {"success": False, "error": f"Timeout für {city}"}
+
+        original = assistant.async_weather_service.get_weather
+        assistant.async_weather_service.get_weather = slow_weather
+        try:
+            transport = httpx.ASGITransport(app=application)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                start = asyncio.get_running_loop().time()
+                responses = await asyncio.gather(*(
+                    client.post('/api/chat', json={'message': f'Wetter in Stadt{i}'})
+                    for i in range(4)
+                ))
+                elapsed = asyncio.get_running_loop().time() - start
+        finally:
+            assistant.async_weather_service.get_weather = original
+
+        self.assertTrue(all(response.status_code == 200 for response in responses))
+        self.assertLess(elapsed, 1.0)
+
+    async def test_lifespan(self):
+        """Testet Startup und Shutdown über das Lifespan-Protokoll."""
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        with patch.object(assistant.warmer, 'start') as start, \
+                patch.object(assistant.warmer, 'save') as save:
+            try:
+                await application({"type": "lifespan"}, receive, send)
+                self.assertIs(assistant.server_loop, asyncio.get_running_loop())
+            finally:
+                assistant.server_loop = None
+
+        self.assertEqual(sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"])
+        start.assert_called_once()
+        save.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
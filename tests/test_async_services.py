@@ -0,0 +1,290 @@
+"""
+Tests für die asynchronen Services.
+"""
+import asyncio
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+import httpx
+
+# Füge src zum Pfad hinzu
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.async_services import (
+    AsyncNewsService, AsyncWeatherService, close_async_client, get_async_client
+)
+from src.cache import AsyncSingleFlight
+from src.forecast import ForecastQuery
+from src.news import NewsPrefetcher, NewsService
+from src.warmup import CacheWarmer
+from src.weather import WeatherService
+from tests.test_forecast import sample_response
+
+
+CURRENT = {
+    "temperature_2m": 15.5,
+    "apparent_temperature": 14.0,
+    "relative_humidity_2m": 70,
+    "weather_code": 2,
+    "wind_speed_10m": 18.0
+}
+
+
+def make_client(handler):
+    """Erstellt einen AsyncClient mit einem Mock-Transport."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestAsyncWeatherService(unittest.IsolatedAsyncioTestCase):
+    """Tests für die AsyncWeatherService Klasse."""
+
+    async def test_get_weather_success(self):
+        """Testet Geocoding und Wetterabruf über den asynchronen Client."""
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request.url.host)
+            if request.url.host == "geocoding-api.open-meteo.com":
+                return httpx.Response(200, json={
+                    "results": [{"latitude": 47.2307, "longitude": 8.6716, "name": "Wädenswil"}]
+                })
+            return httpx.Response(200, json={"current": CURRENT})
+
+        async with make_client(handler) as client:
+            weather = AsyncWeatherService(client=client)
+            result = await weather.get_weather("Wädenswil")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["city"], "Wädenswil")
+        self.assertEqual(result["wind_speed"], 5.0)
+        self.assertEqual(requests_seen, ["geocoding-api.open-meteo.com", "api.open-meteo.com"])
+
+    async def test_typo_corrected_after_geocoding_miss(self):
+        """Testet die Tippfehler-Korrektur erst nach einer Absage der Geocoding-API."""
+        def handler(request):
+            if request.url.host == "geocoding-api.open-meteo.com":
+                if request.url.params["name"] == "Lienz":
+                    return httpx.Response(200, json={
+                        "results": [{"latitude": 46.83, "longitude": 12.77, "name": "Lienz"}]
+                    })
+                return httpx.Response(200, json={})
+            return httpx.Response(200, json={"current": CURRENT})
+
+        async with make_client(handler) as client:
+            weather = AsyncWeatherService(client=client)
+            corrected = await weather.get_weather("Müchen")
+            lienz = await weather.get_weather("Lienz")
+
+        self.assertEqual((corrected["city"], corrected["corrected_from"]), ("München", "Müchen"))
+        self.assertIn("Meinten Sie München?", weather.format_weather(corrected))
+        self.assertEqual(lienz["city"], "Lienz")
+        self.assertNotIn("corrected_from", lienz)
+
+    async def test_concurrent_requests_share_upstream_call(self):
+        """Testet dass gleichzeitige Anfragen nur einen Forecast-Abruf auslösen."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.host)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"current": CURRENT})
+
+        async with make_client(handler) as client:
+            weather = AsyncWeatherService(client=client)
+            results = await asyncio.gather(*(weather.get_weather("Zürich") for _ in range(5)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result["success"] for result in results))
+        self.assertEqual(weather.format_weather(results[0]), weather.format_weather(results[4]))
+
+    async def test_get_weather_many(self):
+        """Testet dass mehrere Städte mit einem Forecast-Abruf geladen werden."""
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request.url.params["latitude"])
+            return httpx.Response(200, json=[{"current": CURRENT}, {"current": CURRENT}])
+
+        async with make_client(handler) as client:
+            weather = AsyncWeatherService(client=client)
+            result = await weather.get_weather("Bern, Basel")
+
+        self.assertEqual(len(requests_seen), 1)
+        self.assertEqual(len(requests_seen[0].split(",")), 2)
+        self.assertEqual([r["city"] for r in result["results"]], ["Bern", "Basel"])
+
+    async def test_concurrent_geocoding_share_upstream_call(self):
+        """Testet dass gleichzeitiges Geocoding derselben Stadt nur einen Aufruf auslöst."""
+        geocoding_calls = []
+
+        async def handler(request):
+            if request.url.host == "geocoding-api.open-meteo.com":
+                geocoding_calls.append(request.url.params["name"])
+                await asyncio.sleep(0.05)
+                return httpx.Response(200, json={
+                    "results": [{"latitude": 47.2307, "longitude": 8.6716, "name": "Wädenswil"}]
+                })
+            return httpx.Response(200, json={"current": CURRENT})
+
+        async with make_client(handler) as client:
+            weather = AsyncWeatherService(client=client)
+            results = await asyncio.gather(*(weather.get_weather("Wädenswil") for _ in range(5)))
+
+        self.assertEqual(geocoding_calls, ["Wädenswil"])
+        self.assertTrue(all(result["success"] for result in results))
+
+    async def test_city_not_found(self):
+        """Testet Fehlerbehandlung wenn Stadt nicht gefunden wird."""
+        async with make_client(lambda request: httpx.Response(200, json={})) as client:
+            result = await AsyncWeatherService(client=client).get_weather("NichtExistierendeStadt123")
+
+        self.assertFalse(result["success"])
+        self.assertIn("konnte nicht gefunden werden", result["error"])
+
+    async def test_upstream_error(self):
+        """Testet Fehlerbehandlung bei HTTP-Fehlern der Forecast-API."""
+        async with make_client(lambda request: httpx.Response(503)) as client:
+            result = await AsyncWeatherService(client=client).get_weather("Zürich")
+
+        self.assertFalse(result["success"])
+        self.assertIn("Fehler beim Abrufen der Wetterdaten", result["error"])
+
+    async def test_locate_and_get_weather_at(self):
+        """Testet dass locate und get_weather_at Coroutinen sind und Ergebnisse liefern."""
+        async with make_client(lambda request: httpx.Response(200, json={"current": CURRENT})) as client:
+            weather = AsyncWeatherService(client=client)
+            location = await weather.locate("Bern")
+            result = await weather.get_weather_at(location)
+
+        self.assertEqual(location["name"], "Bern")
+        self.assertTrue(result["success"])
+        self.assertEqual(result["city"], "Bern")
+
+    async def test_get_forecast_at(self):
+        """Testet die Vorhersage für bereits ermittelte Koordinaten."""
+        async with make_client(lambda request: httpx.Response(200, json=sample_response())) as client:
+            weather = AsyncWeatherService(client=client)
+            location = await weather.locate("Bern")
+            result = await weather.get_forecast_at(location, ForecastQuery("week", "wind"))
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result, await weather.get_forecast(ForecastQuery("week", "wind", "Bern")))
+
+    def test_sync_consumers_reject_async_services(self):
+        """Testet dass Prefetcher und Aufwärmphase keine Coroutinen verwerfen."""
+        with self.assertRaises(TypeError):
+            NewsPrefetcher(AsyncNewsService(), countries=["de"])
+        with self.assertRaises(TypeError):
+            CacheWarmer(AsyncWeatherService(), AsyncNewsService(), snapshot_path="")
+
+    async def test_shared_service_builds_no_caches(self):
+        """Testet dass mit shared keine eigenen (persistenten) Caches entstehen."""
+        weather = WeatherService()
+        news = NewsService()
+        with patch('src.weather.TTLCache') as weather_cache, \
+                patch('src.news.TTLCache') as news_cache:
+            async_weather = AsyncWeatherService(shared=weather)
+            async_news = AsyncNewsService(shared=news)
+
+        weather_cache.assert_not_called()
+        news_cache.assert_not_called()
+        self.assertIs(async_weather.geocoding_cache, weather.geocoding_cache)
+        self.assertIs(async_weather.forecast_breaker, weather.forecast_breaker)
+        self.assertIs(async_news.news_cache, news.news_cache)
+
+    async def test_shared_client_per_loop(self):
+        """Testet dass innerhalb eines Event-Loops derselbe Client verwendet wird."""
+        self.assertIs(get_async_client(), get_async_client())
+        await close_async_client()
+
+
+class TestAsyncNewsService(unittest.IsolatedAsyncioTestCase):
+    """Tests für die AsyncNewsService Klasse."""
+
+    async def test_demo_news(self):
+        """Testet das Abrufen von Demo-Nachrichten ohne API-Key."""
+        result = await AsyncNewsService().get_top_news(2)
+
+        self.assertTrue(result["demo"])
+        self.assertEqual(len(result["articles"]), 2)
+
+    async def test_get_top_news(self):
+        """Testet den Abruf über die NewsAPI."""
+        def handler(request):
+            self.assertEqual(request.url.params["pageSize"], "1")
+            return httpx.Response(200, json={
+                "status": "ok",
+                "articles": [{"title": "Titel", "description": "Text", "source": {"name": "Quelle"}}]
+            })
+
+        async with make_client(handler) as client:
+            news = AsyncNewsService(client=client)
+            news.api_key = "test-key"
+            result = await news.get_top_news(1)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["articles"][0]["source"], "Quelle")
+
+    async def test_concurrent_requests_share_upstream_call(self):
+        """Testet dass gleichzeitige identische Anfragen nur einen NewsAPI-Aufruf auslösen."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.params["pageSize"])
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={
+                "status": "ok",
+                "articles": [{"title": "Titel", "description": "Text", "source": {"name": "Quelle"}}]
+            })
+
+        async with make_client(handler) as client:
+            news = AsyncNewsService(client=client)
+            news.api_key = "test-key"
+            results = await asyncio.gather(*(news.get_top_news(1) for _ in range(5)))
+
+        self.assertEqual(calls, ["1"])
+        self.assertTrue(all(result["success"] for result in results))
+
+    async def test_refresh(self):
+        """Testet dass refresh eine Coroutine ist und den Cache befüllt."""
+        def handler(request):
+            return httpx.Response(200, json={
+                "status": "ok",
+                "articles": [{"title": f"Titel {i}", "description": "Text", "source": {"name": "Quelle"}}
+                             for i in range(5)]
+            })
+
+        async with make_client(handler) as client:
+            news = AsyncNewsService(client=client)
+            news.api_key = "test-key"
+            result = await news.refresh("ch", 5)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(len(news._cached_news(2, "ch")["articles"]), 2)
+
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """Tests für die AsyncSingleFlight Klasse."""
+
+    async def test_error_is_propagated(self):
+        """Testet dass Exceptions an alle Wartenden weitergegeben werden."""
+        flight = AsyncSingleFlight()
+
+        async def failing_call():
+            await asyncio.sleep(0.01)
+            raise ValueError("Fehler")
+
+        results = await asyncio.gather(
+            flight.do("key", failing_call),
+            flight.do("key", failing_call),
+            return_exceptions=True
+        )
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertFalse(flight.in_flight("key"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,260 @@
+"""
+Tests für die Cache-Hilfsklassen.
+"""
+import unittest
+import sys
+import gc
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+# Füge src zum Pfad hinzu
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import cache as cache_module
+from src.cache import SingleFlight, TTLCache, lazy_property
+
+
+class TestTTLCache(unittest.TestCase):
+    """Tests für die TTLCache Klasse."""
+
+    def setUp(self):
+        """Initialisiert einen kleinen Cache für jeden Test."""
+        self.cache = TTLCache(maxsize=2, ttl=60)
+
+    def test_set_and_get(self):
+        """Testet das Speichern und Lesen von Einträgen."""
+        self.cache.set("a", 1)
+
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("b", 42), 42)
+
+    def test_hit_miss_counters(self):
+        """Testet die Treffer- und Fehlschlag-Zähler."""
+        self.cache.set("a", 1)
+        self.cache.get("a")
+        self.cache.get("a")
+        self.cache.get("b")
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["size"], 1)
+
+    def test_lru_eviction(self):
+        """Testet dass der am längsten unbenutzte Eintrag verdrängt wird."""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertIn("c", self.cache)
+
+    def test_expiry(self):
+        """Testet dass abgelaufene Einträge nicht mehr geliefert werden."""
+        with patch('src.cache.time.time', return_value=1000.0):
+            self.cache.set("a", 1)
+
+        with patch('src.cache.time.time', return_value=1061.0):
+            self.assertIsNone(self.cache.get("a"))
+
+        self.assertEqual(len(self.cache), 0)
+
+    def test_stale_entry(self):
+        """Testet die Auslieferung veralteter Einträge innerhalb von stale_ttl."""
+        cache = TTLCache(maxsize=10, ttl=60, stale_ttl=60)
+        with patch('src.cache.time.time', return_value=1000.0):
+            cache.set("a", 1)
+
+        with patch('src.cache.time.time', return_value=1030.0):
+            self.assertEqual(cache.get_entry("a"), (1, True))
+
+        with patch('src.cache.time.time', return_value=1090.0):
+            self.assertEqual(cache.get_entry("a"), (1, False))
+            self.assertIsNone(cache.get("a"))
+
+        with patch('src.cache.time.time', return_value=1130.0):
+            self.assertIsNone(cache.get_entry("a"))
+
+        self.assertEqual(cache.stats()["stale_hits"], 1)
+
+    def test_persistence(self):
+        """Testet dass Einträge über die JSON-Datei einen Neustart überdauern."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "cache.json")
+
+            first = TTLCache(maxsize=10, ttl=60, path=path)
+            first.set("de:zürich", {"latitude": 47.37, "longitude": 8.54, "name": "Zürich"})
+            first.flush()
+
+            second = TTLCache(maxsize=10, ttl=60, path=path)
+            self.assertEqual(second.get("de:zürich")["name"], "Zürich")
+
+    def test_persistence_is_batched(self):
+        """Testet dass mehrere Änderungen gemeinsam und ohne Reste geschrieben werden."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "cache.json")
+            cache = TTLCache(maxsize=10, ttl=60, path=path, save_delay=60)
+
+            with patch('src.cache.tempfile.mkstemp', wraps=tempfile.mkstemp) as mkstemp:
+                cache.set("a", 1)
+                cache.set("b", 2)
+                self.assertFalse(os.path.exists(path))
+
+                cache.flush()
+                cache.flush()
+                self.assertEqual(mkstemp.call_count, 1)
+
+            self.assertEqual(TTLCache(maxsize=10, ttl=60, path=path).get("b"), 2)
+            self.assertEqual(os.listdir(tmp_dir), ["cache.json"])
+
+    def test_persistence_without_delay(self):
+        """Testet dass save_delay=0 sofort schreibt."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "cache.json")
+            TTLCache(maxsize=10, ttl=60, path=path, save_delay=0).set("a", 1)
+
+            self.assertEqual(TTLCache(maxsize=10, ttl=60, path=path).get("a"), 1)
+
+    def test_discarded_caches_are_not_kept_for_exit(self):
+        """Testet dass der Flush beim Beenden verworfene Caches nicht festhält."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "cache.json")
+            with patch('src.cache.atexit.register') as register:
+                cache = TTLCache(maxsize=10, ttl=60, path=path)
+                self.assertIn(cache, cache_module._persistent_caches)
+                cache.set("a", 1)
+
+                cache_module._flush_persistent_caches()
+                self.assertEqual(TTLCache(maxsize=10, ttl=60, path=path).get("a"), 1)
+
+                before = len(cache_module._persistent_caches)
+                del cache
+                gc.collect()
+                self.assertEqual(len(cache_module._persistent_caches), before - 1)
+                register.assert_not_called()
+
+    def test_corrupt_persistence_file(self):
+        """Testet dass eine defekte JSON-Datei ignoriert wird."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "cache.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("{kein json")
+
+            cache = TTLCache(maxsize=10, ttl=60, path=path)
+            self.assertEqual(len(cache), 0)
+
+    def test_snapshot_and_restore(self):
+        """Testet dass ein Snapshot nur nutzbare Einträge überträgt."""
+        with patch('src.cache.time.time', return_value=1000.0):
+            self.cache.set("a", 1)
+        with patch('src.cache.time.time', return_value=1050.0):
+            self.cache.set("b", 2)
+
+        with patch('src.cache.time.time', return_value=1070.0):
+            snapshot = self.cache.snapshot()
+            self.assertEqual(snapshot, {"b": [1110.0, 2]})
+
+            other = TTLCache(maxsize=2, ttl=60)
+            self.assertEqual(other.restore(snapshot), 1)
+            self.assertEqual(other.get("b"), 2)
+
+    def test_restore_keeps_newer_entries(self):
+        """Testet dass restore neuere Einträge nicht überschreibt und maxsize einhält."""
+        with patch('src.cache.time.time', return_value=1000.0):
+            self.cache.set("a", "neu")
+            self.assertEqual(self.cache.restore({"a": [1030.0, "alt"], "b": [1050.0, 2]}), 1)
+            self.assertEqual(self.cache.get("a"), "neu")
+
+            self.assertEqual(self.cache.restore({"c": [1050.0, 3], "d": [990.0, 4]}), 1)
+            self.assertEqual(self.cache.keys(), ["a", "c"])
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Tests für die SingleFlight Klasse."""
+
+    def test_concurrent_calls_share_result(self):
+        """Testet dass gleichzeitige Aufrufe nur einmal ausgeführt werden."""
+        flight = SingleFlight()
+        calls = []
+        results = []
+
+        def slow_call():
+            calls.append(1)
+            time.sleep(0.1)
+            return "ergebnis"
+
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("key", slow_call)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["ergebnis"] * 5)
+        self.assertFalse(flight.in_flight("key"))
+
+    def test_error_is_propagated(self):
+        """Testet dass Exceptions an den Aufrufer weitergegeben werden."""
+        flight = SingleFlight()
+
+        def failing_call():
+            raise ValueError("Fehler")
+
+        with self.assertRaises(ValueError):
+            flight.do("key", failing_call)
+        self.assertFalse(flight.in_flight("key"))
+
+
+
+class TestLazyProperty(unittest.TestCase):
+    """Tests für lazy_property."""
+
+    def make_owner(self):
+        """Klasse, deren Attribut die Erstellungen zählt."""
+        created = []
+
+        class Owner:
+            @lazy_property
+            def service(self):
+                time.sleep(0.01)
+                created.append(self)
+                return object()
+
+        return Owner, created
+
+    def test_created_once_across_threads(self):
+        """Testet dass gleichzeitige erste Zugriffe denselben Wert erhalten."""
+        owner_class, created = self.make_owner()
+        owner = owner_class()
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(owner.service)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(created), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_assignment_replaces_value(self):
+        """Testet dass eine Zuweisung den Wert ohne Erstellung ersetzt."""
+        owner_class, created = self.make_owner()
+        owner = owner_class()
+        owner.service = "mock"
+
+        self.assertEqual(owner.service, "mock")
+        self.assertEqual(created, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
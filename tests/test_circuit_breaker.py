@@ -0,0 +1,104 @@
+"""
+Tests für den Circuit Breaker.
+"""
+import asyncio
+import itertools
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+# Füge src zum Pfad hinzu
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, HALF_OPEN, OPEN
+
+
+def failing_call():
+    """Simuliert einen fehlschlagenden Upstream-Aufruf."""
+    raise ConnectionError("Upstream nicht erreichbar")
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Tests für die CircuitBreaker Klasse."""
+
+    def setUp(self):
+        """Initialisiert einen Breaker mit kleinen Schwellen."""
+        self.breaker = CircuitBreaker("test", window=4, min_calls=4, failure_rate=0.5,
+                                      slow_call_duration=1.0, open_seconds=30)
+
+    def _fail(self, times):
+        """Löst times fehlschlagende Aufrufe aus."""
+        for _ in range(times):
+            with self.assertRaises(ConnectionError):
+                self.breaker.call(failing_call)
+
+    def test_opens_at_failure_rate(self):
+        """Testet dass der Breaker bei erreichter Fehlerquote öffnet."""
+        self.assertEqual(self.breaker.call(lambda: "ok"), "ok")
+        self.assertEqual(self.breaker.call(lambda: "ok"), "ok")
+        self._fail(1)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+        self._fail(1)
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(lambda: "ok")
+
+    def test_min_calls(self):
+        """Testet dass vor min_calls Aufrufen nicht geöffnet wird."""
+        self._fail(3)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_slow_calls_count_as_failures(self):
+        """Testet die Latenzschwelle."""
+        with patch('src.circuit_breaker.time.monotonic', side_effect=itertools.count(0.0, 2.0)):
+            for _ in range(4):
+                self.breaker.call(lambda: "langsam")
+            self.assertEqual(self.breaker.state, OPEN)
+
+    def test_half_open_probe(self):
+        """Testet dass nach open_seconds genau ein Probe-Aufruf durchgelassen wird."""
+        with patch('src.circuit_breaker.time.monotonic', return_value=100.0):
+            self._fail(4)
+
+        with patch('src.circuit_breaker.time.monotonic', return_value=131.0):
+            self.assertEqual(self.breaker.state, HALF_OPEN)
+            self.assertTrue(self.breaker.allow())
+            self.assertFalse(self.breaker.allow())
+            self.breaker.record(0.1)
+
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_failed_probe_reopens(self):
+        """Testet dass ein fehlgeschlagener Probe-Aufruf den Breaker wieder öffnet."""
+        with patch('src.circuit_breaker.time.monotonic', return_value=100.0):
+            self._fail(4)
+
+        with patch('src.circuit_breaker.time.monotonic', return_value=131.0):
+            self._fail(1)
+            self.assertEqual(self.breaker.state, OPEN)
+
+    def test_cancelled_probe_is_released(self):
+        """Testet dass ein abgebrochener asynchroner Probe-Aufruf freigegeben wird."""
+        async def cancelled_call():
+            raise asyncio.CancelledError()
+
+        with patch('src.circuit_breaker.time.monotonic', return_value=100.0):
+            self._fail(4)
+
+        with patch('src.circuit_breaker.time.monotonic', return_value=131.0):
+            with self.assertRaises(asyncio.CancelledError):
+                asyncio.run(self.breaker.call_async(cancelled_call))
+            self.assertTrue(self.breaker.allow())
+
+    def test_reset(self):
+        """Testet das Zurücksetzen des Breakers."""
+        self._fail(4)
+        self.breaker.reset()
+
+        self.assertEqual(self.breaker.stats(), {"state": CLOSED, "calls": 0, "failures": 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Tests für den Daemon-Modus.
+"""
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+import sys
+
+# Füge src zum Pfad hinzu
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.daemon import AssistantDaemon, DaemonUnavailableError, ask, socket_path
+
+
+def answer(message):
+    """Beantwortet Testnachrichten (löst bei "kaputt" eine Exception aus)."""
+    if message == "kaputt":
+        raise RuntimeError("Service-Fehler")
+    return f"Antwort auf {message}"
+
+
+class TestAssistantDaemon(unittest.TestCase):
+    """Tests für AssistantDaemon und ask."""
+
+    def setUp(self):
+        """Startet einen Daemon auf einem temporären Socket."""
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "ki.sock")
+        self.server = AssistantDaemon(answer, self.path)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        """Beendet den Daemon und entfernt das temporäre Verzeichnis."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        shutil.rmtree(self.directory)
+
+    def test_ask(self):
+        """Testet eine Anfrage über den Socket."""
+        self.assertEqual(ask("Wetter in Bern", self.path), {"response": "Antwort auf Wetter in Bern"})
+
+    def test_errors(self):
+        """Testet dass Fehler als error zurückgegeben werden."""
+        self.assertEqual(ask("kaputt", self.path), {"error": "Service-Fehler"})
+        self.assertIn("error", ask("   ", self.path))
+
+    def test_multiple_requests_per_connection(self):
+        """Testet mehrere JSON-Zeilen über eine Verbindung."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(self.path)
+            client.sendall(b'{"message": "eins"}\nkein json\n{"message": "zwei"}\n')
+            with client.makefile("rb") as reader:
+                results = [json.loads(reader.readline()) for _ in range(3)]
+
+        self.assertEqual(results[0], {"response": "Antwort auf eins"})
+        self.assertIn("error", results[1])
+        self.assertEqual(results[2], {"response": "Antwort auf zwei"})
+
+    def test_socket_permissions(self):
+        """Testet dass der Socket nur für den eigenen Benutzer zugänglich ist."""
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+    def test_second_daemon_is_rejected(self):
+        """Testet dass kein zweiter Daemon denselben Socket übernimmt."""
+        with self.assertRaises(RuntimeError):
+            AssistantDaemon(answer, self.path)
+
+    def test_close_removes_socket(self):
+        """Testet dass die Socket-Datei beim Beenden entfernt wird und ask danach fehlschlägt."""
+        self.server.shutdown()
+        self.server.server_close()
+
+        self.assertFalse(os.path.exists(self.path))
+        with self.assertRaises(DaemonUnavailableError):
+            ask("hallo", self.path)
+
+
+class TestAskWithoutAnswer(unittest.TestCase):
+    """Tests für ask bei einem Daemon, der nicht antwortet."""
+
+    def test_timeout_returns_error(self):
+        """Testet dass ein Timeout beim Lesen als error zurückgegeben wird."""
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "ki.sock")
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as silent:
+                silent.bind(path)
+                silent.listen(1)
+
+                result = ask("Wetter in Bern", path, timeout=0.2)
+
+            self.assertEqual(set(result), {"error"})
+            self.assertIn("Keine Antwort", result["error"])
+        finally:
+            shutil.rmtree(directory)
+
+
+class TestSocketPath(unittest.TestCase):
+    """Tests für socket_path und verwaiste Sockets."""
+
+    def test_stale_socket_is_replaced(self):
+        """Testet dass eine verwaiste Socket-Datei beim Start entfernt wird."""
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "ki.sock")
+        try:
+            stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stale.bind(path)
+            stale.close()
+
+            server = AssistantDaemon(answer, path)
+            server.server_close()
+        finally:
+            shutil.rmtree(directory)
+
+    def test_environment(self):
+        """Testet DAEMON_SOCKET und den benutzerspezifischen Standard."""
+        with patch.dict(os.environ, {"DAEMON_SOCKET": "/tmp/eigener.sock"}):
+            self.assertEqual(socket_path(), "/tmp/eigener.sock")
+
+        with patch.dict(os.environ, {"DAEMON_SOCKET": "", "XDG_RUNTIME_DIR": "/run/user/1"}):
+            self.assertEqual(socket_path(), f"/run/user/1/ki-assistent-{os.getuid()}.sock")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Tests für die spaltenweisen Vorhersage-Reihen.
+"""
+import unittest
+import sys
+import os
+
+# Füge src zum Pfad hinzu
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.forecast import ForecastQuery, ForecastSeries
+
+
+def sample_response(days=7, start=1):
+    """Vorhersage ab Montag, 1. Januar 2024, mit Regen am Dienstag und Sturm am Samstag."""
+    dates = [f"2024-01-{day:02d}" for day in range(start, start + days)]
+    hours = [f"{date}T{hour:02d}:00" for date in dates for hour in range(24)]
+    temperature = [float(day * 2 + hour % 6) for day in range(days) for hour in range(24)]
+    precipitation = [0.5 if day == 1 and 8 <= hour < 11 else 0.0
+                     for day in range(days) for hour in range(24)]
+    return {
+        "hourly": {"time": hours, "temperature_2m": temperature, "precipitation": precipitation},
+        "daily": {
+            "time": dates,
+            "weather_code": [61 if day == 1 else 0 for day in range(days)],
+            "precipitation_sum": [1.5 if day == 1 else 0.0 for day in range(days)],
+            "wind_speed_10m_max": [72.0 if day == 5 else 10.0 for day in range(days)]
+        }
+    }
+
+
+class TestForecastSeries(unittest.TestCase):
+    """Tests für die ForecastSeries Klasse."""
+
+    def setUp(self):
+        """Baut die Reihen aus der Beispielantwort."""
+        self.series = ForecastSeries.from_response(sample_response())
+
+    def test_day_offsets(self):
+        """Testet dass jeder Tag auf seine 24 Stunden zeigt."""
+        self.assertEqual(list(self.series.day_offsets), [0, 24, 48, 72, 96, 120, 144, 168])
+
+    def test_periods(self):
+        """Testet die Tagesauswahl der Zeiträume."""
+        self.assertEqual(self.series.days("tomorrow"), [1])
+        self.assertEqual(self.series.days("day_after_tomorrow"), [2])
+        self.assertEqual(self.series.days("weekend"), [5, 6])
+        self.assertEqual(self.series.days("wednesday"), [2])
+        self.assertEqual(self.series.days("week"), list(range(7)))
+
+    def test_weekend_is_contiguous(self):
+        """Testet dass Samstag und Sonntag vom selben Wochenende stammen."""
+        test_cases = [
+            (7, 7, [0]),      # Sonntag: nur das laufende Wochenende (heute)
+            (6, 7, [0, 1]),   # Samstag: heute und morgen
+            (5, 2, [1]),      # Freitag, Reihe endet am Samstag
+        ]
+
+        for start, days, expected in test_cases:
+            with self.subTest(start=start):
+                series = ForecastSeries.from_response(sample_response(days=days, start=start))
+                self.assertEqual(series.days("weekend"), expected)
+
+    def test_seconds_until_midnight(self):
+        """Testet den Ablauf um Mitternacht in der Zeitzone des Orts."""
+        data = sample_response()
+        data["utc_offset_seconds"] = 3600
+        series = ForecastSeries.from_response(data)
+
+        self.assertEqual(series.seconds_until_midnight(1704148200.0), 1800)  # 23:30 Ortszeit
+        self.assertEqual(self.series.seconds_until_midnight(1704148200.0), 5400)  # UTC
+
+    def test_period_not_covered(self):
+        """Testet dass Zeiträume außerhalb der Reihe leer sind."""
+        series = ForecastSeries.from_response(sample_response(days=2))
+        self.assertEqual(series.days("day_after_tomorrow"), [])
+        self.assertEqual(series.days("weekend"), [])
+
+    def test_temperature_range(self):
+        """Testet Tiefst-, Höchst- und Mitteltemperatur über mehrere Tage."""
+        low, high, mean = self.series.temperature_range([0, 1])
+        self.assertEqual((low, high), (0.0, 7.0))
+        self.assertAlmostEqual(mean, 3.5)
+
+    def test_rain_hours_and_windiest_day(self):
+        """Testet Regenstunden pro Tag und den windigsten Tag."""
+        self.assertEqual(self.series.day_rain_hours(1), 3)
+        self.assertEqual(self.series.day_rain_hours(0), 0)
+        self.assertEqual(self.series.windiest_day(self.series.days("week")), 5)
+
+    def test_missing_values(self):
+        """Testet dass fehlende Werte die Reihen nicht verschieben."""
+        data = sample_response(days=1)
+        data["hourly"]["temperature_2m"][5] = None
+        data["hourly"]["precipitation"][5] = None
+        series = ForecastSeries.from_response(data)
+
+        self.assertEqual(series.temperature[5], series.temperature[4])
+        self.assertEqual(series.day_rain_hours(0), 0)
+
+    def test_incomplete_response(self):
+        """Testet dass unvollständige Antworten abgelehnt werden."""
+        data = sample_response()
+        data["hourly"]["precipitation"].pop()
+        with self.assertRaises(ValueError):
+            ForecastSeries.from_response(data)
+        with self.assertRaises(KeyError):
+            ForecastSeries.from_response({"daily": {}})
+
+
+class TestForecastQuery(unittest.TestCase):
+    """Tests für die ForecastQuery Klasse."""
+
+    def test_parameter_round_trip(self):
+        """Testet Kodierung und Dekodierung als Parameter-String."""
+        query = ForecastQuery("weekend", "rain", "Bern")
+        self.assertEqual(query.to_parameter(), "weekend|rain|Bern")
+        self.assertEqual(ForecastQuery.from_parameter(query.to_parameter()), query)
+        self.assertIsNone(ForecastQuery.from_parameter("tomorrow|summary|").city)
+
+    def test_invalid_parameter(self):
+        """Testet die Rückfallwerte für unbekannte Zeiträume und Aspekte."""
+        self.assertEqual(ForecastQuery.from_parameter("gestern|sonne"), ForecastQuery("week", "summary"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Tests für das Offline-Ortsverzeichnis.
+"""
+import unittest
+import sys
+import os
+
+# Füge src zum Pfad hinzu
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.gazetteer import Gazetteer, edit_distance, get_gazetteer, normalize_city
+
+
+class TestNormalizeCity(unittest.TestCase):
+    """Tests für die Normalisierung von Stadtnamen."""
+
+    def test_umlaut_folding(self):
+        """Testet dass Umlaute und ihre Umschreibungen gleich behandelt werden."""
+        self.assertEqual(normalize_city("Zürich"), "zurich")
+        self.assertEqual(normalize_city("Zuerich"), "zurich")
+        self.assertEqual(normalize_city("ZURICH"), "zurich")
+
+    def test_accents_and_punctuation(self):
+        """Testet Akzente, ß und Satzzeichen."""
+        self.assertEqual(normalize_city("Genève"), "geneve")
+        self.assertEqual(normalize_city("Straßburg"), "strassburg")
+        self.assertEqual(normalize_city(" St.  Gallen "), "st gallen")
+
+
+class TestGazetteer(unittest.TestCase):
+    """Tests für die Gazetteer Klasse."""
+
+    def setUp(self):
+        """Verwendet das gemeinsam genutzte Ortsverzeichnis."""
+        self.gazetteer = get_gazetteer()
+
+    def test_exact_lookup(self):
+        """Testet die exakte Suche über verschiedene Schreibweisen."""
+        for spelling in ["Zürich", "zurich", "Zuerich"]:
+            entry = self.gazetteer.lookup(spelling)
+            self.assertIsNotNone(entry, f"Failed for: {spelling}")
+            self.assertEqual(entry["name"], "Zürich")
+            self.assertEqual(entry["country_code"], "CH")
+
+    def test_alias_lookup(self):
+        """Testet die Suche über alternative Namen."""
+        self.assertEqual(self.gazetteer.lookup("Geneva")["name"], "Genf")
+        self.assertEqual(self.gazetteer.lookup("Munich")["name"], "München")
+
+    def test_unknown_city(self):
+        """Testet dass unbekannte Namen None liefern."""
+        self.assertIsNone(self.gazetteer.lookup("Heute"))
+        self.assertIsNone(self.gazetteer.lookup(""))
+
+    def test_fuzzy_lookup(self):
+        """Testet die Korrektur von Tippfehlern und Vertauschungen."""
+        self.assertEqual(self.gazetteer.fuzzy("Müchen")["name"], "München")
+        self.assertEqual(self.gazetteer.fuzzy("Zuirch")["name"], "Zürich")
+        self.assertEqual(self.gazetteer.fuzzy("Frankfrut")["name"], "Frankfurt am Main")
+        # Gleich nah an "Bern" und "Berlin": mehr gemeinsame Trigramme entscheiden
+        self.assertEqual(self.gazetteer.fuzzy("Berln")["name"], "Berlin")
+
+    def test_fuzzy_rejects_uncertain_matches(self):
+        """Testet dass kurze, fremde und zu weit entfernte Namen nicht korrigiert werden."""
+        self.assertIsNone(self.gazetteer.fuzzy("Berg"))
+        self.assertIsNone(self.gazetteer.fuzzy("heute"))
+        self.assertIsNone(self.gazetteer.fuzzy("Wädenswil"))
+        self.assertIsNone(self.gazetteer.fuzzy("Wiener"))
+
+    def test_resolve(self):
+        """Testet exakte Suche mit unscharfem Rückfall."""
+        self.assertEqual(self.gazetteer.resolve("Zurich")["name"], "Zürich")
+        self.assertEqual(self.gazetteer.resolve("Stutgart")["name"], "Stuttgart")
+        self.assertIsNone(self.gazetteer.resolve("Dübendorf"))
+
+    def test_edit_distance(self):
+        """Testet die Editierdistanz mit Vertauschungen und Abbruchgrenze."""
+        self.assertEqual(edit_distance("zurich", "zurich", 2), 0)
+        self.assertEqual(edit_distance("zuirch", "zurich", 2), 1)
+        self.assertEqual(edit_distance("kitten", "sitting", 5), 3)
+        self.assertEqual(edit_distance("kitten", "sitting", 1), 2)
+        self.assertEqual(edit_distance("bern", "hamburg", 2), 3)
+
+    def test_prefix_lookup(self):
+        """Testet die Präfix-Suche ohne Alias-Duplikate."""
+        names = [entry["name"] for entry in self.gazetteer.prefix("Ber")]
+        self.assertIn("Bern", names)
+        self.assertIn("Berlin", names)
+        self.assertEqual(len(names), len(set(names)))
+
+        self.assertEqual(len(self.gazetteer.prefix("B", limit=2)), 2)
+        self.assertEqual(self.gazetteer.prefix(""), [])
+
+    def test_custom_table(self):
+        """Testet den Aufbau aus einer eigenen Tabelle."""
+        gazetteer = Gazetteer([("Testdorf", "CH", 47.0, 8.0, ("Testort",))])
+
+        self.assertEqual(len(gazetteer), 1)
+        self.assertEqual(gazetteer.lookup("testort")["latitude"], 47.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Tests für Raster und Umkreisindex.
+"""
+import unittest
+import sys
+import os
+
+# Füge src zum Pfad hinzu
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.geo import GridIndex, distance_km, snap_to_grid
+
+
+class TestGeo(unittest.TestCase):
+    """Tests für distance_km und snap_to_grid."""
+
+    def test_distance(self):
+        """Testet die Entfernung Zürich-Bern (rund 95 km)."""
+        self.assertAlmostEqual(distance_km(47.3769, 8.5417, 46.9480, 7.4474), 95, delta=2)
+        self.assertEqual(distance_km(47.0, 8.0, 47.0, 8.0), 0.0)
+
+    def test_snap_within_cell(self):
+        """Testet dass gerasterte Koordinaten höchstens eine halbe Zellendiagonale entfernt sind."""
+        for latitude, longitude in [(47.3769, 8.5417), (47.2267, 8.6714), (-33.87, 151.21), (64.15, -21.94)]:
+            snapped = snap_to_grid(latitude, longitude, 2.0)
+            self.assertLessEqual(distance_km(latitude, longitude, *snapped), 1.5)
+
+    def test_snap_idempotent(self):
+        """Testet dass erneutes Rastern nichts ändert."""
+        snapped = snap_to_grid(47.3769, 8.5417, 2.0)
+        self.assertEqual(snap_to_grid(*snapped, 2.0), snapped)
+
+    def test_nearby_points_share_cell(self):
+        """Testet dass wenige hundert Meter entfernte Punkte in derselben Zelle landen."""
+        self.assertEqual(snap_to_grid(47.3700, 8.5400, 2.0), snap_to_grid(47.3710, 8.5420, 2.0))
+
+
+class TestGridIndex(unittest.TestCase):
+    """Tests für die GridIndex Klasse."""
+
+    def setUp(self):
+        """Index mit 3 km Radius und drei Orten um Zürich."""
+        self.index = GridIndex(3.0)
+        self.index.add("zurich", 47.3769, 8.5417)
+        self.index.add("oerlikon", 47.4113, 8.5441)
+        self.index.add("bern", 46.9480, 7.4474)
+
+    def test_nearest_sorted_by_distance(self):
+        """Testet dass nur Orte im Umkreis gefunden werden, nächster zuerst."""
+        keys = [key for key, _, _ in self.index.nearest(47.3800, 8.5400)]
+        self.assertEqual(keys, ["zurich"])
+        keys = [key for key, _, _ in self.index.nearest(47.3950, 8.5430)]
+        self.assertEqual(keys, ["oerlikon", "zurich"])
+
+    def test_discard_and_replace(self):
+        """Testet Entfernen und Verschieben von Orten."""
+        self.index.discard("zurich")
+        self.index.discard("unbekannt")
+        self.assertEqual(self.index.nearest(47.3769, 8.5417), [])
+
+        self.index.add("oerlikon", 46.9500, 7.4500)
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual([key for key, _, _ in self.index.nearest(46.9490, 7.4480)], ["bern", "oerlikon"])
+
+    def test_disabled(self):
+        """Testet dass ein Radius von 0 den Index abschaltet."""
+        index = GridIndex(0)
+        index.add("zurich", 47.3769, 8.5417)
+        self.assertEqual(index.nearest(47.3769, 8.5417), [])
+        self.assertEqual(len(index), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
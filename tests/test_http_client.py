@@ -0,0 +1,66 @@
+"""
+Tests für den gemeinsam genutzten HTTP-Client.
+"""
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Füge src zum Pfad hinzu
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.http_client import create_session, get_session, close_session, RETRY_STATUS_CODES
+from src.news import NewsService
+from src.weather import WeatherService
+
+
+class TestHttpSession(unittest.TestCase):
+    """Tests für die Session-Fabrik."""
+
+    def tearDown(self):
+        """Setzt die gemeinsam genutzte Session zurück."""
+        close_session()
+
+    def test_pool_and_retry_configuration(self):
+        """Testet dass Pool-Größe und Retry-Strategie übernommen werden."""
+        session = create_session(pool_connections=4, pool_maxsize=8, retries=3, backoff_factor=0.5)
+        adapter = session.get_adapter("https://api.open-meteo.com")
+
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_maxsize, 8)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertEqual(adapter.max_retries.backoff_factor, 0.5)
+        self.assertEqual(tuple(adapter.max_retries.status_forcelist), RETRY_STATUS_CODES)
+
+    def test_retry_ignores_retry_after(self):
+        """Testet dass ein Retry-After des Servers nicht abgewartet wird."""
+        retry = create_session(retries=1, backoff_factor=0).get_adapter("https://example.org").max_retries
+        response = Mock(status=429, headers={"Retry-After": "120"})
+        response.get_redirect_location.return_value = None
+
+        with patch('urllib3.util.retry.time.sleep') as sleep:
+            retry.increment("GET", "/", response=response).sleep(response)
+
+        self.assertFalse(retry.respect_retry_after_header)
+        sleep.assert_not_called()
+
+    def test_shared_session(self):
+        """Testet dass alle Services dieselbe Session nutzen."""
+        self.assertIs(get_session(), get_session())
+        self.assertIs(WeatherService().session, NewsService().session)
+
+    def test_close_session(self):
+        """Testet dass nach dem Schließen eine neue Session erstellt wird."""
+        first = get_session()
+        close_session()
+        self.assertIsNot(get_session(), first)
+
+    def test_injected_session(self):
+        """Testet die Übergabe einer eigenen Session."""
+        session = Mock()
+        self.assertIs(WeatherService(session=session).session, session)
+        self.assertIs(NewsService(session=session).session, session)
+
+
+if __name__ == '__main__':
+    unittest.main()
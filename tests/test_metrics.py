@@ -0,0 +1,121 @@
+"""
+Tests für die Metriken.
+"""
+import json
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+# Füge src zum Pfad hinzu
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.circuit_breaker import CircuitBreaker
+from src.metrics import Registry, RequestTimer, STAGE_SECONDS, UPSTREAM_REQUESTS
+
+
+class TestRegistry(unittest.TestCase):
+    """Tests für Zähler, Histogramme und den Textexport."""
+
+    def setUp(self):
+        """Initialisiert eine leere Registry für jeden Test."""
+        self.registry = Registry()
+
+    def test_counter(self):
+        """Testet Zähler mit Labels."""
+        counter = self.registry.counter("test_total", "Testzähler", ["intent"])
+        counter.inc(intent="weather")
+        counter.inc(2, intent="weather")
+        counter.inc(intent="news")
+
+        self.assertEqual(counter.value(intent="weather"), 3)
+        output = self.registry.render()
+        self.assertIn("# TYPE test_total counter", output)
+        self.assertIn('test_total{intent="weather"} 3', output)
+        self.assertIn('test_total{intent="news"} 1', output)
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Testet kumulative Buckets, Summe und Anzahl."""
+        histogram = self.registry.histogram("test_seconds", "Testdauer", buckets=(0.1, 1))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        output = self.registry.render()
+        self.assertIn('test_seconds_bucket{le="0.1"} 1', output)
+        self.assertIn('test_seconds_bucket{le="1"} 2', output)
+        self.assertIn('test_seconds_bucket{le="+Inf"} 3', output)
+        self.assertIn("test_seconds_sum 5.55", output)
+        self.assertIn("test_seconds_count 3", output)
+
+    def test_label_escaping(self):
+        """Testet das Escaping von Anführungszeichen in Label-Werten."""
+        counter = self.registry.counter("test_total", "Testzähler", ["city"])
+        counter.inc(city='St. "Gallen"')
+
+        self.assertIn('test_total{city="St. \\"Gallen\\""} 1', self.registry.render())
+
+    def test_collector(self):
+        """Testet Messwerte aus Collector-Funktionen."""
+        def collector():
+            return [("test_entries", "gauge", "Einträge", [({"cache": "forecast"}, 7)])]
+
+        self.registry.register_collector(collector)
+        self.assertIn('test_entries{cache="forecast"} 7', self.registry.render())
+
+        self.registry.unregister_collector(collector)
+        self.assertNotIn("test_entries", self.registry.render())
+
+
+class TestRequestTimer(unittest.TestCase):
+    """Tests für die RequestTimer Klasse."""
+
+    def test_stages_are_observed(self):
+        """Testet dass Schritte gemessen und im Histogramm erfasst werden."""
+        before = STAGE_SECONDS.count(stage="test")
+        timer = RequestTimer()
+        with timer.stage("test"):
+            pass
+        timer.finish("greeting")
+
+        self.assertIn("test", timer.stages)
+        self.assertEqual(STAGE_SECONDS.count(stage="test"), before + 1)
+
+    def test_repeated_stage_observed_once(self):
+        """Testet dass ein mehrfach betretener Schritt einmal pro Anfrage erfasst wird."""
+        before = STAGE_SECONDS.count(stage="test-repeated")
+        timer = RequestTimer()
+        for _ in range(3):
+            with timer.stage("test-repeated"):
+                pass
+        self.assertEqual(STAGE_SECONDS.count(stage="test-repeated"), before)
+
+        timer.finish("weather")
+
+        self.assertEqual(STAGE_SECONDS.count(stage="test-repeated"), before + 1)
+
+    def test_timing_log(self):
+        """Testet die strukturierte Timing-Log-Zeile."""
+        timer = RequestTimer()
+        with timer.stage("nlp"):
+            pass
+
+        with patch('src.metrics.Config.TIMING_LOG', True):
+            with self.assertLogs("ki.timing", level="INFO") as logs:
+                timer.finish("help", cached=True)
+
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual(entry["intent"], "help")
+        self.assertTrue(entry["cached"])
+        self.assertIn("nlp", entry["stages_ms"])
+
+    def test_upstream_calls_are_counted(self):
+        """Testet dass Circuit-Breaker-Aufrufe als Upstream-Metriken erfasst werden."""
+        breaker = CircuitBreaker("metrics-test")
+        breaker.call(lambda: "ok")
+
+        self.assertEqual(UPSTREAM_REQUESTS.value(upstream="metrics-test", outcome="success"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,11 +4,30 @@ Tests für den News-Service.
 import unittest
 import sys
 import os
+import threading
+import time
+from unittest.mock import patch, Mock
+
+import requests
 
 # Füge src zum Pfad hinzu
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.news import NewsService
+from src.news import NewsPrefetcher, NewsService
+
+
+def news_response(count):
+    """Erzeugt eine Mock-Antwort der NewsAPI mit count Artikeln."""
+    response = Mock()
+    response.json.return_value = {
+        "status": "ok",
+        "articles": [
+            {"title": f"Titel {i}", "description": "Text", "source": {"name": "Quelle"}}
+            for i in range(count)
+        ]
+    }
+    response.raise_for_status = Mock()
+    return response
 
 
 class TestNewsService(unittest.TestCase):
@@ -63,6 +82,142 @@ class TestNewsService(unittest.TestCase):
         result = self.news.format_news(error_data)
         self.assertEqual(result, "API-Fehler")
 
+    
+    @patch('src.news.requests.Session.get')
+    def test_news_cache_slicing(self, mock_get):
+        """Testet dass kleinere Anfragen aus dem größten gecachten Ergebnis bedient werden."""
+        mock_get.return_value = news_response(5)
+        self.news.api_key = "test-key"
+        
+        first = self.news.get_top_news(5)
+        second = self.news.get_top_news(3)
+        
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(len(first["articles"]), 5)
+        self.assertEqual(second["articles"], first["articles"][:3])
+    
+    @patch('src.news.requests.Session.get')
+    def test_news_cache_per_country(self, mock_get):
+        """Testet dass der Cache pro Land getrennt ist."""
+        mock_get.return_value = news_response(3)
+        self.news.api_key = "test-key"
+        
+        self.news.get_top_news(3, country="de")
+        self.news.get_top_news(3, country="ch")
+        self.news.get_top_news(3, country="de")
+        
+        self.assertEqual(mock_get.call_count, 2)
+    
+    @patch('src.news.requests.Session.get')
+    def test_errors_are_not_cached(self, mock_get):
+        """Testet dass API-Fehler nicht im Cache landen."""
+        error_response = Mock()
+        error_response.json.return_value = {"status": "error", "message": "rateLimited"}
+        error_response.raise_for_status = Mock()
+        mock_get.return_value = error_response
+        self.news.api_key = "test-key"
+        
+        self.assertFalse(self.news.get_top_news(3)["success"])
+        self.assertFalse(self.news.get_top_news(3)["success"])
+        self.assertEqual(mock_get.call_count, 2)
+
+    
+    @patch('src.news.requests.Session.get')
+    def test_concurrent_requests_share_upstream_call(self, mock_get):
+        """Testet dass gleichzeitige identische Anfragen nur einen Upstream-Aufruf auslösen."""
+        def slow_get(*args, **kwargs):
+            time.sleep(0.1)
+            return news_response(3)
+        mock_get.side_effect = slow_get
+        self.news.api_key = "test-key"
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.news.get_top_news(3)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    
+    @patch('src.news.requests.Session.get')
+    def test_open_breaker_falls_back_to_demo(self, mock_get):
+        """Testet dass bei offenem Breaker Demo-Nachrichten ohne HTTP-Aufruf kommen."""
+        mock_get.side_effect = requests.ConnectionError("Timeout")
+        self.news.api_key = "test-key"
+        for _ in range(self.news.news_breaker.min_calls):
+            self.assertFalse(self.news.get_top_news(3)["success"])
+        
+        result = self.news.get_top_news(3)
+        
+        self.assertTrue(result["demo"])
+        self.assertEqual(mock_get.call_count, self.news.news_breaker.min_calls)
+    
+    @patch('src.news.requests.Session.get')
+    def test_open_breaker_serves_stale_news(self, mock_get):
+        """Testet dass bei offenem Breaker abgelaufene echte Nachrichten vor Demo-Daten kommen."""
+        mock_get.return_value = news_response(5)
+        self.news.api_key = "test-key"
+        fetched_at = time.time() - self.news.news_cache.ttl - 1
+        with patch('src.cache.time.time', return_value=fetched_at):
+            fresh = self.news.get_top_news(5)
+        
+        breaker = self.news.news_breaker
+        for _ in range(breaker.min_calls):
+            breaker.record(0.0, failed=True)
+        result = self.news.get_top_news(3)
+        
+        self.assertNotIn("demo", result)
+        self.assertEqual(result["articles"], fresh["articles"][:3])
+        self.assertEqual(mock_get.call_count, 1)
+
+
+class TestNewsPrefetcher(unittest.TestCase):
+    """Tests für die NewsPrefetcher Klasse."""
+    
+    def setUp(self):
+        """Initialisiert einen News-Service mit API-Key für jeden Test."""
+        self.news = NewsService()
+        self.news.api_key = "test-key"
+    
+    @patch('src.news.requests.Session.get')
+    def test_run_once(self, mock_get):
+        """Testet dass vorab geladene Nachrichten ohne API-Aufruf geliefert werden."""
+        mock_get.return_value = news_response(10)
+        prefetcher = NewsPrefetcher(self.news, countries=["de", "ch"], page_size=10)
+        
+        prefetcher.run_once()
+        result = self.news.get_top_news(3, country="ch")
+        
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(len(result["articles"]), 3)
+    
+    @patch('src.news.requests.Session.get')
+    def test_start_and_stop(self, mock_get):
+        """Testet den Hintergrund-Thread."""
+        mock_get.return_value = news_response(10)
+        prefetcher = NewsPrefetcher(self.news, countries=["de"], page_size=10, interval=60)
+        
+        prefetcher.start()
+        prefetcher.stop(timeout=5)
+        
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertIsNotNone(self.news._cached_news(5, "de"))
+    
+    @patch('src.news.requests.Session.get')
+    def test_demo_mode_skips_prefetch(self, mock_get):
+        """Testet dass ohne API-Key nichts abgerufen wird."""
+        self.news.api_key = None
+        NewsPrefetcher(self.news, countries=["de"]).run_once()
+        
+        mock_get.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
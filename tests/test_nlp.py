@@ -11,6 +11,17 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from src.nlp import NLPProcessor
 
 
+def baseline_intent(text):
+    """Absicht wie in der ursprünglichen Implementierung (Teilstring-Scans in Prioritätsreihenfolge)."""
+    text_lower = text.lower().strip()
+    for intent, attribute in [("exit", "EXIT_KEYWORDS"), ("help", "HELP_KEYWORDS"),
+                              ("greeting", "GREETING_KEYWORDS"), ("weather", "WEATHER_KEYWORDS"),
+                              ("news", "NEWS_KEYWORDS")]:
+        if any(keyword in text_lower for keyword in getattr(NLPProcessor, attribute)):
+            return intent
+    return "unknown"
+
+
 class TestNLPProcessor(unittest.TestCase):
     """Tests für die NLPProcessor Klasse."""
     
@@ -87,6 +98,64 @@ class TestNLPProcessor(unittest.TestCase):
         self.assertEqual(intent, "weather")
         self.assertEqual(city, "Hamburg")
     
+    def test_city_canonical_spelling(self):
+        """Testet dass bekannte Städte in kanonischer Schreibweise geliefert werden."""
+        intent, city = self.nlp.process("Wetter in Zuerich")
+        self.assertEqual(intent, "weather")
+        self.assertEqual(city, "Zürich")
+        
+        intent, city = self.nlp.process("Wetter in Wädenswil")
+        self.assertEqual(city, "Wädenswil")
+    
+    def test_city_typos_kept(self):
+        """Testet dass Tippfehler stehen bleiben (korrigiert erst der Wetter-Service)."""
+        self.assertEqual(self.nlp.process("Wetter in Berln"), ("weather", "Berln"))
+        self.assertEqual(self.nlp.process("Wetter in Lienz"), ("weather", "Lienz"))
+        self.assertEqual(self.nlp.process("temperatur in müchen und zuirch"), ("weather", "Müchen, Zuirch"))
+    
+    def test_multi_city_extraction(self):
+        """Testet die Extraktion mehrerer Städte als kommagetrennte Liste."""
+        intent, cities = self.nlp.process("Wetter in Zürich, Bern und Basel")
+        self.assertEqual(intent, "weather")
+        self.assertEqual(cities, "Zürich, Bern, Basel")
+        
+        _, cities = self.nlp.process("Temperatur in zuerich & Genf und Zürich")
+        self.assertEqual(cities, "Zürich, Genf")
+    
+    def test_city_list_ends_at_non_city(self):
+        """Testet dass Füllwörter nach Komma oder "und" nicht als Stadt gelten."""
+        test_cases = [
+            ("Wetter in Bern, bitte", "Bern"),
+            ("Wetter in Bern und wie warm ist es?", "Bern"),
+            ("Temperatur in Zürich und Umgebung", "Zürich"),
+            ("Wetter in Bern und Thalwil", "Bern, Thalwil"),
+            ("wetter in bern und thalwil", "Bern"),
+        ]
+        
+        for text, expected in test_cases:
+            with self.subTest(text=text):
+                self.assertEqual(self.nlp.process(text), ("weather", expected))
+    
+    def test_forecast_intent(self):
+        """Testet die Erkennung von Vorhersagefragen mit Zeitraum, Aspekt und Ort."""
+        test_cases = [
+            ("Wie wird das Wetter morgen?", "tomorrow|summary|"),
+            ("Regen diese Woche in Bern", "week|rain|Bern"),
+            ("Regnet es übermorgen in Zuerich?", "day_after_tomorrow|rain|Zürich"),
+            ("Windigster Tag am Wochenende", "weekend|wind|"),
+            ("Wie warm wird es am Samstag in Hamburg?", "saturday|temperature|Hamburg"),
+            ("Wetter in den nächsten Tagen", "week|summary|"),
+            ("Wetter für morgen", "tomorrow|summary|"),
+        ]
+        for text, parameter in test_cases:
+            self.assertEqual(self.nlp.process(text), ("forecast", parameter), f"Failed for: {text}")
+    
+    def test_forecast_needs_period(self):
+        """Testet dass ohne Zeitraum das aktuelle Wetter gemeint bleibt."""
+        self.assertEqual(self.nlp.process("Wie ist das Wetter heute?"), ("weather", None))
+        self.assertEqual(self.nlp.process("Guten Morgen, wie ist das Wetter?"), ("weather", None))
+        self.assertEqual(self.nlp.process("Was machst du morgen?"), ("unknown", None))
+    
     def test_news_count_extraction(self):
         """Testet die Extraktion der Nachrichtenanzahl."""
         intent, count = self.nlp.process("Top 5 News")
@@ -97,6 +166,97 @@ class TestNLPProcessor(unittest.TestCase):
         self.assertEqual(intent, "news")
         self.assertEqual(count, "3")
     
+    def test_word_boundary_false_positives(self):
+        """Testet dass Schlüsselwörter in anderen Wörtern nicht greifen."""
+        intent, _ = self.nlp.process("Ich bin hier")
+        self.assertEqual(intent, "unknown")
+        
+        intent, _ = self.nlp.process("Schönes Wochenende")
+        self.assertEqual(intent, "unknown")
+        
+        intent, _ = self.nlp.process("Was gibt es Neues am Wochenende?")
+        self.assertEqual(intent, "news")
+        
+        intent, _ = self.nlp.process("Wie ist der Wetterbericht?")
+        self.assertEqual(intent, "weather")
+    
+    def test_compound_keywords(self):
+        """Testet dass Wetter- und Nachrichtenbegriffe in Komposita erkannt werden."""
+        for text, expected in [
+            ("Gibt es Unwetter?", ("weather", None)),
+            ("Wie ist die Außentemperatur?", ("weather", None)),
+            ("Wie ist das Sauwetter in Bern", ("weather", "Bern")),
+            ("Zeig mir die Sportnachrichten", ("news", None)),
+            ("Tagesnachrichten bitte", ("news", None)),
+            ("Wirtschaftsnews", ("news", None)),
+        ]:
+            with self.subTest(text=text):
+                self.assertEqual(self.nlp.process(text), expected)
+    
+    def test_compound_keywords_keep_priority(self):
+        """Testet dass Komposita wie in der ursprünglichen Implementierung klassifiziert werden."""
+        texts = [
+            "Wetterhilfe", "Regenhilfe bitte", "Hilfefunktionen", "Unwetter", "Sonnenwetter",
+            "Außentemperatur", "Sportnachrichten", "Wetternachrichten", "Nachrichtenwetter",
+            "Windnachrichten", "Schneenews",
+        ]
+        for word_boundary in (True, False):
+            nlp = NLPProcessor(word_boundary=word_boundary)
+            for text in texts:
+                with self.subTest(text=text, word_boundary=word_boundary):
+                    self.assertEqual(nlp.process(text)[0], baseline_intent(text))
+        self.assertEqual(self.nlp.process("Wetterhilfe"), ("help", None))
+    
+    def test_substring_mode(self):
+        """Testet das frühere Teilstring-Verhalten ohne Wortgrenzen."""
+        nlp = NLPProcessor(word_boundary=False)
+        intent, _ = nlp.process("Ich bin hier")
+        self.assertEqual(intent, "greeting")
+        
+        intent, _ = nlp.process("Hilfe")
+        self.assertEqual(intent, "help")
+    
+    def test_intent_priority(self):
+        """Testet die Priorität bei mehreren erkannten Absichten."""
+        intent, _ = self.nlp.process("Wetter und News, dann tschüss")
+        self.assertEqual(intent, "exit")
+        
+        intent, _ = self.nlp.process("Hallo, wie ist das Wetter?")
+        self.assertEqual(intent, "greeting")
+        
+        intent, _ = self.nlp.process("News zum Wetter")
+        self.assertEqual(intent, "weather")
+    
+    def test_find_intents_positions(self):
+        """Testet dass alle Treffer mit Position in einem Durchlauf geliefert werden."""
+        hits = self.nlp.find_intents("hallo, wetter und news")
+        self.assertEqual(hits, [("greeting", 0), ("weather", 7), ("news", 18)])
+    
+    def test_process_many(self):
+        """Testet die Stapelverarbeitung inklusive Duplikaten und Generatoren."""
+        texts = ["Hallo", "Wetter in Bern", "Top 5 News", "", "Hallo", "xyz"]
+        
+        results = list(self.nlp.process_many(text for text in texts))
+        
+        self.assertEqual(results, [self.nlp.process(text) for text in texts])
+    
+    def test_process_many_without_memo(self):
+        """Testet dass ein begrenztes oder abgeschaltetes Memo dieselben Ergebnisse liefert."""
+        texts = ["Hallo", "Wetter in Bern", "Hallo", "Top 5 News", "Wetter in Bern"]
+        expected = [self.nlp.process(text) for text in texts]
+        
+        for memo_size in (0, 1):
+            with self.subTest(memo_size=memo_size):
+                self.assertEqual(list(self.nlp.process_many(texts, memo_size=memo_size)), expected)
+    
+    def test_process_many_parallel(self):
+        """Testet die Verteilung auf einen Prozess-Pool in Eingabereihenfolge."""
+        texts = ["Hallo", "Wetter in Bern", "Top 5 News", "hilfe", "exit"] * 20
+        
+        results = list(self.nlp.process_many(texts, processes=2, chunksize=7))
+        
+        self.assertEqual(results, [self.nlp.process(text) for text in texts])
+    
     def test_empty_input(self):
         """Testet leere Eingaben."""
         intent, _ = self.nlp.process("")
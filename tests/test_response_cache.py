@@ -0,0 +1,79 @@
+"""
+Tests für den Antwort-Cache.
+"""
+import json
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+# Füge src zum Pfad hinzu
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.response_cache import ResponseCache, STATIC_MAX_AGE
+
+
+class TestResponseCache(unittest.TestCase):
+    """Tests für die ResponseCache Klasse."""
+
+    def setUp(self):
+        """Initialisiert einen kleinen Cache für jeden Test."""
+        self.cache = ResponseCache(maxsize=10, ttl=60)
+
+    def test_render(self):
+        """Testet JSON-Serialisierung und ETag einer Antwort."""
+        rendered = ResponseCache.render("Grüezi 👋")
+
+        self.assertEqual(json.loads(rendered.body), {"response": "Grüezi 👋"})
+        self.assertEqual(rendered.etag, ResponseCache.render("Grüezi 👋").etag)
+        self.assertNotEqual(rendered.etag, ResponseCache.render("Hallo").etag)
+        self.assertEqual(rendered.max_age, 0)
+
+    def test_static_entries_do_not_expire(self):
+        """Testet dass deterministische Antworten ohne Ablaufzeit gehalten werden."""
+        with patch('src.cache.time.time', return_value=1000.0):
+            first = self.cache.put_static("help", None, "Hilfe")
+
+        with patch('src.cache.time.time', return_value=10 ** 9):
+            self.assertIs(self.cache.get("help", None), first)
+        self.assertEqual(first.max_age, STATIC_MAX_AGE)
+
+    def test_dynamic_entries_expire(self):
+        """Testet dass dynamische Antworten nach der TTL verworfen werden."""
+        with patch('src.cache.time.time', return_value=1000.0):
+            rendered = self.cache.put("weather", "Bern", "Wetter in Bern")
+            self.assertIs(self.cache.get("weather", "Bern"), rendered)
+            self.assertIsNone(self.cache.get("weather", "Basel"))
+
+        with patch('src.cache.time.time', return_value=1061.0):
+            self.assertIsNone(self.cache.get("weather", "Bern"))
+
+        self.assertEqual(rendered.max_age, 60)
+
+    def test_is_cacheable(self):
+        """Testet dass nur vollständige Abfragen mit echten Daten gecacht werden."""
+        ok = {"success": True, "city": "Bern"}
+        failed = {"success": False, "error": "Stadt nicht gefunden"}
+        demo = {"success": True, "city": "Bern", "demo": True}
+
+        self.assertTrue(ResponseCache.is_cacheable(ok))
+        self.assertFalse(ResponseCache.is_cacheable(failed))
+        self.assertFalse(ResponseCache.is_cacheable(demo))
+        self.assertTrue(ResponseCache.is_cacheable({"success": True, "results": [ok, ok]}))
+        self.assertFalse(ResponseCache.is_cacheable({"success": True, "results": [ok, failed]}))
+        self.assertFalse(ResponseCache.is_cacheable({"success": True, "results": [failed, failed]}))
+        self.assertFalse(ResponseCache.is_cacheable({"success": True, "results": [ok, demo]}))
+
+    def test_clear(self):
+        """Testet das Leeren beider Bereiche."""
+        self.cache.put_static("greeting", None, "Hallo")
+        self.cache.put("news", "3", "Nachrichten")
+        self.cache.clear()
+
+        self.assertIsNone(self.cache.get("greeting", None))
+        self.assertEqual(self.cache.stats()["size"], 0)
+        self.assertEqual(self.cache.stats()["static"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
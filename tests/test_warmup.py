@@ -0,0 +1,133 @@
+"""
+Tests für die Aufwärmphase und Cache-Snapshots.
+"""
+import unittest
+import sys
+import os
+import json
+import tempfile
+from unittest.mock import Mock
+
+# Füge src zum Pfad hinzu
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.forecast import ForecastQuery
+from src.news import NewsService
+from src.warmup import SNAPSHOT_VERSION, CacheWarmer
+from src.weather import WeatherService
+
+
+def mock_services(api_key_valid=True):
+    """Erzeugt Mock-Services, deren Abrufe erfolgreich sind."""
+    weather = Mock()
+    weather.default_city = "Zürich"
+    weather.is_async = False
+    weather.get_forecast.return_value = {"success": True}
+    weather.get_weather_many.return_value = {"success": True}
+    news = Mock()
+    news.is_async = False
+    news._is_api_key_valid.return_value = api_key_valid
+    news.refresh.return_value = {"success": True}
+    return weather, news
+
+
+class TestCacheWarmer(unittest.TestCase):
+    """Tests für die CacheWarmer Klasse."""
+
+    def test_run(self):
+        """Testet dass Standardstadt, Städte und Länder geladen werden."""
+        weather, news = mock_services()
+        warmer = CacheWarmer(weather, news, cities=["Bern", "Zürich"], countries=["ch", "de"],
+                             snapshot_path="", workers=2)
+
+        stats = warmer.run()
+
+        self.assertEqual(stats["cities"], 2)
+        self.assertEqual(stats["countries"], 2)
+        self.assertEqual(stats["errors"], 0)
+        weather.get_forecast.assert_called_once_with(ForecastQuery("week", city="Zürich"))
+        weather.get_weather_many.assert_called_once_with(["Zürich", "Bern"])
+        self.assertEqual(sorted(call.args[0] for call in weather.locate.call_args_list), ["Bern", "Zürich"])
+        self.assertEqual(sorted(call.args[0] for call in news.refresh.call_args_list), ["ch", "de"])
+
+    def test_run_without_api_key(self):
+        """Testet dass Nachrichten ohne gültigen API-Key übersprungen werden."""
+        weather, news = mock_services(api_key_valid=False)
+        warmer = CacheWarmer(weather, news, cities=[], countries=["ch"], snapshot_path="")
+
+        self.assertEqual(warmer.run()["countries"], 0)
+        news.refresh.assert_not_called()
+
+    def test_run_counts_errors(self):
+        """Testet dass fehlgeschlagene Abrufe gezählt werden, ohne die Phase abzubrechen."""
+        weather, news = mock_services()
+        weather.get_forecast.side_effect = RuntimeError("Upstream nicht erreichbar")
+        news.refresh.return_value = {"success": False}
+        warmer = CacheWarmer(weather, news, cities=[], countries=["ch"], snapshot_path="")
+
+        stats = warmer.run()
+
+        self.assertEqual(stats["errors"], 2)
+        weather.get_weather_many.assert_called_once_with(["Zürich"])
+
+    def test_start_in_background(self):
+        """Testet die Aufwärmphase im Hintergrund-Thread."""
+        weather, news = mock_services()
+        warmer = CacheWarmer(weather, news, cities=[], countries=[], snapshot_path="")
+
+        warmer.start()
+        warmer.join(timeout=5)
+
+        weather.get_weather_many.assert_called_once_with(["Zürich"])
+
+
+class TestCacheSnapshot(unittest.TestCase):
+    """Tests für Speichern und Wiederherstellen des Snapshots."""
+
+    def setUp(self):
+        """Temporäres Verzeichnis für die Snapshot-Datei."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "snapshot.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Testet dass Caches und abgeleitete Indizes einen Neustart überdauern."""
+        weather, news = WeatherService(), NewsService()
+        weather.geocoding_cache.set("de:bern", {"latitude": 46.95, "longitude": 7.45, "name": "Bern"})
+        weather.forecast_cache.set("46.95,7.45", {"temperature": 12.0})
+        news.news_cache.set("ch:20", {"success": True, "articles": []})
+        self.assertTrue(CacheWarmer(weather, news, snapshot_path=self.path).save())
+
+        weather, news = WeatherService(), NewsService()
+        restored = CacheWarmer(weather, news, snapshot_path=self.path).restore()
+
+        self.assertEqual(restored, 3)
+        self.assertEqual(weather.geocoding_cache.get("de:bern")["name"], "Bern")
+        self.assertEqual([key for key, _, _ in weather.forecast_index.nearest(46.95, 7.45)], ["46.95,7.45"])
+        self.assertEqual(news._largest_page["ch"], 20)
+        self.assertFalse(os.path.exists(f"{self.path}.{os.getpid()}.tmp"))
+
+    def test_invalid_snapshot_ignored(self):
+        """Testet dass fehlende, defekte und fremde Snapshots ignoriert werden."""
+        warmer = CacheWarmer(WeatherService(), NewsService(), snapshot_path=self.path)
+        self.assertEqual(warmer.restore(), 0)
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("{kein json")
+        self.assertEqual(warmer.restore(), 0)
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": SNAPSHOT_VERSION + 1, "weather": {}, "news": {}}, f)
+        self.assertEqual(warmer.restore(), 0)
+
+    def test_disabled_without_path(self):
+        """Testet dass ohne Snapshot-Datei nichts geschrieben wird."""
+        warmer = CacheWarmer(WeatherService(), NewsService(), snapshot_path="")
+        self.assertFalse(warmer.save())
+        self.assertEqual(warmer.restore(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,12 +4,19 @@ Tests für den Wetter-Service.
 import unittest
 import sys
 import os
+import threading
+import time
 from unittest.mock import patch, Mock
 
+import requests
+
 # Füge src zum Pfad hinzu
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from src.circuit_breaker import OPEN
+from src.forecast import ForecastQuery
 from src.weather import WeatherService, WMO_CODES
+from tests.test_forecast import sample_response
 
 
 class TestWeatherService(unittest.TestCase):
@@ -23,7 +30,7 @@ class TestWeatherService(unittest.TestCase):
         """Testet dass Zürich die Standard-Stadt ist."""
         self.assertEqual(self.weather.default_city, "Zürich")
     
-    @patch('src.weather.requests.get')
+    @patch('src.weather.requests.Session.get')
     def test_get_weather_success(self, mock_get):
         """Testet das erfolgreiche Abrufen von Wetterdaten."""
         # Mock für Geocoding-Antwort
@@ -48,6 +55,8 @@ class TestWeatherService(unittest.TestCase):
         
         mock_get.side_effect = [geocoding_response, weather_response]
         
+        # Geocoding-API statt Offline-Ortsverzeichnis verwenden
+        self.weather.gazetteer = None
         result = self.weather.get_weather("Zürich")
         
         self.assertTrue(result["success"])
@@ -56,7 +65,290 @@ class TestWeatherService(unittest.TestCase):
         self.assertEqual(result["humidity"], 70)
         self.assertIn("description", result)
     
-    @patch('src.weather.requests.get')
+    @patch('src.weather.requests.Session.get')
+    def test_geocoding_cache(self, mock_get):
+        """Testet dass wiederholtes Geocoding aus dem Cache bedient wird."""
+        geocoding_response = Mock()
+        geocoding_response.json.return_value = {
+            "results": [{"latitude": 47.2307, "longitude": 8.6716, "name": "Wädenswil"}]
+        }
+        geocoding_response.raise_for_status = Mock()
+        mock_get.return_value = geocoding_response
+        
+        first = self.weather._geocode_city("Wädenswil")
+        second = self.weather._geocode_city("  wädenswil ")
+        
+        self.assertEqual(first, second)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(self.weather.geocoding_cache.stats()["hits"], 1)
+    
+    @patch('src.weather.requests.Session.get')
+    def test_geocoding_single_flight(self, mock_get):
+        """Testet dass gleichzeitiges Geocoding derselben Stadt nur einen Aufruf auslöst."""
+        def slow_get(*args, **kwargs):
+            time.sleep(0.1)
+            response = Mock()
+            response.json.return_value = {
+                "results": [{"latitude": 47.2307, "longitude": 8.6716, "name": "Wädenswil"}]
+            }
+            response.raise_for_status = Mock()
+            return response
+        mock_get.side_effect = slow_get
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.weather._geocode_city("Wädenswil")))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual([result["name"] for result in results], ["Wädenswil"] * 5)
+    
+    @patch('src.weather.requests.Session.get')
+    def test_gazetteer_skips_geocoding(self, mock_get):
+        """Testet dass bekannte Städte ohne Geocoding-API aufgelöst werden."""
+        location = self.weather._geocode_city("zuerich")
+        
+        self.assertEqual(location["name"], "Zürich")
+        mock_get.assert_not_called()
+    
+    def _current_response(self, temperature=15.5):
+        """Erzeugt eine Mock-Antwort der Forecast-API."""
+        response = Mock()
+        response.json.return_value = {
+            "current": {
+                "temperature_2m": temperature,
+                "apparent_temperature": 14.0,
+                "relative_humidity_2m": 70,
+                "weather_code": 2,
+                "wind_speed_10m": 18.0
+            }
+        }
+        response.raise_for_status = Mock()
+        return response
+    
+    @patch('src.weather.requests.Session.get')
+    def test_forecast_cache(self, mock_get):
+        """Testet dass wiederholte Wetteranfragen aus dem Forecast-Cache kommen."""
+        mock_get.return_value = self._current_response()
+        
+        first = self.weather.get_weather("Zürich")
+        second = self.weather.get_weather("Zürich")
+        
+        self.assertEqual(first, second)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(self.weather.forecast_cache.stats()["hits"], 1)
+    
+    @patch('src.weather.requests.Session.get')
+    def test_forecast_stale_while_revalidate(self, mock_get):
+        """Testet dass veraltete Daten sofort geliefert und im Hintergrund erneuert werden."""
+        mock_get.return_value = self._current_response(10.0)
+        fetched_at = time.time() - self.weather.forecast_cache.ttl - 1
+        with patch('src.cache.time.time', return_value=fetched_at):
+            self.weather.get_weather("Zürich")
+        
+        mock_get.return_value = self._current_response(20.0)
+        result = self.weather.get_weather("Zürich")
+        for thread in list(self.weather._refreshing.values()):
+            thread.join()
+        
+        self.assertEqual(result["temperature"], 10.0)
+        self.assertEqual(self.weather.get_weather("Zürich")["temperature"], 20.0)
+        self.assertEqual(mock_get.call_count, 2)
+    
+    @patch('src.weather.requests.Session.get')
+    def test_forecast_single_flight(self, mock_get):
+        """Testet dass ein Burst gleicher Anfragen nur einen Upstream-Aufruf auslöst."""
+        def slow_get(*args, **kwargs):
+            time.sleep(0.1)
+            return self._current_response()
+        mock_get.side_effect = slow_get
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.weather.get_weather("Zürich")))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertTrue(all(result["success"] for result in results))
+    
+    @patch('src.weather.requests.Session.get')
+    def test_nearby_location_reuses_forecast(self, mock_get):
+        """Testet dass Orte im Umkreis eines gecachten Orts keinen eigenen Abruf auslösen."""
+        mock_get.return_value = self._current_response()
+        
+        self.weather.get_weather_at({"latitude": 47.3769, "longitude": 8.5417, "name": "Zürich"})
+        params = mock_get.call_args.kwargs["params"]
+        self.assertEqual((params["latitude"], params["longitude"]), self.weather._snap(47.3769, 8.5417))
+        
+        # Wipkingen liegt gut 2 km entfernt in einer anderen Rasterzelle
+        result = self.weather.get_weather_at({"latitude": 47.3936, "longitude": 8.5263, "name": "Wipkingen"})
+        self.assertEqual(result["city"], "Wipkingen")
+        self.assertEqual(mock_get.call_count, 1)
+        
+        self.weather.get_weather_at({"latitude": 46.9480, "longitude": 7.4474, "name": "Bern"})
+        self.assertEqual(mock_get.call_count, 2)
+    
+    @patch('src.weather.requests.Session.get')
+    def test_evicted_neighbour_leaves_index(self, mock_get):
+        """Testet dass verdrängte Einträge beim nächsten Nachbarschaftszugriff aus dem Index fallen."""
+        mock_get.return_value = self._current_response()
+        self.weather.get_weather_at({"latitude": 47.3769, "longitude": 8.5417, "name": "Zürich"})
+        self.weather.forecast_cache.clear()
+        
+        self.weather.get_weather_at({"latitude": 47.3936, "longitude": 8.5263, "name": "Wipkingen"})
+        
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(
+            [key for key, _, _ in self.weather.forecast_index.nearest(47.3769, 8.5417)],
+            [self.weather._forecast_cache_key(47.3936, 8.5263)]
+        )
+    
+    @patch('src.weather.requests.Session.get')
+    def test_get_weather_many_single_call(self, mock_get):
+        """Testet dass mehrere Städte mit einem Forecast-Aufruf abgefragt werden."""
+        current = self._current_response().json.return_value["current"]
+        response = Mock()
+        response.json.return_value = [{"current": current}, {"current": dict(current, temperature_2m=9.0)}]
+        response.raise_for_status = Mock()
+        mock_get.return_value = response
+        
+        # Zürich liegt nach dem ersten Abruf im Cache
+        self.weather.forecast_cache.set(self.weather._forecast_cache_key(47.3769, 8.5417), current)
+        result = self.weather.get_weather("Zürich, Bern, Basel")
+        
+        self.assertEqual(mock_get.call_count, 1)
+        params = mock_get.call_args.kwargs["params"]
+        self.assertEqual(len(params["latitude"].split(",")), 2)
+        self.assertEqual([r["city"] for r in result["results"]], ["Zürich", "Bern", "Basel"])
+        self.assertEqual(result["results"][2]["temperature"], 9.0)
+        
+        # Jetzt liegen alle Städte im Cache
+        self.weather.get_weather_many(["Basel", "Bern"])
+        self.assertEqual(mock_get.call_count, 1)
+    
+    @patch('src.weather.requests.Session.get')
+    def test_forecast_questions_share_one_call(self, mock_get):
+        """Testet dass Folgefragen zur Vorhersage eines Orts ohne weiteren Abruf beantwortet werden."""
+        response = Mock()
+        response.json.return_value = sample_response()
+        response.raise_for_status = Mock()
+        mock_get.return_value = response
+        
+        rain = self.weather.get_forecast(ForecastQuery("week", "rain", "Zürich"))
+        wind = self.weather.get_forecast(ForecastQuery("week", "wind", "Zürich"))
+        tomorrow = self.weather.get_forecast(ForecastQuery("tomorrow", "temperature", "Zürich"))
+        
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertIn("hourly", mock_get.call_args.kwargs["params"])
+        self.assertEqual(rain["rain_hours"], 3)
+        self.assertEqual(wind["windiest_day"]["weekday"], "Samstag")
+        self.assertEqual(wind["windiest_day"]["wind_speed"], 20.0)
+        self.assertEqual(tomorrow["temperature"], {"min": 2.0, "max": 7.0, "mean": 4.5})
+    
+    @patch('src.weather.requests.Session.get')
+    def test_forecast_error(self, mock_get):
+        """Testet die Fehlermeldung, wenn die Vorhersage nicht abrufbar ist."""
+        mock_get.side_effect = requests.ConnectionError("offline")
+        
+        result = self.weather.get_forecast(ForecastQuery("tomorrow", city="Zürich"))
+        
+        self.assertFalse(result["success"])
+        self.assertEqual(self.weather.series_cache.stats()["size"], 0)
+    
+    def test_forecast_format(self):
+        """Testet die Formatierung der Vorhersage je nach Aspekt."""
+        day = {"date": "2024-01-06", "weekday": "Samstag", "min": 1.0, "max": 8.5,
+               "description": "klar", "rain_hours": 2, "precipitation": 1.5, "wind_speed": 20.0}
+        data = {
+            "success": True, "city": "Bern", "label": "am Wochenende", "days": [day],
+            "temperature": {"min": 1.0, "max": 8.5, "mean": 4.2},
+            "rain_hours": 2, "windiest_day": day
+        }
+        
+        self.assertIn("Sa 06.01.: 2 h (1.5 mm)", self.weather.format_forecast(dict(data, aspect="rain")))
+        self.assertIn("bis zu 20.0 m/s", self.weather.format_forecast(dict(data, aspect="wind")))
+        self.assertIn("1.0°C bis 8.5°C", self.weather.format_forecast(dict(data, aspect="temperature")))
+        self.assertIn("📅 Vorhersage für Bern am Wochenende",
+                      self.weather.format_forecast(dict(data, aspect="summary")))
+        self.assertEqual(
+            self.weather.format_forecast(dict(data, aspect="rain", rain_hours=0)),
+            "☀️ Am Wochenende wird in Bern kein Regen erwartet."
+        )
+    
+    def test_weather_format_table(self):
+        """Testet die Tabellenformatierung mehrerer Städte."""
+        weather_data = {"success": True, "results": [
+            {"success": True, "city": "Zürich", "temperature": 20.5, "feels_like": 19.0,
+             "humidity": 60, "description": "sonnig", "wind_speed": 5.0},
+            {"success": False, "error": "Stadt 'Xyz' konnte nicht gefunden werden."}
+        ]}
+        
+        lines = self.weather.format_weather(weather_data).split("\n")
+        
+        self.assertIn("2 Städten", lines[0])
+        self.assertTrue(lines[1].startswith("Stadt"))
+        self.assertIn("20.5°C", lines[2])
+        self.assertIn("Xyz", lines[3])
+    
+    @patch('src.weather.requests.Session.get')
+    def test_open_breaker_falls_back_to_demo(self, mock_get):
+        """Testet dass bei offenem Forecast-Breaker ohne HTTP-Aufruf Demo-Daten kommen."""
+        mock_get.side_effect = requests.ConnectionError("Timeout")
+        for _ in range(self.weather.forecast_breaker.min_calls):
+            self.assertFalse(self.weather.get_weather("Zürich")["success"])
+        self.assertEqual(self.weather.forecast_breaker.state, OPEN)
+        
+        calls = mock_get.call_count
+        result = self.weather.get_weather("Zürich")
+        
+        self.assertTrue(result["demo"])
+        self.assertEqual(result["city"], "Zürich")
+        self.assertEqual(mock_get.call_count, calls)
+    
+    @patch('src.weather.requests.Session.get')
+    def test_open_geocoding_breaker_keeps_unknown_cities_unknown(self, mock_get):
+        """Testet dass bei offenem Geocoding-Breaker nur bekannte Orte (Demo-)Wetter erhalten."""
+        mock_get.return_value = self._current_response(10.0)
+        breaker = self.weather.geocoding_breaker
+        for _ in range(breaker.min_calls):
+            breaker.record(0.0, failed=True)
+        
+        unknown = self.weather.get_weather("Zürichh")
+        known = self.weather.get_weather("Zürich")
+        
+        self.assertFalse(unknown["success"])
+        self.assertIn("nicht gefunden", unknown["error"])
+        self.assertNotIn("demo", unknown)
+        self.assertEqual((known["city"], known["temperature"]), ("Zürich", 10.0))
+    
+    @patch('src.weather.requests.Session.get')
+    def test_open_breaker_serves_stale_data(self, mock_get):
+        """Testet dass veraltete Daten bei offenem Breaker ohne Aktualisierung geliefert werden."""
+        mock_get.return_value = self._current_response(10.0)
+        fetched_at = time.time() - self.weather.forecast_cache.ttl - 1
+        with patch('src.cache.time.time', return_value=fetched_at):
+            self.weather.get_weather("Zürich")
+        
+        breaker = self.weather.forecast_breaker
+        for _ in range(breaker.min_calls):
+            breaker.record(0.0, failed=True)
+        result = self.weather.get_weather("Zürich")
+        
+        self.assertEqual(result["temperature"], 10.0)
+        self.assertEqual(self.weather._refreshing, {})
+        self.assertEqual(mock_get.call_count, 1)
+    
+    @patch('src.weather.requests.Session.get')
     def test_get_weather_city_not_found(self, mock_get):
         """Testet Fehlerbehandlung wenn Stadt nicht gefunden wird."""
         geocoding_response = Mock()
@@ -69,6 +361,90 @@ class TestWeatherService(unittest.TestCase):
         self.assertFalse(result["success"])
         self.assertIn("error", result)
     
+    @patch('src.weather.requests.Session.get')
+    def test_series_expire_at_local_midnight(self, mock_get):
+        """Testet dass "morgen" nach Mitternacht am Ort nicht aus der Reihe von gestern kommt."""
+        monday, tuesday = sample_response(), sample_response(start=2)
+        monday["utc_offset_seconds"] = tuesday["utc_offset_seconds"] = 3600
+        responses = []
+        for data in (monday, tuesday):
+            response = Mock()
+            response.json.return_value = data
+            response.raise_for_status = Mock()
+            responses.append(response)
+        mock_get.side_effect = responses
+        query = ForecastQuery("tomorrow", "summary", "Zürich")
+        
+        # Montag, 1. Januar 2024, 23:30 in Zürich (22:30 UTC)
+        with patch('src.cache.time.time', return_value=1704148200.0):
+            before = self.weather.get_forecast(query)
+        with patch('src.cache.time.time', return_value=1704149100.0):  # 23:45
+            self.assertEqual(self.weather.get_forecast(query), before)
+        with patch('src.cache.time.time', return_value=1704150900.0):  # 00:15
+            after = self.weather.get_forecast(query)
+        
+        self.assertEqual(before["days"][0]["date"], "2024-01-02")
+        self.assertEqual(after["days"][0]["date"], "2024-01-03")
+        self.assertEqual(mock_get.call_count, 2)
+    
+    @patch('src.weather.requests.Session.get')
+    def test_typo_corrected_after_geocoding_miss(self, mock_get):
+        """Testet dass Tippfehler erst korrigiert werden, wenn die Geocoding-API den Namen nicht kennt."""
+        geocoding_response = Mock()
+        geocoding_response.json.return_value = {}
+        geocoding_response.raise_for_status = Mock()
+        mock_get.side_effect = [geocoding_response, self._current_response()]
+        
+        location = self.weather._geocode_city("Müchen")
+        result = self.weather.get_weather("Müchen")
+        
+        self.assertEqual((location["name"], location["corrected_from"]), ("München", "Müchen"))
+        self.assertEqual(result["corrected_from"], "Müchen")
+        self.assertTrue(self.weather.format_weather(result).startswith(
+            '🔎 "Müchen" nicht gefunden. Meinten Sie München?\n🌤️ Wetter in München:'
+        ))
+        self.assertEqual(mock_get.call_count, 2)
+    
+    @patch('src.weather.requests.Session.get')
+    def test_real_places_not_corrected(self, mock_get):
+        """Testet dass Orte, die die Geocoding-API kennt, nicht durch ähnliche ersetzt werden."""
+        for city, latitude, longitude in [("Lienz", 46.83, 12.77), ("Essex", 51.76, 0.5)]:
+            with self.subTest(city=city):
+                geocoding_response = Mock()
+                geocoding_response.json.return_value = {
+                    "results": [{"latitude": latitude, "longitude": longitude, "name": city}]
+                }
+                geocoding_response.raise_for_status = Mock()
+                mock_get.return_value = geocoding_response
+                
+                location = self.weather._geocode_city(city)
+                
+                self.assertEqual(location["name"], city)
+                self.assertNotIn("corrected_from", location)
+    
+    @patch('src.weather.requests.Session.get')
+    def test_negative_geocoding_cache(self, mock_get):
+        """Testet dass unbekannte Namen nur einmal bei der Geocoding-API angefragt werden."""
+        geocoding_response = Mock()
+        geocoding_response.json.return_value = {}
+        geocoding_response.raise_for_status = Mock()
+        mock_get.return_value = geocoding_response
+        
+        self.assertIsNone(self.weather._geocode_city("Heute"))
+        self.assertIsNone(self.weather._geocode_city("heute"))
+        
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(self.weather.geocoding_misses.stats()["hits"], 1)
+    
+    @patch('src.weather.requests.Session.get')
+    def test_geocoding_errors_not_cached_negatively(self, mock_get):
+        """Testet dass Verbindungsfehler keinen Negativ-Eintrag erzeugen."""
+        mock_get.side_effect = requests.ConnectionError("offline")
+        
+        self.assertIsNone(self.weather._geocode_city("Dübendorf"))
+        
+        self.assertEqual(len(self.weather.geocoding_misses), 0)
+    
     def test_weather_format(self):
         """Testet die Formatierung von Wetterdaten."""
         weather_data = {
@@ -1,8 +1,12 @@
 """
 Tests für das Web-Interface des KI-Assistenten.
 """
+import asyncio
+import json
 import unittest
-from web_app import app, WebKIAssistant
+from unittest.mock import AsyncMock, patch
+from src.metrics import REQUESTS, STAGE_SECONDS
+from web_app import app, assistant, WebKIAssistant
 
 
 class TestWebApp(unittest.TestCase):
@@ -65,6 +69,161 @@ class TestWebApp(unittest.TestCase):
         self.assertIn('response', data)
         self.assertIn('Nachrichten', data['response'])
 
+    def test_chat_api_etag(self):
+        """Test dass /api/chat ETag und Cache-Control liefert und 304 unterstützt."""
+        response = self.app.post('/api/chat', json={'message': 'hilfe'})
+        etag = response.headers['ETag']
+        self.assertIn('max-age', response.headers['Cache-Control'])
+
+        response = self.app.post('/api/chat', json={'message': 'hilfe'},
+                                 headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+    def test_chat_api_static_intent_skips_services(self):
+        """Test dass gecachte Begrüßungen den Service-Layer nicht erreichen."""
+        self.app.post('/api/chat', json={'message': 'Hallo'})
+        with patch.object(assistant, '_static_response') as static_response:
+            response = self.app.post('/api/chat', json={'message': 'Hallo'})
+
+        static_response.assert_not_called()
+        self.assertIn('Hallo', response.get_json()['response'])
+
+    def test_chat_api_closes_per_request_clients(self):
+        """Test dass ohne ASGI-Server der HTTP-Client jedes Anfrage-Loops geschlossen wird."""
+        from src.async_services import get_async_client
+        clients = []
+
+        async def weather(city):
+            clients.append(get_async_client())
+            return {"success": False, "error": "Testfehler"}
+
+        with patch.object(assistant.async_weather_service, 'get_weather', side_effect=weather):
+            for city in ['Chur', 'Thun', 'Sion']:
+                self.app.post('/api/chat', json={'message': f'Wetter in {city}'})
+            self.app.post('/api/chat/batch', json={'messages': ['Wetter in Olten']})
+
+        self.assertEqual(len(clients), 4)
+        self.assertTrue(all(client.is_closed for client in clients))
+
+    def test_chat_api_errors_not_cached(self):
+        """Test dass fehlgeschlagene Abfragen nicht gecacht werden."""
+        weather = AsyncMock(return_value={"success": False, "error": "Testfehler"})
+        with patch.object(assistant.async_weather_service, 'get_weather', weather):
+            for _ in range(2):
+                response = self.app.post('/api/chat', json={'message': 'Wetter in Chur'})
+                self.assertEqual(response.get_json()['response'], 'Testfehler')
+                self.assertIn('no-store', response.headers['Cache-Control'])
+
+        self.assertEqual(weather.await_count, 2)
+
+    def test_chat_api_demo_data_not_cached(self):
+        """Test dass Demo-Daten (z.B. bei offenem Circuit Breaker) nicht gecacht werden."""
+        demo = {"success": True, "demo": True, "city": "Chur", "country": "CH", "temperature": 20,
+                "feels_like": 19, "humidity": 50, "description": "Demo", "wind_speed": 3}
+        weather = AsyncMock(return_value=demo)
+        with patch.object(assistant.async_weather_service, 'get_weather', weather):
+            for _ in range(2):
+                response = self.app.post('/api/chat', json={'message': 'Wetter in Chur'})
+                self.assertIn('no-store', response.headers['Cache-Control'])
+
+        self.assertEqual(weather.await_count, 2)
+
+    def test_chat_api_forecast(self):
+        """Test dass Vorhersagefragen an den asynchronen Vorhersage-Service gehen."""
+        forecast = AsyncMock(return_value={"success": False, "error": "Keine Vorhersage"})
+        with patch.object(assistant.async_weather_service, 'get_forecast', forecast):
+            response = self.app.post('/api/chat', json={'message': 'Regnet es morgen in Chur?'})
+
+        self.assertEqual(response.get_json()['response'], 'Keine Vorhersage')
+        query = forecast.await_args.args[0]
+        self.assertEqual((query.period, query.aspect, query.city), ("tomorrow", "rain", "Chur"))
+
+    def test_metrics_endpoint(self):
+        """Test des Prometheus-Endpunkts mit Anfrage-, Schritt- und Cache-Metriken."""
+        self.app.post('/api/chat', json={'message': 'hilfe'})
+        response = self.app.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        output = response.get_data(as_text=True)
+        self.assertIn('ki_requests_total{intent="help"', output)
+        self.assertIn('ki_stage_seconds_count{stage="nlp"}', output)
+        self.assertIn('ki_cache_requests_total{cache="forecast",result="hit"}', output)
+        self.assertIn('ki_circuit_breaker_open{upstream="newsapi"}', output)
+
+    def test_chat_stream_api(self):
+        """Test der Streaming-API liefert Absicht, Zwischenstände und Antwort."""
+        response = self.app.post('/api/chat/stream', json={'message': 'Top 2 News'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+
+        events = []
+        for block in response.get_data(as_text=True).strip().split('\n\n'):
+            event_line, data_line = block.split('\n')
+            events.append((event_line[len('event: '):], json.loads(data_line[len('data: '):])))
+
+        self.assertEqual(events[0], ('intent', {'intent': 'news', 'parameter': '2'}))
+        self.assertEqual([event for event, _ in events].count('partial'), 3)
+        self.assertEqual(events[-1][0], 'done')
+        self.assertEqual(events[-1][1]['response'], assistant.process_input('Top 2 News'))
+
+    def test_chat_stream_api_empty_message(self):
+        """Test der Streaming-API mit leerer Nachricht."""
+        response = self.app.post('/api/chat/stream', json={'message': '  '})
+        self.assertEqual(response.status_code, 400)
+
+    def test_chat_batch_api(self):
+        """Test der Batch-API liefert Antworten in Eingabereihenfolge."""
+        response = self.app.post('/api/chat/batch',
+                                 json={'messages': ['Hallo', 'hilfe', '', 'Top 2 News']})
+        self.assertEqual(response.status_code, 200)
+        responses = response.get_json()['responses']
+        self.assertEqual(len(responses), 4)
+        self.assertIn('Hallo', responses[0])
+        self.assertIn('Verfügbare Befehle', responses[1])
+        self.assertIn('Bitte gib eine Nachricht ein', responses[2])
+        self.assertIn('Top 2 Nachrichten', responses[3])
+
+    def test_chat_batch_api_deduplicates_lookups(self):
+        """Test dass identische Wetterabfragen nur einmal ausgeführt werden."""
+        weather = AsyncMock(return_value={"success": False, "error": "Testfehler"})
+        with patch.object(assistant.async_weather_service, 'get_weather', weather):
+            response = self.app.post('/api/chat/batch', json={'messages': [
+                'Wetter in Bern', 'Temperatur in Bern', 'Wetter in Basel', 'Wie ist das Wetter?'
+            ]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['responses'], ['Testfehler'] * 4)
+        cities = sorted(call.args[0] for call in weather.await_args_list)
+        self.assertEqual(cities, ['Basel', 'Bern', 'Zürich'])
+
+    def test_chat_batch_api_uses_response_cache(self):
+        """Test dass der Batch den Antwort-Cache füllt und nutzt und jede Nachricht gemessen wird."""
+        data = {"success": True, "city": "Sursee", "temperature": 12, "feels_like": 11,
+                "humidity": 60, "description": "bewölkt", "wind_speed": 2}
+        weather = AsyncMock(return_value=data)
+        misses = REQUESTS.value(intent="weather", cached="false")
+        hits = REQUESTS.value(intent="weather", cached="true")
+        with patch.object(assistant.async_weather_service, 'get_weather', weather):
+            batch = self.app.post('/api/chat/batch', json={'messages': [
+                'Wetter in Sursee', 'Temperatur in Sursee'
+            ]}).get_json()['responses']
+            single = self.app.post('/api/chat', json={'message': 'Wetter in Sursee'}).get_json()
+            again = self.app.post('/api/chat/batch', json={'messages': ['Wetter in Sursee']})
+
+        self.assertEqual(weather.await_count, 1)
+        self.assertEqual(batch[0], single['response'])
+        self.assertEqual(again.get_json()['responses'], [single['response']])
+        self.assertEqual(REQUESTS.value(intent="weather", cached="false"), misses + 2)
+        self.assertEqual(REQUESTS.value(intent="weather", cached="true"), hits + 2)
+
+    def test_chat_batch_api_invalid(self):
+        """Test der Batch-API mit ungültigen Eingaben."""
+        for payload in [{}, {'messages': []}, {'messages': 'Hallo'}, {'messages': [1, 2]}]:
+            response = self.app.post('/api/chat/batch', json=payload)
+            self.assertEqual(response.status_code, 400, f"Failed for: {payload}")
+
 
 class TestWebKIAssistant(unittest.TestCase):
     """Tests für die WebKIAssistant-Klasse."""
@@ -89,6 +248,90 @@ class TestWebKIAssistant(unittest.TestCase):
         response = self.assistant.process_input('xyz123')
         self.assertIn('nicht verstanden', response)
 
+    def test_process_input_async(self):
+        """Test asynchrone Verarbeitung liefert dieselben Antworten."""
+        for message in ['Hallo', 'hilfe', 'xyz123', 'Top 2 News']:
+            response = asyncio.run(self.assistant.process_input_async(message))
+            self.assertEqual(response, self.assistant.process_input(message))
+
+    def test_process_input_stream(self):
+        """Test dass die gestreamte Antwort der normalen Verarbeitung entspricht."""
+        for message in ['Hallo', 'hilfe', 'xyz123', 'Top 2 News']:
+            events = list(self.assistant.process_input_stream(message))
+            self.assertEqual(events[0][0], 'intent')
+            self.assertEqual(events[-1], ('done', {'response': self.assistant.process_input(message)}))
+
+    def test_process_input_stream_weather_status(self):
+        """Test der Statusmeldungen einer Wetteranfrage."""
+        weather = {"success": False, "error": "Testfehler"}
+        with patch.object(self.assistant.weather_service, 'get_weather_at', return_value=weather):
+            events = list(self.assistant.process_input_stream('Wetter in Bern'))
+
+        self.assertEqual([event for event, _ in events], ['intent', 'status', 'status', 'done'])
+        self.assertIn('Bern', events[1][1]['text'])
+        self.assertEqual(events[-1][1]['response'], 'Testfehler')
+
+    def test_process_input_stream_forecast_status(self):
+        """Test der Statusmeldungen einer Vorhersageanfrage."""
+        forecast = {"success": False, "error": "Testfehler"}
+        with patch.object(self.assistant.weather_service, 'get_forecast_at', return_value=forecast):
+            events = list(self.assistant.process_input_stream('Wetter morgen in Bern'))
+
+        self.assertEqual(events[0][1]['intent'], 'forecast')
+        self.assertIn('Vorhersage für Bern', events[2][1]['text'])
+        self.assertEqual(events[-1][1]['response'], 'Testfehler')
+
+    def test_process_input_stream_uses_response_cache(self):
+        """Test dass der Stream Antworten cacht, gecachte sofort liefert und gemessen wird."""
+        weather = {"success": True, "city": "Bern", "country": "CH", "temperature": 12,
+                   "feels_like": 11, "humidity": 60, "description": "bewölkt", "wind_speed": 2}
+        with patch.object(self.assistant.weather_service, 'get_weather_at',
+                          return_value=weather) as get_weather_at, \
+                patch('web_app.RequestTimer.finish') as finish:
+            first = list(self.assistant.process_input_stream('Wetter in Bern'))
+            second = list(self.assistant.process_input_stream('Wetter in Bern'))
+
+        get_weather_at.assert_called_once()
+        self.assertEqual([event for event, _ in second], ['intent', 'done'])
+        self.assertEqual(second[-1], first[-1])
+        self.assertEqual(first[-1][1]['response'], self.assistant.process_input('Wetter in Bern'))
+        self.assertEqual([call.args for call in finish.call_args_list],
+                         [('weather', False), ('weather', True)])
+
+    def test_process_input_stream_stage_counts(self):
+        """Test dass ein gestreamter Abruf jeden Schritt einmal erfasst (wie /api/chat)."""
+        weather = {"success": False, "error": "Testfehler"}
+        stages = ["nlp", "weather", "format", "serialize"]
+        before = {stage: STAGE_SECONDS.count(stage=stage) for stage in stages}
+        with patch.object(self.assistant.weather_service, 'get_weather_at', return_value=weather):
+            list(self.assistant.process_input_stream('Wetter in Bern'))
+
+        self.assertEqual({stage: STAGE_SECONDS.count(stage=stage) - before[stage] for stage in stages},
+                         dict.fromkeys(stages, 1))
+
+    def test_services_created_on_first_access(self):
+        """Test dass statische Antworten keine Services erstellen."""
+        self.assistant.process_input('hilfe')
+        self.assertNotIn('weather_service', vars(self.assistant))
+        self.assertNotIn('async_news_service', vars(self.assistant))
+
+        self.assertIs(self.assistant.async_weather_service.forecast_cache,
+                      self.assistant.weather_service.forecast_cache)
+        self.assertIn('weather_service', vars(self.assistant))
+
+    def test_async_service_shares_caches(self):
+        """Test dass synchroner und asynchroner Wetter-Service Caches teilen."""
+        self.assertIs(self.assistant.async_weather_service.forecast_cache,
+                      self.assistant.weather_service.forecast_cache)
+        self.assertIs(self.assistant.async_weather_service.series_cache,
+                      self.assistant.weather_service.series_cache)
+        self.assertIs(self.assistant.async_weather_service.forecast_index,
+                      self.assistant.weather_service.forecast_index)
+        self.assertIs(self.assistant.async_weather_service.forecast_breaker,
+                      self.assistant.weather_service.forecast_breaker)
+        self.assertIs(self.assistant.async_news_service.news_breaker,
+                      self.assistant.news_service.news_breaker)
+
 
 if __name__ == '__main__':
     unittest.main()
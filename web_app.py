@@ -3,22 +3,93 @@
 KI-Assistent Web Interface
 Eine Web-Anwendung mit ChatGPT-ähnlicher UI.
 """
-from flask import Flask, render_template, request, jsonify
-from src.weather import WeatherService
-from src.news import NewsService
-from src.nlp import NLPProcessor
+import argparse
+import asyncio
+import json
+from typing import Dict, Iterator, List, Optional, Tuple
+from flask import Flask, Response, render_template, request, jsonify
+from src.cache import lazy_property
+from src.circuit_breaker import CLOSED
+from src.config import Config
+from src.forecast import ForecastQuery
+from src.metrics import REGISTRY, RequestTimer
+from src.response_cache import RenderedResponse, ResponseCache
 
 app = Flask(__name__)
 
 
 class WebKIAssistant:
-    """Web-Version des KI-Assistenten."""
+    """
+    Web-Version des KI-Assistenten.
+
+    Services werden erst beim ersten Zugriff erstellt (spätestens beim Start
+    der Aufwärmphase), sodass der Import von web_app weder requests noch
+    httpx lädt; der uvicorn-Elternprozess braucht beides nicht.
+    """
 
     def __init__(self):
-        self.weather_service = WeatherService()
-        self.news_service = NewsService()
-        self.nlp = NLPProcessor()
+        self.response_cache = ResponseCache()
         self.name = "KI-Assistent"
+        # Event-Loop des ASGI-Servers (von asgi.py beim Lifespan-Start gesetzt)
+        self.server_loop = None
+
+    @lazy_property
+    def weather_service(self):
+        """Synchroner Wetter-Service."""
+        from src.weather import WeatherService
+        return WeatherService()
+
+    @lazy_property
+    def news_service(self):
+        """Synchroner News-Service."""
+        from src.news import NewsService
+        return NewsService()
+
+    @lazy_property
+    def async_weather_service(self):
+        """Asynchroner Wetter-Service mit den Caches des synchronen Services."""
+        from src.async_services import AsyncWeatherService
+        return AsyncWeatherService(shared=self.weather_service)
+
+    @lazy_property
+    def async_news_service(self):
+        """Asynchroner News-Service mit dem Cache des synchronen Services."""
+        from src.async_services import AsyncNewsService
+        return AsyncNewsService(shared=self.news_service)
+
+    @lazy_property
+    def news_prefetcher(self):
+        """Hintergrund-Aktualisierung der Nachrichten (None ohne NEWS_PREFETCH_COUNTRIES)."""
+        if not Config.NEWS_PREFETCH_COUNTRIES:
+            return None
+        from src.news import NewsPrefetcher
+        return NewsPrefetcher(self.news_service)
+
+    @lazy_property
+    def warmer(self):
+        """Aufwärmphase und Cache-Snapshot."""
+        from src.warmup import CacheWarmer
+        return CacheWarmer(self.weather_service, self.news_service)
+
+    @lazy_property
+    def nlp(self):
+        """Sprachverarbeitung."""
+        from src.nlp import NLPProcessor
+        return NLPProcessor()
+
+    def start_background(self):
+        """Stellt die Caches aus dem Snapshot wieder her und startet Aufwärmphase und Prefetcher."""
+        self.warmer.restore()
+        if Config.WARMUP_ENABLED:
+            self.warmer.start()
+        if self.news_prefetcher is not None:
+            self.news_prefetcher.start()
+
+    def stop_background(self):
+        """Beendet den Prefetcher und schreibt den Cache-Snapshot."""
+        if self.news_prefetcher is not None:
+            self.news_prefetcher.stop()
+        self.warmer.save()
 
     def process_input(self, user_input: str) -> str:
         """
@@ -30,8 +101,318 @@ class WebKIAssistant:
         Returns:
             Die Antwort des Assistenten
         """
-        intent, parameter = self.nlp.process(user_input)
+        return self.respond(user_input).text
+
+    def respond(self, user_input: str) -> RenderedResponse:
+        """
+        Liefert die gerenderte Antwort, bevorzugt aus dem Antwort-Cache.
+
+        Args:
+            user_input: Die Eingabe des Benutzers
+
+        Returns:
+            RenderedResponse mit Text, JSON-Bytes und ETag
+        """
+        timer = RequestTimer()
+        with timer.stage("nlp"):
+            intent, parameter = self.nlp.process(user_input)
+
+        rendered = self.response_cache.get(intent, parameter)
+        cached = rendered is not None
+        if not cached:
+            key = self._lookup_key(intent, parameter)
+            if key is None:
+                rendered = self._render_static(intent, parameter, timer)
+            else:
+                with timer.stage(key[0]):
+                    data = self._fetch(key)
+                rendered = self._render_result(intent, parameter, key, data, timer)
+
+        timer.finish(intent, cached)
+        return rendered
+
+    def process_input_stream(self, user_input: str) -> Iterator[Tuple[str, dict]]:
+        """
+        Verarbeitet die Benutzereingabe schrittweise.
+
+        Die erkannte Absicht wird sofort geliefert, danach Zwischenstände
+        (Statusmeldungen, einzelne Nachrichten) und zuletzt die vollständige
+        Antwort, die der von process_input entspricht. Wie respond nutzt der
+        Stream den Antwort-Cache (ein Treffer liefert sofort "done") und
+        erfasst die Schritte mit RequestTimer.
+
+        Args:
+            user_input: Die Eingabe des Benutzers
+
+        Returns:
+            Iterator über (Ereignis, Daten)-Paare mit den Ereignissen
+            "intent", "status", "partial" und "done"
+        """
+        timer = RequestTimer()
+        with timer.stage("nlp"):
+            intent, parameter = self.nlp.process(user_input)
+        yield "intent", {"intent": intent, "parameter": parameter}
+
+        rendered = self.response_cache.get(intent, parameter)
+        cached = rendered is not None
+        if not cached:
+            key = self._lookup_key(intent, parameter)
+            if key is None:
+                rendered = self._render_static(intent, parameter, timer)
+            else:
+                data = yield from self._fetch_stream(key, timer)
+                rendered = self._render_result(intent, parameter, key, data, timer)
+
+        timer.finish(intent, cached)
+        yield "done", {"response": rendered.text}
+
+    def _fetch_stream(self, key: tuple, timer: RequestTimer) -> Iterator[Tuple[str, dict]]:
+        """
+        Führt eine Upstream-Abfrage schrittweise über die synchronen Services aus.
+
+        Liefert Statusmeldungen und einzelne Nachrichten als Ereignisse; nur
+        die Service-Aufrufe zählen zum Schritt key[0].
+
+        Returns:
+            Ergebnis der Abfrage (Rückgabewert des Generators)
+        """
+        kind, value = key
+        if kind == "weather":
+            cities = self.weather_service.split_cities(value)
+            if len(cities) > 1:
+                yield "status", {"text": f"🌤️ Rufe Wetterdaten für {len(cities)} Städte ab…"}
+                with timer.stage(kind):
+                    return self.weather_service.get_weather_many(cities)
+            yield "status", {"text": f"📍 Ermittle Standort von {value}…"}
+            with timer.stage(kind):
+                location = self.weather_service.locate(value)
+            if location is None:
+                return self.weather_service.city_not_found(value)
+            yield "status", {"text": f"🌤️ Rufe Wetterdaten für {location['name']} ab…"}
+            with timer.stage(kind):
+                return self.weather_service.get_weather_at(location)
+
+        if kind == "forecast":
+            city = value.city or self.weather_service.default_city
+            yield "status", {"text": f"📍 Ermittle Standort von {city}…"}
+            with timer.stage(kind):
+                location = self.weather_service.locate(city)
+            if location is None:
+                return self.weather_service.forecast_city_not_found(city)
+            yield "status", {"text": f"📅 Rufe Vorhersage für {location['name']} ab…"}
+            with timer.stage(kind):
+                return self.weather_service.get_forecast_at(location, value)
+
+        yield "status", {"text": "📰 Rufe Nachrichten ab…"}
+        with timer.stage(kind):
+            news_data = self.news_service.get_top_news(value)
+        if news_data.get("success"):
+            yield "partial", {"text": self.news_service.format_header(news_data)}
+            for i, article in enumerate(news_data["articles"], 1):
+                yield "partial", {"text": self.news_service.format_article(i, article)}
+        return news_data
+
+    async def process_input_async(self, user_input: str) -> str:
+        """
+        Verarbeitet die Benutzereingabe ohne blockierende HTTP-Aufrufe.
+
+        Args:
+            user_input: Die Eingabe des Benutzers
+
+        Returns:
+            Die Antwort des Assistenten
+        """
+        return (await self.respond_async(user_input)).text
+
+    async def respond_async(self, user_input: str) -> RenderedResponse:
+        """
+        Asynchrone Variante von respond (ohne blockierende HTTP-Aufrufe).
+
+        Args:
+            user_input: Die Eingabe des Benutzers
+
+        Returns:
+            RenderedResponse mit Text, JSON-Bytes und ETag
+        """
+        timer = RequestTimer()
+        with timer.stage("nlp"):
+            intent, parameter = self.nlp.process(user_input)
+        return await self._respond_classified_async(intent, parameter, timer)
+
+    async def _respond_classified_async(self, intent: str, parameter: Optional[str],
+                                        timer: RequestTimer,
+                                        fetches: Dict[tuple, asyncio.Task] = None) -> RenderedResponse:
+        """
+        Beantwortet eine bereits klassifizierte Eingabe über den Antwort-Cache.
 
+        Args:
+            intent: Erkannte Absicht
+            parameter: Parameter der Absicht
+            timer: Messung der Anfrage (wird abgeschlossen)
+            fetches: Laufende Upstream-Abfragen je Schlüssel, die sich die
+                Eingaben eines Batches teilen (None: keine Deduplizierung)
+
+        Returns:
+            RenderedResponse mit Text, JSON-Bytes und ETag
+        """
+        rendered = self.response_cache.get(intent, parameter)
+        cached = rendered is not None
+        if not cached:
+            key = self._lookup_key(intent, parameter)
+            if key is None:
+                rendered = self._render_static(intent, parameter, timer)
+            else:
+                with timer.stage(key[0]):
+                    if fetches is None:
+                        data = await self._fetch_async(key)
+                    else:
+                        if key not in fetches:
+                            fetches[key] = asyncio.ensure_future(self._fetch_async(key))
+                        data = await fetches[key]
+                rendered = self._render_result(intent, parameter, key, data, timer)
+
+        timer.finish(intent, cached)
+        return rendered
+
+    async def release_client(self):
+        """
+        Schließt den HTTP-Client des laufenden Event-Loops, wenn dieser nur für
+        eine Anfrage existiert.
+
+        Ohne ASGI-Server (Flask-Entwicklungsserver, Test-Client, WSGI) startet
+        asgiref für jede Async-View einen neuen Event-Loop; dessen Client
+        würde sonst nie geschlossen. Auf dem Loop des Servers bleibt der
+        Client für die Wiederverwendung der Verbindungen offen.
+        """
+        if asyncio.get_running_loop() is self.server_loop:
+            return
+        from src.async_services import close_async_client
+        await close_async_client()
+
+    async def process_batch_async(self, messages: List[str]) -> List[str]:
+        """
+        Verarbeitet mehrere Eingaben gemeinsam.
+
+        Die Nachrichten werden in einem Durchlauf klassifiziert, identische
+        Upstream-Abfragen (gleiche Stadt, gleiche Nachrichtenanzahl) nur
+        einmal ausgeführt und die übrigen Abfragen parallel abgewartet. Jede
+        Nachricht wird wie bei respond_async über den Antwort-Cache
+        beantwortet und als Anfrage gemessen.
+
+        Args:
+            messages: Eingaben der Benutzer
+
+        Returns:
+            Antworten in der Reihenfolge der Eingaben
+        """
+        classified = self.nlp.process_many(messages)
+        fetches = {}
+        pending = []
+        for _ in messages:
+            timer = RequestTimer()
+            with timer.stage("nlp"):
+                intent, parameter = next(classified)
+            pending.append(self._respond_classified_async(intent, parameter, timer, fetches))
+        return [rendered.text for rendered in await asyncio.gather(*pending)]
+
+    def _lookup_key(self, intent: str, parameter: Optional[str]) -> Optional[tuple]:
+        """Bildet den Schlüssel einer Upstream-Abfrage (None für statische Absichten)."""
+        if intent == "weather":
+            return ("weather", parameter or self.weather_service.default_city)
+        if intent == "forecast":
+            return ("forecast", ForecastQuery.from_parameter(parameter))
+        if intent == "news":
+            return ("news", self._news_count(parameter))
+        return None
+
+    def _fetch(self, key: tuple) -> dict:
+        """Führt eine Upstream-Abfrage über die synchronen Services aus."""
+        kind, value = key
+        if kind == "weather":
+            return self.weather_service.get_weather(value)
+        if kind == "forecast":
+            return self.weather_service.get_forecast(value)
+        return self.news_service.get_top_news(value)
+
+    async def _fetch_async(self, key: tuple) -> dict:
+        """Führt eine Upstream-Abfrage über die asynchronen Services aus."""
+        kind, value = key
+        if kind == "weather":
+            return await self.async_weather_service.get_weather(value)
+        if kind == "forecast":
+            return await self.async_weather_service.get_forecast(value)
+        return await self.async_news_service.get_top_news(value)
+
+    def _format_result(self, key: tuple, data: dict) -> str:
+        """Formatiert das Ergebnis einer Upstream-Abfrage."""
+        if key[0] == "weather":
+            return self.weather_service.format_weather(data)
+        if key[0] == "forecast":
+            return self.weather_service.format_forecast(data)
+        return self.news_service.format_news(data)
+
+    def _render_static(self, intent: str, parameter: Optional[str],
+                       timer: RequestTimer) -> RenderedResponse:
+        """Rendert eine Antwort ohne Service-Aufruf und legt sie dauerhaft im Cache ab."""
+        with timer.stage("format"):
+            text = self._static_response(intent)
+        with timer.stage("serialize"):
+            return self.response_cache.put_static(intent, parameter, text)
+
+    def _render_result(self, intent: str, parameter: Optional[str], key: tuple,
+                       data: dict, timer: RequestTimer) -> RenderedResponse:
+        """Rendert ein Upstream-Ergebnis; nur erfolgreiche Abfragen mit echten Daten werden gecacht."""
+        with timer.stage("format"):
+            text = self._format_result(key, data)
+        with timer.stage("serialize"):
+            if self.response_cache.is_cacheable(data):
+                return self.response_cache.put(intent, parameter, text)
+            return self.response_cache.render(text)
+
+    def collect_metrics(self):
+        """
+        Liefert Cache- und Circuit-Breaker-Zustände für den Metrik-Export.
+
+        Returns:
+            Liste aus (Name, Typ, Beschreibung, Samples) für Registry.render
+        """
+        caches = {
+            "geocoding": self.weather_service.geocoding_cache.stats(),
+            "geocoding_negative": self.weather_service.geocoding_misses.stats(),
+            "forecast": self.weather_service.forecast_cache.stats(),
+            "forecast_series": self.weather_service.series_cache.stats(),
+            "news": self.news_service.news_cache.stats(),
+            "response": self.response_cache.stats()
+        }
+        breakers = [
+            self.weather_service.geocoding_breaker,
+            self.weather_service.forecast_breaker,
+            self.news_service.news_breaker
+        ]
+        return [
+            ("ki_cache_requests_total", "counter", "Cache-Zugriffe nach Ergebnis", [
+                ({"cache": name, "result": result}, stats[field])
+                for name, stats in caches.items()
+                for result, field in (("hit", "hits"), ("stale_hit", "stale_hits"), ("miss", "misses"))
+            ]),
+            ("ki_cache_entries", "gauge", "Aktuelle Anzahl Cache-Einträge", [
+                ({"cache": name}, stats["size"]) for name, stats in caches.items()
+            ]),
+            ("ki_circuit_breaker_open", "gauge", "1 wenn der Circuit Breaker nicht geschlossen ist", [
+                ({"upstream": breaker.name}, int(breaker.state != CLOSED)) for breaker in breakers
+            ])
+        ]
+
+    @staticmethod
+    def _news_count(parameter: str) -> int:
+        """Ermittelt die gewünschte Anzahl an Nachrichten (Standard: 3)."""
+        try:
+            return int(parameter) if parameter else 3
+        except (ValueError, TypeError):
+            return 3
+
+    def _static_response(self, intent: str) -> str:
+        """Gibt die Antwort für Absichten ohne Service-Aufruf zurück."""
         if intent == "exit":
             return "👋 Auf Wiedersehen! Bis zum nächsten Mal."
 
@@ -41,18 +422,6 @@ class WebKIAssistant:
         if intent == "help":
             return self._get_help()
 
-        if intent == "weather":
-            weather_data = self.weather_service.get_weather(parameter)
-            return self.weather_service.format_weather(weather_data)
-
-        if intent == "news":
-            try:
-                count = int(parameter) if parameter else 3
-            except (ValueError, TypeError):
-                count = 3
-            news_data = self.news_service.get_top_news(count)
-            return self.news_service.format_news(news_data)
-
         # Unbekannte Anfrage
         return """🤔 Das habe ich leider nicht verstanden.
 
@@ -80,6 +449,13 @@ Tippe 'hilfe' für weitere Informationen."""
    • "Wie ist das Wetter?"
    • "Wetter in Berlin"
    • "Temperatur in München"
+   • "Wetter in Zürich, Bern und Basel"
+
+📅 VORHERSAGE:
+   • "Wie wird das Wetter morgen?"
+   • "Regnet es am Wochenende in Bern?"
+   • "Windigster Tag diese Woche"
+   • "Wie warm wird es am Samstag in Zürich?"
 
 📰 NACHRICHTEN:
    • "Was gibt es Neues?"
@@ -91,6 +467,7 @@ Tippe 'hilfe' für weitere Informationen."""
 
 # Globale Instanz des Assistenten
 assistant = WebKIAssistant()
+REGISTRY.register_collector(assistant.collect_metrics)
 
 
 @app.route("/")
@@ -100,7 +477,7 @@ def index():
 
 
 @app.route("/api/chat", methods=["POST"])
-def chat():
+async def chat():
     """API-Endpunkt für Chat-Nachrichten."""
     data = request.get_json()
     user_message = data.get("message", "").strip()
@@ -108,14 +485,117 @@ def chat():
     if not user_message:
         return jsonify({"response": "Bitte gib eine Nachricht ein."}), 400
 
-    response = assistant.process_input(user_message)
-    return jsonify({"response": response})
+    try:
+        rendered = await assistant.respond_async(user_message)
+    finally:
+        await assistant.release_client()
+    return _cached_response(rendered)
+
+
+def _cached_response(rendered: RenderedResponse) -> Response:
+    """Baut eine JSON-Antwort mit ETag und Cache-Control (304 bei passendem If-None-Match)."""
+    if rendered.etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(rendered.body, mimetype="application/json")
+
+    response.set_etag(rendered.etag)
+    if rendered.max_age:
+        response.cache_control.private = True
+        response.cache_control.max_age = rendered.max_age
+    else:
+        response.cache_control.no_store = True
+    return response
+
+
+@app.route("/metrics")
+def metrics():
+    """Metriken im Prometheus-Textformat."""
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Kodiert ein Ereignis im Server-Sent-Events-Format."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.route("/api/chat/stream", methods=["POST"])
+def chat_stream():
+    """API-Endpunkt, der die Antwort schrittweise als Server-Sent Events liefert."""
+    data = request.get_json(silent=True) or {}
+    user_message = str(data.get("message", "")).strip()
+
+    if not user_message:
+        return jsonify({"response": "Bitte gib eine Nachricht ein."}), 400
+
+    events = (
+        _sse_event(event, payload)
+        for event, payload in assistant.process_input_stream(user_message)
+    )
+    return Response(events, mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        # Zwischengeschaltete Proxies (z.B. nginx) sollen nicht puffern
+        "X-Accel-Buffering": "no"
+    })
+
+
+@app.route("/api/chat/batch", methods=["POST"])
+async def chat_batch():
+    """API-Endpunkt für mehrere Chat-Nachrichten in einer Anfrage."""
+    data = request.get_json(silent=True) or {}
+    messages = data.get("messages")
+
+    if not isinstance(messages, list) or not messages:
+        return jsonify({"error": "Bitte gib eine Liste von Nachrichten an."}), 400
+
+    if len(messages) > Config.BATCH_MAX_MESSAGES:
+        return jsonify({
+            "error": f"Maximal {Config.BATCH_MAX_MESSAGES} Nachrichten pro Anfrage."
+        }), 400
+
+    if not all(isinstance(message, str) for message in messages):
+        return jsonify({"error": "Nachrichten müssen Texte sein."}), 400
+
+    texts = [message.strip() for message in messages]
+    try:
+        answers = iter(await assistant.process_batch_async([text for text in texts if text]))
+    finally:
+        await assistant.release_client()
+    responses = [
+        next(answers) if text else "Bitte gib eine Nachricht ein."
+        for text in texts
+    ]
+    return jsonify({"responses": responses})
 
 
 def main():
-    """Startet den Webserver."""
-    print("🚀 KI-Assistent Web-Interface startet auf http://localhost:10000")
-    app.run(host="127.0.0.1", port=10000, debug=False)
+    """Startet den Webserver (ASGI mit uvicorn oder Flask-Entwicklungsserver)."""
+    parser = argparse.ArgumentParser(description="KI-Assistent Web-Interface")
+    parser.add_argument("--host", default=Config.WEB_HOST, help="Bind-Adresse")
+    parser.add_argument("--port", type=int, default=Config.WEB_PORT, help="Port")
+    parser.add_argument("--workers", type=int, default=Config.WEB_WORKERS,
+                        help="Anzahl der Worker-Prozesse (ASGI-Modus)")
+    parser.add_argument("--dev", action="store_true",
+                        help="Flask-Entwicklungsserver statt uvicorn verwenden")
+    args = parser.parse_args()
+
+    print(f"🚀 KI-Assistent Web-Interface startet auf http://{args.host}:{args.port}")
+    if args.dev:
+        assistant.start_background()
+        try:
+            app.run(host=args.host, port=args.port, debug=False, threaded=True)
+        finally:
+            assistant.stop_background()
+        return
+
+    import uvicorn
+    uvicorn.run(
+        "asgi:application",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=Config.WEB_GRACEFUL_TIMEOUT
+    )
 
 
 if __name__ == "__main__":